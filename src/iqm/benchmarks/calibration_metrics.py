@@ -0,0 +1,214 @@
+# Copyright 2024 IQM Benchmarks developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cached retrieval of calibration metrics, shared across qubit layouts and benchmarks.
+
+Snapshots of the calibration metrics are fetched over a reused connection, cached in memory and optionally on disk
+(keyed by URL and calibration set ID, with a time-to-live), and indexed by coupling once at retrieval time.
+Paths and `file://` URLs of JSON files with the same content as the calibration endpoint act as offline stand-ins.
+"""
+
+from dataclasses import dataclass, field
+import hashlib
+from io import BytesIO
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pycurl
+
+from iqm.benchmarks.logging_config import qcvv_logger
+
+
+# Metric keys of CZ fidelities, such as "metrics.irb.cz.QB1__QB2.fidelity", with qubits indexed from 1
+CZ_FIDELITY_KEY = re.compile(r"irb\.cz.*\.QB(\d+)__QB(\d+)\.fidelity")
+
+
+def parse_cz_fidelities(metrics: Dict[str, Dict[str, Any]]) -> Dict[Tuple[int, int], float]:
+    """Index the CZ fidelities of calibration metrics by coupling.
+
+    Args:
+        metrics (Dict[str, Dict[str, Any]]): the calibration metrics, keyed by metric name.
+    Returns:
+        Dict[Tuple[int, int], float]: the CZ fidelity of each coupling, with qubits indexed from 0.
+    """
+    cz_fidelities = {}
+    for key, metric in metrics.items():
+        match = CZ_FIDELITY_KEY.search(key)
+        if match is not None:
+            cz_fidelities[(int(match.group(1)) - 1, int(match.group(2)) - 1)] = float(metric["value"])
+    return cz_fidelities
+
+
+@dataclass
+class CalibrationSnapshot:
+    """Calibration metrics retrieved at a given time, with the CZ fidelities indexed by coupling.
+
+    Attributes:
+        url (str): The URL or path the metrics were retrieved from.
+        calset_id (Optional[str]): The calibration set ID the metrics belong to, if specified.
+        fetched_at (float): The time (in seconds since the epoch) the metrics were retrieved.
+        metrics (Dict[str, Dict[str, Any]]): The calibration metrics, keyed by metric name.
+        cz_fidelities (Dict[Tuple[int, int], float]): The CZ fidelity of each coupling, with qubits indexed from 0.
+    """
+
+    url: str
+    calset_id: Optional[str]
+    fetched_at: float
+    metrics: Dict[str, Dict[str, Any]]
+    cz_fidelities: Dict[Tuple[int, int], float] = field(init=False)
+
+    def __post_init__(self):
+        self.cz_fidelities = parse_cz_fidelities(self.metrics)
+
+    def layout_cz_fidelities(self, qubit_layout: List[int]) -> Tuple[List[List[int]], List[float]]:
+        """Return the couplings within a qubit layout and their CZ fidelities.
+
+        Args:
+            qubit_layout (List[int]): the subset of system-qubits, indexed from 0.
+        Returns:
+            Tuple[List[List[int]], List[float]]: the couplings, as pairs of indices into the layout, and their CZ
+            fidelities.
+        """
+        qubit_mapping = {qubit: idx for idx, qubit in enumerate(qubit_layout)}
+        list_couplings, list_fids = [], []
+        for (qb1, qb2), fidelity in self.cz_fidelities.items():
+            if qb1 in qubit_mapping and qb2 in qubit_mapping:
+                list_couplings.append([qubit_mapping[qb1], qubit_mapping[qb2]])
+                list_fids.append(fidelity)
+        return list_couplings, list_fids
+
+    def to_file(self, path: str):
+        """Write the metrics as a JSON file, usable as an offline stand-in for the calibration endpoint.
+
+        Args:
+            path (str): the path of the file.
+        """
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"metrics": self.metrics}, file)
+
+
+class CalibrationMetricsClient:
+    """Client retrieving calibration metrics over a reused connection, with in-memory and on-disk caches.
+
+    Args:
+        ttl (float): The time (in seconds) after which cached metrics are retrieved again.
+        cache_dir (Optional[str]): The default directory of the on-disk cache, if any.
+    """
+
+    def __init__(self, ttl: float = 3600.0, cache_dir: Optional[str] = None):
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._snapshots: Dict[Tuple[str, Optional[str]], CalibrationSnapshot] = {}
+        self._curl: Optional[pycurl.Curl] = None  # pylint: disable=c-extension-no-member,no-member
+        self._lock = threading.Lock()
+
+    def get(self, url: str, calset_id: Optional[str] = None, cache_dir: Optional[str] = None) -> CalibrationSnapshot:
+        """Return the calibration metrics of a URL, from the caches if they have not expired.
+
+        Args:
+            url (str): the URL of the calibration metrics, or the path (or `file://` URL) of a local JSON file. A
+                `{calset_id}` placeholder in the URL is replaced by the calibration set ID.
+            calset_id (Optional[str]): the calibration set ID.
+            cache_dir (Optional[str]): the directory of the on-disk cache, if other than that of the client.
+        Returns:
+            CalibrationSnapshot: the calibration metrics.
+        """
+        key = (url, calset_id)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is None or self._expired(snapshot):
+                snapshot = self._load_from_disk(url, calset_id, cache_dir)
+                if snapshot is None or self._expired(snapshot):
+                    snapshot = CalibrationSnapshot(url, calset_id, time.time(), self._fetch(url, calset_id))
+                    self._save_to_disk(snapshot, cache_dir)
+                self._snapshots[key] = snapshot
+        return snapshot
+
+    def clear(self):
+        """Clear the in-memory cache and close the connection."""
+        with self._lock:
+            self._snapshots.clear()
+            if self._curl is not None:
+                self._curl.close()
+                self._curl = None
+
+    def _expired(self, snapshot: CalibrationSnapshot) -> bool:
+        return time.time() - snapshot.fetched_at > self.ttl
+
+    def _fetch(self, url: str, calset_id: Optional[str]) -> Dict[str, Dict[str, Any]]:
+        if calset_id is not None:
+            url = url.replace("{calset_id}", calset_id)
+        path = url[len("file://") :] if url.startswith("file://") else url
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as file:
+                return json.load(file)["metrics"]
+
+        qcvv_logger.info(f"Retrieving calibration metrics from {url}")
+        if self._curl is None:
+            # A single handle keeps its connections alive between transfers
+            self._curl = pycurl.Curl()  # pylint: disable=c-extension-no-member,no-member
+        byteobj = BytesIO()
+        self._curl.setopt(self._curl.URL, url)  # type: ignore
+        self._curl.setopt(self._curl.WRITEDATA, byteobj)  # type: ignore
+        self._curl.perform()
+        return json.loads(byteobj.getvalue().decode())["metrics"]
+
+    def _cache_path(self, url: str, calset_id: Optional[str], cache_dir: Optional[str]) -> Optional[str]:
+        cache_dir = cache_dir if cache_dir is not None else self.cache_dir
+        if cache_dir is None:
+            return None
+        digest = hashlib.sha256(json.dumps([url, calset_id]).encode()).hexdigest()
+        return os.path.join(cache_dir, f"calibration_{digest}.json")
+
+    def _load_from_disk(
+        self, url: str, calset_id: Optional[str], cache_dir: Optional[str]
+    ) -> Optional[CalibrationSnapshot]:
+        path = self._cache_path(url, calset_id, cache_dir)
+        if path is None or not os.path.isfile(path):
+            return None
+        with open(path, encoding="utf-8") as file:
+            cached = json.load(file)
+        return CalibrationSnapshot(url, calset_id, cached["fetched_at"], cached["metrics"])
+
+    def _save_to_disk(self, snapshot: CalibrationSnapshot, cache_dir: Optional[str]):
+        path = self._cache_path(snapshot.url, snapshot.calset_id, cache_dir)
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"fetched_at": snapshot.fetched_at, "metrics": snapshot.metrics}, file)
+
+
+# Client shared by all benchmarks of a process, so that a single snapshot of the metrics is used in a run
+CALIBRATION_CLIENT = CalibrationMetricsClient()
+
+
+def get_calibration_snapshot(
+    url: str, calset_id: Optional[str] = None, cache_dir: Optional[str] = None
+) -> CalibrationSnapshot:
+    """Return the calibration metrics of a URL from the shared client.
+
+    Args:
+        url (str): the URL of the calibration metrics, or the path (or `file://` URL) of a local JSON file.
+        calset_id (Optional[str]): the calibration set ID.
+        cache_dir (Optional[str]): the directory of the on-disk cache, if other than that of the shared client.
+    Returns:
+        CalibrationSnapshot: the calibration metrics.
+    """
+    return CALIBRATION_CLIENT.get(url, calset_id, cache_dir)
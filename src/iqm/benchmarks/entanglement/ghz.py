@@ -16,23 +16,26 @@
 GHZ state benchmark
 """
 
-from io import BytesIO
+# pylint: disable=too-many-lines
+
+from functools import lru_cache
 from itertools import chain
-import json
 from time import strftime
-from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, cast
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, cast
 
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
+from more_itertools import chunked
+from mthree.utils import final_measurement_mapping
 import networkx
-from networkx import Graph, all_pairs_shortest_path, is_connected, minimum_spanning_tree
+from networkx import Graph, is_connected, minimum_spanning_tree
 import numpy as np
-import pycurl
-from qiskit import QuantumRegister, transpile
-from qiskit.quantum_info import random_clifford
+from qiskit import ClassicalRegister, QuantumRegister, transpile
+from qiskit.circuit import Parameter
+from qiskit.exceptions import QiskitError
+from qiskit.quantum_info import Clifford, Operator, Pauli
 from qiskit.transpiler import CouplingMap
 from qiskit_aer import Aer
-from scipy.spatial.distance import hamming
 import xarray as xr
 
 from iqm.benchmarks.benchmark import BenchmarkConfigurationBase
@@ -44,9 +47,15 @@ from iqm.benchmarks.benchmark_definition import (
     BenchmarkRunResult,
     add_counts_to_dataset,
 )
+from iqm.benchmarks.calibration_metrics import get_calibration_snapshot
 from iqm.benchmarks.circuit_containers import BenchmarkCircuit, CircuitGroup, Circuits
 from iqm.benchmarks.logging_config import qcvv_logger
-from iqm.benchmarks.readout_mitigation import apply_readout_error_mitigation
+from iqm.benchmarks.quantum_volume.parameter_binding import lower_native_templates
+from iqm.benchmarks.readout_mitigation import (
+    apply_readout_error_mitigation,
+    submit_readout_error_mitigation_calibration,
+)
+from iqm.benchmarks.tensored_mitigation import apply_tensored_readout_error_mitigation
 from iqm.benchmarks.utils import (
     perform_backend_transpilation,
     reduce_to_active_qubits,
@@ -55,6 +64,7 @@ from iqm.benchmarks.utils import (
     submit_execute,
     timeit,
     xrvariable_to_counts,
+    zxz_euler_angles,
 )
 from iqm.qiskit_iqm import IQMCircuit as QuantumCircuit
 from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
@@ -65,44 +75,476 @@ def append_rms(
     circuit: QuantumCircuit,
     num_rms: int,
     backend: IQMBackendBase,
-    # optimize_sqg: bool = False,
-) -> List[QuantumCircuit]:
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[List[QuantumCircuit], np.ndarray]:
     """
-    Appends 1Q Clifford gates sampled uniformly at random to all qubits in the given circuit.
+    Appends 1Q Clifford gates sampled uniformly at random to all active qubits in the given circuit.
+
+    The Cliffords are appended as the precompiled native "r" gates of `native_rm_gates`, so the RM circuits need no
+    further transpilation.
+
     Args:
-        circuit (QuantumCircuit):
-        num_rms (int):
-        backend (Optional[IQMBackendBase]): whether Cliffords are decomposed for the given backend
+        circuit (QuantumCircuit): the transpiled circuit.
+        num_rms (int): the number of randomized measurements.
+        backend (IQMBackendBase): the backend; if it does not support "r" gates, the RM circuits are transpiled to it.
+        rng (Optional[np.random.Generator]): the random number generator used to sample the Cliffords.
     Returns:
-        List[QuantumCircuit] of the original circuit with 1Q Clifford gates appended to it
+        Tuple[List[QuantumCircuit], np.ndarray]: the original circuit with 1Q Clifford gates appended to it for each
+        RM, and the indices (into `single_qubit_cliffords`) of the sampled Cliffords, of shape
+        (num_rms, num_active_qubits), with active qubits in increasing order.
     """
+    rng = np.random.default_rng() if rng is None else rng
+    # It shouldn't matter if measurement bits get scrambled
+    base_circuit = circuit.remove_final_measurements(inplace=False)
+    active_qubits = sorted(
+        {base_circuit.find_bit(q).index for instruction in base_circuit.data for q in instruction.qubits}
+    )
+    thetas, phis, _ = native_rm_gates()
+    clifford_indices = rng.integers(0, len(thetas), size=(num_rms, len(active_qubits)))
+
     rm_circuits: list[QuantumCircuit] = []
-    for _ in range(num_rms):
-        rm_circ = circuit.copy()
-        # It shouldn't matter if measurement bits get scrambled
-        rm_circ.remove_final_measurements()
-
-        active_qubits = set()
-        data = rm_circ.data
-        for instruction in data:
-            for qubit in instruction[1]:
-                active_qubits.add(rm_circ.find_bit(qubit)[0])
-
-        for q in active_qubits:
-            if backend is not None:
-                rand_clifford = random_clifford(1).to_circuit()
-            else:
-                rand_clifford = random_clifford(1).to_instruction()
-            rm_circ.compose(rand_clifford, qubits=[q], inplace=True)
+    for rm_indices in clifford_indices:
+        rm_circ = base_circuit.copy()
+        for qubit, index in zip(active_qubits, rm_indices):
+            if thetas[index] != 0:
+                rm_circ.r(thetas[index], phis[index], qubit)
+        measure_register = ClassicalRegister(len(active_qubits), "measure")
+        rm_circ.add_register(measure_register)
+        rm_circ.barrier(active_qubits)
+        rm_circ.measure(active_qubits, measure_register)
+        rm_circuits.append(rm_circ)
+
+    if "r" not in backend.operation_names:
+        rm_circuits = transpile(rm_circuits, basis_gates=backend.operation_names)
+    return rm_circuits, clifford_indices
+
+
+# Number of set bits of every 16-bit value
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+
+def bitstrings_to_bits(bitstrings: Sequence[str], num_qubits: int) -> np.ndarray:
+    """Convert bitstrings of equal length into an array of bits.
+
+    Args:
+        bitstrings (Sequence[str]): the bitstrings, each of length `num_qubits`.
+        num_qubits (int): the number of qubits.
+    Returns:
+        np.ndarray: array of shape (len(bitstrings), num_qubits) with the bits of each bitstring.
+    """
+    if len(bitstrings) == 0:
+        return np.zeros((0, num_qubits), dtype=np.uint8)
+    return np.frombuffer("".join(bitstrings).encode(), dtype=np.uint8).reshape(len(bitstrings), num_qubits) - ord("0")
+
+
+def bits_to_words(bits: np.ndarray) -> np.ndarray:
+    """Pack an array of bits into 16-bit words.
+
+    Args:
+        bits (np.ndarray): array of shape (num_bitstrings, num_qubits) with the bits of each bitstring.
+    Returns:
+        np.ndarray: array of shape (num_bitstrings, ceil(num_qubits / 16)) with the packed bits of each bitstring.
+    """
+    packed = np.packbits(bits, axis=1)
+    if packed.shape[1] % 2:
+        packed = np.pad(packed, ((0, 0), (0, 1)))
+    return np.ascontiguousarray(packed).view(np.uint16)
+
+
+def walsh_hadamard_transform(x: np.ndarray, num_qubits: int) -> np.ndarray:
+    """Compute the (unnormalized) Walsh-Hadamard transform of each row of an array.
+
+    Args:
+        x (np.ndarray): array of shape (num_rows, 2**num_qubits).
+        num_qubits (int): the number of qubits.
+    Returns:
+        np.ndarray: the transformed array, of the same shape as x.
+    """
+    y = x.reshape((x.shape[0],) + (2,) * num_qubits)
+    for axis in range(1, num_qubits + 1):
+        y0, y1 = y.take(0, axis=axis), y.take(1, axis=axis)
+        y = np.stack((y0 + y1, y0 - y1), axis=axis)
+    return y.reshape(x.shape)
+
+
+def rm_cross_correlations(
+    measured_states: Sequence[Sequence[str]],
+    measured_probabilities: Sequence[np.ndarray],
+    ideal_states: Sequence[Sequence[str]],
+    ideal_probabilities: Sequence[np.ndarray],
+    num_qubits: int,
+    method: str = "auto",
+    max_pairs_per_chunk: int = 2**22,
+) -> np.ndarray:
+    """Compute the cross-correlations 2^n sum_{a,b} (-2)^(-D(a,b)) P(a) Q(b) of measured and ideal distributions of all RMs.
+
+    D(a,b) is the Hamming distance between bitstrings a and b. Distributions are integer-encoded, and the sums of all RMs
+    are computed at once, either over all pairs of outcomes of each RM ("pairs"), with Hamming distances obtained by
+    XOR and popcount of bitstrings packed into 16-bit words, or through the Walsh-Hadamard transform of the dense distributions
+    ("walsh_hadamard"), since the (-2)^(-D) kernel transforms into (1/2)^(n-|y|) (3/2)^|y|.
+
+    Args:
+        measured_states (Sequence[Sequence[str]]): the measured bitstrings of each RM.
+        measured_probabilities (Sequence[np.ndarray]): the (quasi-)probabilities of the measured bitstrings of each RM.
+        ideal_states (Sequence[Sequence[str]]): the bitstrings with nonzero ideal probability of each RM.
+        ideal_probabilities (Sequence[np.ndarray]): the ideal probabilities of each RM.
+        num_qubits (int): the number of qubits.
+        method (str): "pairs", "walsh_hadamard", or "auto" to pick the cheaper of the two.
+        max_pairs_per_chunk (int): the maximum number of pairs of outcomes processed at once by the "pairs" method.
+    Returns:
+        np.ndarray: the cross-correlation of each RM.
+    """
+    num_rms = len(measured_states)
+    measured_sizes = np.array([len(states) for states in measured_states], dtype=np.int64)
+    ideal_sizes = np.array([len(states) for states in ideal_states], dtype=np.int64)
+    num_pairs = int((measured_sizes * ideal_sizes).sum())
+
+    measured_bits = bitstrings_to_bits(list(chain.from_iterable(measured_states)), num_qubits)
+    ideal_bits = bitstrings_to_bits(list(chain.from_iterable(ideal_states)), num_qubits)
+    measured_p = np.concatenate([np.asarray(p, dtype=float) for p in measured_probabilities])
+    ideal_p = np.concatenate([np.asarray(p, dtype=float) for p in ideal_probabilities])
+
+    if method == "auto":
+        dense_cost = num_rms * (num_qubits + 1) * 2**num_qubits if num_qubits <= 20 else np.inf
+        method = "walsh_hadamard" if dense_cost < num_pairs else "pairs"
+
+    if method == "walsh_hadamard":
+        powers = 1 << np.arange(num_qubits - 1, -1, -1, dtype=np.int64)
+        dense_measured = np.zeros((num_rms, 2**num_qubits))
+        dense_ideal = np.zeros((num_rms, 2**num_qubits))
+        np.add.at(dense_measured, (np.repeat(np.arange(num_rms), measured_sizes), measured_bits @ powers), measured_p)
+        np.add.at(dense_ideal, (np.repeat(np.arange(num_rms), ideal_sizes), ideal_bits @ powers), ideal_p)
+        weights = 3.0 ** bitstrings_to_bits([f"{y:0{num_qubits}b}" for y in range(2**num_qubits)], num_qubits).sum(1)
+        transformed = walsh_hadamard_transform(dense_measured, num_qubits) * walsh_hadamard_transform(
+            dense_ideal, num_qubits
+        )
+        return transformed @ weights / 2**num_qubits
+
+    if method != "pairs":
+        raise ValueError(f'Unknown method "{method}" for the RM cross-correlations.')
+
+    measured_words = np.split(bits_to_words(measured_bits), np.cumsum(measured_sizes)[:-1])
+    ideal_words = np.split(bits_to_words(ideal_bits), np.cumsum(ideal_sizes)[:-1])
+    measured_p_split = np.split(measured_p, np.cumsum(measured_sizes)[:-1])
+    ideal_p_split = np.split(ideal_p, np.cumsum(ideal_sizes)[:-1])
+    kernel = (2.0**num_qubits) * (-2.0) ** -np.arange(num_qubits + 1)
+
+    cross_correlations = np.zeros(num_rms)
+    for u in range(num_rms):
+        chunk_size = max(1, max_pairs_per_chunk // max(1, ideal_sizes[u] * ideal_words[u].shape[1]))
+        for chunk_start in range(0, measured_sizes[u], chunk_size):
+            chunk = slice(chunk_start, chunk_start + chunk_size)
+            distances = POPCOUNT_TABLE[measured_words[u][chunk, None, :] ^ ideal_words[u][None, :, :]].sum(
+                axis=-1, dtype=np.int64
+            )
+            cross_correlations[u] += measured_p_split[u][chunk] @ kernel[distances] @ ideal_p_split[u]
+
+    return cross_correlations
+
+
+@lru_cache(maxsize=1)
+def single_qubit_cliffords() -> List[Tuple[np.ndarray, List[str]]]:
+    """Generate the 24 single-qubit Clifford gates as words of "h" and "s" gates.
+
+    Returns:
+        List[Tuple[np.ndarray, List[str]]]: the unitary matrix and the gate names of each Clifford gate.
+    """
+    words: List[List[str]] = [[]]
+    cliffords = [Clifford(QuantumCircuit(1))]
+    index = 0
+    while index < len(words):
+        word = words[index]
+        index += 1
+        for generator in ("h", "s"):
+            candidate = QuantumCircuit(1)
+            for name in word + [generator]:
+                getattr(candidate, name)(0)
+            clifford = Clifford(candidate)
+            if clifford not in cliffords:
+                words.append(word + [generator])
+                cliffords.append(clifford)
+    return [(clifford.to_matrix(), word) for word, clifford in zip(words, cliffords)]
+
+
+@lru_cache(maxsize=1)
+def native_rm_gates() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Precompile the 24 single-qubit Cliffords of `single_qubit_cliffords` into native "r" gates for RMs.
+
+    Since RZ(alpha) RX(theta) RZ(beta) = RZ(alpha + beta) R(theta, -beta), every Clifford is a single "r" gate followed
+    by a Z rotation, which does not change computational basis measurements and is dropped.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: the angles theta and phi of the "r" gate of each Clifford, and an
+        array of shape (24, 2, 3, 4) with, for each "r" gate (index 0) and its inverse (index 1), the X part, the Z
+        part and the sign of the image under conjugation of the Pauli operator with X part x and Z part z, stored at
+        position x + 2 z.
+    """
+    matrices = np.array([matrix for matrix, _ in single_qubit_cliffords()])
+    thetas, _, betas = zxz_euler_angles(matrices)
+    # The angles are multiples of pi / 2 up to numerical noise
+    thetas = np.round(thetas / (np.pi / 2)) * (np.pi / 2)
+    phis = np.round(-betas / (np.pi / 2)) * (np.pi / 2)
+
+    conjugation_tables = np.zeros((len(matrices), 2, 3, 4), dtype=np.uint8)
+    for index, (theta, phi) in enumerate(zip(thetas, phis)):
+        r_circuit = QuantumCircuit(1)
+        r_circuit.r(theta, phi, 0)
+        clifford = Clifford(merge_to_clifford_circuit(r_circuit))
+        for direction, gate in enumerate((clifford, clifford.adjoint())):
+            for position, label in enumerate(["I", "X", "Z", "Y"]):
+                image = Pauli(label).evolve(gate, frame="s")
+                conjugation_tables[index, direction, :, position] = image.x[0], image.z[0], image.phase // 2
+    return thetas, phis, conjugation_tables
+
+
+def merge_to_clifford_circuit(circuit: QuantumCircuit, atol: float = 1e-6) -> QuantumCircuit:
+    """Merge every run of single-qubit gates of a circuit into a single-qubit Clifford gate, made of "h" and "s" gates.
+
+    Individual gates of a run may not be Clifford (e.g., "r" gates with arbitrary phases), as long as their product is.
+
+    Args:
+        circuit (QuantumCircuit): the circuit, without measurements.
+        atol (float): the tolerance when matching the product of a run to a Clifford gate, up to a global phase.
+    Returns:
+        QuantumCircuit: the circuit made of "h" and "s" gates and the multi-qubit gates of the original circuit.
+    Raises:
+        QiskitError: if the product of a run of single-qubit gates is not a Clifford gate.
+    """
+    merged = QuantumCircuit(circuit.num_qubits)
+    pending = [np.eye(2, dtype=complex) for _ in range(circuit.num_qubits)]
+
+    def flush(qubit: int):
+        if np.allclose(pending[qubit], np.eye(2), atol=atol):
+            pending[qubit] = np.eye(2, dtype=complex)
+            return
+        for matrix, word in single_qubit_cliffords():
+            if abs(abs(np.trace(matrix.conj().T @ pending[qubit])) - 2) < atol:
+                for name in word:
+                    getattr(merged, name)(qubit)
+                pending[qubit] = np.eye(2, dtype=complex)
+                return
+        raise QiskitError(f"The single-qubit gates on qubit {qubit} do not multiply into a Clifford gate.")
+
+    for instruction in circuit.data:
+        qubits = [circuit.find_bit(q).index for q in instruction.qubits]
+        if instruction.operation.name == "barrier":
+            continue
+        if len(qubits) == 1:
+            pending[qubits[0]] = Operator(instruction.operation).data @ pending[qubits[0]]
+            continue
+        for qubit in qubits:
+            flush(qubit)
+        merged.append(instruction.operation, qubits)
+    for qubit in range(circuit.num_qubits):
+        flush(qubit)
+
+    return merged
+
+
+def z_type_generators(x: np.ndarray, z: np.ndarray, phase: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Row-reduce the stabilizer generators of a state, tracking their signs, until the remaining ones only contain Z.
+
+    The computational basis outcomes b (with b[i] the outcome of qubit i) of the state are uniformly distributed over
+    the solutions of H b = c (mod 2), where the rows of H are the supports of the Z-type generators and c their signs.
+
+    Args:
+        x (np.ndarray): the X parts of the stabilizer generators, of shape (num_qubits, num_qubits).
+        z (np.ndarray): the Z parts of the stabilizer generators, of shape (num_qubits, num_qubits).
+        phase (np.ndarray): the signs of the stabilizer generators, as bits.
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the matrix H, of shape (num_generators, num_qubits), and the vector c.
+    """
+    x, z, phase = x.astype(np.int64), z.astype(np.int64), phase.astype(np.int64)
 
-        rm_circ.measure_active()
-        rm_circuits.append(transpile(rm_circ, basis_gates=backend.operation_names))
+    row = 0
+    for col in range(x.shape[1]):
+        candidates = np.flatnonzero(x[row:, col])
+        if len(candidates) == 0:
+            continue
+        pivot = row + candidates[0]
+        for array in (x, z, phase):
+            array[[row, pivot]] = array[[pivot, row]]
+        targets = np.flatnonzero(x[:, col])
+        targets = targets[targets != row]
+        # Multiply the pivot generator into the targets, computing the phase as in arXiv:quant-ph/0406196
+        x1, z1, x2, z2 = x[row], z[row], x[targets], z[targets]
+        g = np.where(
+            x1 & z1,
+            z2 - x2,
+            np.where(x1 & (1 - z1), z2 * (2 * x2 - 1), np.where((1 - x1) & z1, x2 * (1 - 2 * z2), 0)),
+        )
+        phase[targets] = ((2 * phase[targets] + 2 * phase[row] + g.sum(axis=1)) % 4) // 2
+        x[targets] ^= x1
+        z[targets] ^= z1
+        row += 1
+
+    return z[row:].astype(np.uint8), phase[row:].astype(np.uint8)
+
+
+def stabilizer_measurement_subspace(circuit: QuantumCircuit) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute the measurement distribution of a Clifford circuit as a uniform distribution over an affine subspace.
+
+    The circuit, with runs of single-qubit gates merged into Clifford gates, is simulated with a Clifford tableau, and
+    its measurement distribution is obtained from the Z-type stabilizer generators as in `z_type_generators`.
+
+    Args:
+        circuit (QuantumCircuit): the Clifford circuit, without measurements.
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the matrix H, of shape (num_generators, num_qubits), and the vector c.
+    Raises:
+        QiskitError: if the circuit is not a Clifford circuit.
+    """
+    clifford = Clifford(merge_to_clifford_circuit(circuit))
+    return z_type_generators(clifford.stab_x, clifford.stab_z, clifford.stab_phase)
+
+
+def conjugate_stabilizers(
+    x: np.ndarray, z: np.ndarray, phase: np.ndarray, clifford_indices: np.ndarray, direction: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Apply a layer of the native RM gates of `native_rm_gates` (or of their inverses) to stabilizer generators.
+
+    Args:
+        x (np.ndarray): the X parts of the stabilizer generators, of shape (num_generators, num_qubits).
+        z (np.ndarray): the Z parts of the stabilizer generators, of shape (num_generators, num_qubits).
+        phase (np.ndarray): the signs of the stabilizer generators, as bits.
+        clifford_indices (np.ndarray): the index of the Clifford applied to each qubit.
+        direction (int): 0 to apply the gates, 1 to apply their inverses.
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: the conjugated X parts, Z parts and signs.
+    """
+    tables = native_rm_gates()[2][clifford_indices, direction]
+    positions = x.astype(np.intp) + 2 * z.astype(np.intp)
+    qubits = np.arange(x.shape[1])
+    new_x = tables[:, 0][qubits, positions]
+    new_z = tables[:, 1][qubits, positions]
+    new_phase = (phase + tables[:, 2][qubits, positions].sum(axis=1)) % 2
+    return new_x, new_z, new_phase.astype(np.uint8)
+
+
+def rm_measurement_subspaces(
+    circuit: QuantumCircuit, clifford_indices: np.ndarray
+) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Compute the measurement subspaces of all RM circuits from a single stabilizer simulation.
+
+    The state before the RMs is recovered from the tableau of the first RM circuit by undoing its RM gates, and the
+    tableau of every RM circuit follows by conjugating the stabilizers with its RM gates, one qubit at a time.
+
+    Args:
+        circuit (QuantumCircuit): the first RM circuit, without measurements, reduced to its active qubits.
+        clifford_indices (np.ndarray): the Clifford indices of the RMs, as returned by `append_rms`.
+    Returns:
+        List[Tuple[np.ndarray, np.ndarray]]: the affine subspace of each RM, as in `stabilizer_measurement_subspace`.
+    Raises:
+        QiskitError: if the circuit is not a Clifford circuit.
+    """
+    clifford = Clifford(merge_to_clifford_circuit(circuit))
+    state = conjugate_stabilizers(clifford.stab_x, clifford.stab_z, clifford.stab_phase, clifford_indices[0], 1)
+    return [z_type_generators(*conjugate_stabilizers(*state, rm_indices, 0)) for rm_indices in clifford_indices]
+
+
+def stabilizer_kernel_expectations(
+    bits: np.ndarray, parity_checks: np.ndarray, signs: np.ndarray, max_terms: int = 2**26
+) -> np.ndarray:
+    """Compute the expectation of the (-2)^(-D(a,b)) kernel over b uniformly distributed on {b : H b = c}, for many a.
+
+    Writing the kernel as a product over qubits of 1/4 + 3/4 (-1)^(a_i + b_i), only the products of Z-type stabilizers
+    survive the expectation, so that the result is 4^(-n) times the sum over all z of
+    (-1)^(c.z) prod_{i in supp(zH)} 3 (-1)^(a_i).
+    The sum is either enumerated over all z, or computed by a dynamic program over the parities of the non-pivot columns
+    of H in reduced row echelon form, whichever is cheaper.
+
+    Args:
+        bits (np.ndarray): array of shape (num_outcomes, num_qubits) with the bits a of each outcome.
+        parity_checks (np.ndarray): the matrix H, of shape (num_checks, num_qubits).
+        signs (np.ndarray): the vector c.
+        max_terms (int): the maximum number of terms computed, above which the distribution is considered too complex.
+    Returns:
+        np.ndarray: the expectation for each outcome.
+    Raises:
+        ValueError: if both the enumeration and the dynamic program require more than `max_terms` terms.
+    """
+    num_outcomes, num_qubits = bits.shape
+    h = parity_checks.astype(np.uint8).copy()
+    c = signs.astype(np.uint8).copy()
+    # Reduced row echelon form
+    pivots: List[int] = []
+    for col in range(num_qubits):
+        candidates = np.flatnonzero(h[len(pivots) :, col])
+        if len(candidates) == 0:
+            continue
+        pivot = len(pivots) + candidates[0]
+        h[[len(pivots), pivot]] = h[[pivot, len(pivots)]]
+        c[[len(pivots), pivot]] = c[[pivot, len(pivots)]]
+        targets = np.flatnonzero(h[:, col])
+        targets = targets[targets != len(pivots)]
+        h[targets] ^= h[len(pivots)]
+        c[targets] ^= c[len(pivots)]
+        pivots.append(col)
+    h, c = h[: len(pivots)], c[: len(pivots)]
+    rank = len(pivots)
+    non_pivots = [col for col in range(num_qubits) if col not in set(pivots) and h[:, col].any()]
+
+    factors = 3.0 * (1 - 2 * bits.astype(np.float64))
+    enumeration_cost = 2**rank * (num_qubits + num_outcomes)
+    dynamic_cost = num_outcomes * max(1, rank) * 2 ** len(non_pivots)
+    if min(enumeration_cost, dynamic_cost) > max_terms:
+        raise ValueError("The ideal distribution is too complex for the stabilizer kernel expectations.")
+
+    if enumeration_cost <= dynamic_cost:
+        z = (np.arange(2**rank)[:, None] >> np.arange(rank)) & 1
+        supports = (z @ h) % 2
+        weights = 3.0 ** supports.sum(axis=1) * (1 - 2 * ((z @ c) % 2))
+        parities = (bits.astype(np.int64) @ supports.T) % 2
+        sums = (1 - 2 * parities) @ weights
+    else:
+        states = np.arange(2 ** len(non_pivots))
+        masks = h[:, non_pivots].astype(np.int64) @ (1 << np.arange(len(non_pivots)))
+        dp = np.zeros((num_outcomes, len(states)))
+        dp[:, 0] = 1.0
+        for row, pivot in enumerate(pivots):
+            dp = dp + dp[:, states ^ masks[row]] * (factors[:, pivot] * (1 - 2 * int(c[row])))[:, None]
+        final_weights = np.ones((num_outcomes, len(states)))
+        for k, col in enumerate(non_pivots):
+            final_weights[:, (states >> k) & 1 == 1] *= factors[:, [col]]
+        sums = (dp * final_weights).sum(axis=1)
+
+    return sums / 4.0**num_qubits
+
+
+def rm_cross_correlations_stabilizer(
+    measured_states: Sequence[Sequence[str]],
+    measured_probabilities: Sequence[np.ndarray],
+    ideal_subspaces: Sequence[Tuple[np.ndarray, np.ndarray]],
+    num_qubits: int,
+) -> np.ndarray:
+    """Compute the cross-correlations of RMs as `rm_cross_correlations`, for ideal distributions given as affine subspaces.
 
-    return rm_circuits
+    Args:
+        measured_states (Sequence[Sequence[str]]): the measured bitstrings of each RM.
+        measured_probabilities (Sequence[np.ndarray]): the (quasi-)probabilities of the measured bitstrings of each RM.
+        ideal_subspaces (Sequence[Tuple[np.ndarray, np.ndarray]]): the ideal distribution of each RM, as returned by
+            `stabilizer_measurement_subspace`.
+        num_qubits (int): the number of qubits.
+    Returns:
+        np.ndarray: the cross-correlation of each RM.
+    """
+    cross_correlations = np.zeros(len(measured_states))
+    for u, (states, probabilities, (parity_checks, signs)) in enumerate(
+        zip(measured_states, measured_probabilities, ideal_subspaces)
+    ):
+        # Bitstrings are little-endian, so the bit of qubit i is the (n-1-i)-th character
+        bits = bitstrings_to_bits(states, num_qubits)[:, ::-1]
+        expectations = stabilizer_kernel_expectations(bits, parity_checks, signs)
+        cross_correlations[u] = 2.0**num_qubits * (np.asarray(probabilities, dtype=float) @ expectations)
+    return cross_correlations
 
 
 def fidelity_ghz_randomized_measurements(
-    dataset: xr.Dataset, qubit_layout, ideal_probabilities: List[Dict[str, int]], num_qubits: int, circuits: Circuits
+    dataset: xr.Dataset,
+    qubit_layout,
+    ideal_probabilities: List[Dict[str, float]] | List[Tuple[np.ndarray, np.ndarray]],
+    num_qubits: int,
+    circuits: Circuits,
 ) -> tuple[dict[str, Any], dict[str, Any]]:
     """
     Estimates GHZ state fidelity through cross-correlations of RMs.
@@ -111,7 +553,8 @@ def fidelity_ghz_randomized_measurements(
     Arguments:
         dataset (xr.Dataset):
         qubit_layout: List[int]: The subset of system-qubits used in the protocol
-        ideal_probabilities (List[Dict[str, int]]):
+        ideal_probabilities (List[Dict[str, float]] | List[Tuple[np.ndarray, np.ndarray]]): The ideal probabilities of
+            each RM, or their affine subspaces as returned by `stabilizer_measurement_subspace`
         num_qubits (int): Number of qubits
         circuits (Circuits): Instance of `Circuits` containing transpiled circuits
     Returns:
@@ -121,50 +564,35 @@ def fidelity_ghz_randomized_measurements(
             The uncertainties for the fidelities
     """
     idx = BenchmarkObservationIdentifier(qubit_layout).string_identifier
-    # List for each RM contribution to the fidelity
-    fid_rm = []
-
-    # Loop through RMs and add each contribution
     num_rms = len(circuits["transpiled_circuits"][f"{idx}_native_ghz"].circuits)
-    for u in range(num_rms):
-        # Probability estimates for noisy measurements
-        probabilities_sample = {}
-        c_keys = dataset[f"{idx}_state_{u}"].data  # measurements[u].keys()
-        num_shots_noisy = sum(dataset[f"{idx}_counts_{u}"].data)
-        for k, key in enumerate(c_keys):
-            probabilities_sample[key] = dataset[f"{idx}_counts_{u}"].data[k] / num_shots_noisy
-        # Keys for corresponding ideal probabilities
-        c_id_keys = ideal_probabilities[u].keys()
-
-        p_sum = []
-        for sb in c_id_keys:
-            for sa in c_keys:
-                exponent = hamming(list(sa), list(sb)) * num_qubits
-                p_sum.append(np.power(-2, -exponent) * probabilities_sample[sa] * ideal_probabilities[u][sb])
-        fid_rm.append((2**num_qubits) * sum(p_sum))
-    values = {"fidelity": np.mean(fid_rm)}
-    uncertainties = {"fidelity": np.std(fid_rm) / np.sqrt(num_rms)}
 
-    if dataset.attrs["rem"]:
-        fid_rm_rem = []
-        for u in range(num_rms):
-            # Probability estimates for noisy measurements
-            probabilities_sample = {}
-            c_keys = dataset[f"{idx}_rem_state_{u}"].data  # measurements[u].keys()
-            num_shots_noisy = sum(dataset[f"{idx}_rem_counts_{u}"].data)
-            for k, key in enumerate(c_keys):
-                probabilities_sample[key] = dataset[f"{idx}_rem_counts_{u}"].data[k] / num_shots_noisy
-            # Keys for corresponding ideal probabilities
-            c_id_keys = ideal_probabilities[u].keys()
-
-            p_sum = []
-            for sb in c_id_keys:
-                for sa in c_keys:
-                    exponent = hamming(list(sa), list(sb)) * num_qubits
-                    p_sum.append(np.power(-2, -exponent) * probabilities_sample[sa] * ideal_probabilities[u][sb])
-            fid_rm_rem.append((2**num_qubits) * sum(p_sum))
-        values = values | {"fidelity_rem": np.mean(fid_rm_rem)}
-        uncertainties = uncertainties | {"fidelity_rem": np.std(fid_rm_rem) / np.sqrt(num_rms)}
+    values = {}
+    uncertainties = {}
+    for key, identifier in [("fidelity", idx)] + ([("fidelity_rem", f"{idx}_rem")] if dataset.attrs["rem"] else []):
+        # Probability estimates for noisy measurements
+        measured_states = [dataset[f"{identifier}_state_{u}"].data for u in range(num_rms)]
+        measured_counts = [np.asarray(dataset[f"{identifier}_counts_{u}"].data, dtype=float) for u in range(num_rms)]
+        measured_probabilities = [counts / counts.sum() for counts in measured_counts]
+        if isinstance(ideal_probabilities[0], dict):
+            fid_rm = rm_cross_correlations(
+                measured_states,
+                measured_probabilities,
+                [list(cast(Dict[str, float], probabilities).keys()) for probabilities in ideal_probabilities],
+                [
+                    np.fromiter(cast(Dict[str, float], probabilities).values(), dtype=float)
+                    for probabilities in ideal_probabilities
+                ],
+                num_qubits,
+            )
+        else:
+            fid_rm = rm_cross_correlations_stabilizer(
+                measured_states,
+                measured_probabilities,
+                cast(List[Tuple[np.ndarray, np.ndarray]], ideal_probabilities),
+                num_qubits,
+            )
+        values[key] = np.mean(fid_rm)
+        uncertainties[key] = np.std(fid_rm) / np.sqrt(num_rms)
     return values, uncertainties
 
 
@@ -234,6 +662,55 @@ def fidelity_ghz_coherences(dataset: xr.Dataset, qubit_layout: List[int], circui
     return [fidelity]
 
 
+def ghz_layout_fidelities(
+    dataset: xr.Dataset, qubit_layout: List[int], circuits: Circuits
+) -> Tuple[Dict[str, float], Dict[str, Optional[float]]]:
+    """Estimate the GHZ state fidelity of a qubit layout with the fidelity routine of the dataset
+
+    Args:
+        dataset: xr.Dataset
+            An xarray dataset containing the measurement data
+        qubit_layout: List[int]
+            The subset of system-qubits used in the protocol
+        circuits: Circuits
+            Instance of `Circuits` containing transpiled circuits
+
+    Returns:
+        values: dict[str, float]
+            The fidelity and, if rem=True, the readout error mitigated fidelity
+        uncertainties: dict[str, Optional[float]]
+            The uncertainties for the fidelities, if available
+    """
+    idx = BenchmarkObservationIdentifier(qubit_layout).string_identifier
+    if dataset.attrs["fidelity_routine"] == "randomized_measurements":
+        all_circuits = circuits["transpiled_circuits"][f"{idx}_native_ghz"].circuits
+        deflated_circuits = []
+        for qc in all_circuits:
+            qc_copy = qc.copy()
+            qc_copy.remove_final_measurements()
+            deflated_circuits.append(reduce_to_active_qubits(qc_copy, dataset.attrs["backend_name"]))
+        ideal_probabilities: List[Dict[str, float]] | List[Tuple[np.ndarray, np.ndarray]]
+        rm_clifford_indices = dataset.attrs.get(f"{idx}_rm_clifford_indices")
+        try:
+            # GHZ state preparation followed by single-qubit Cliffords is a stabilizer circuit
+            if rm_clifford_indices is not None and deflated_circuits[0].num_qubits == len(rm_clifford_indices[0]):
+                ideal_probabilities = rm_measurement_subspaces(deflated_circuits[0], np.array(rm_clifford_indices))
+            else:
+                ideal_probabilities = [stabilizer_measurement_subspace(qc) for qc in deflated_circuits]
+        except QiskitError:
+            qcvv_logger.info(f"Non-Clifford RM circuits on {qubit_layout}: using statevector simulation")
+            ideal_simulator = Aer.get_backend("statevector_simulator")
+            ideal_probabilities = [
+                dict(sorted(ideal_simulator.run(qc).result().get_counts().items())) for qc in deflated_circuits
+            ]
+        return fidelity_ghz_randomized_measurements(
+            dataset, qubit_layout, ideal_probabilities, len(qubit_layout), circuits
+        )
+    fidelity = fidelity_ghz_coherences(dataset, qubit_layout, circuits)
+    values = dict(zip(["fidelity", "fidelity_rem"], fidelity))
+    return values, {key: None for key in values}
+
+
 def fidelity_analysis(run: BenchmarkRunResult) -> BenchmarkAnalysisResult:
     """Analyze counts and compute the state fidelity
 
@@ -246,57 +723,40 @@ def fidelity_analysis(run: BenchmarkRunResult) -> BenchmarkAnalysisResult:
             An object containing the dataset, plots, and observations
     """
     dataset = run.dataset
-    routine = dataset.attrs["fidelity_routine"]
     qubit_layouts = dataset.attrs["custom_qubits_array"]
-    backend_name = dataset.attrs["backend_name"]
 
     observation_list: list[BenchmarkObservation] = []
     for qubit_layout in qubit_layouts:
-        match routine:
-            case "randomized_measurements":
-                ideal_simulator = Aer.get_backend("statevector_simulator")
-                ideal_probabilities = []
-                idx = BenchmarkObservationIdentifier(qubit_layout).string_identifier
-                all_circuits = run.circuits["transpiled_circuits"][f"{idx}_native_ghz"].circuits
-                for qc in all_circuits:
-                    qc_copy = qc.copy()
-                    qc_copy.remove_final_measurements()
-                    deflated_qc = reduce_to_active_qubits(qc_copy, backend_name)
-                    ideal_probabilities.append(
-                        dict(sorted(ideal_simulator.run(deflated_qc).result().get_counts().items()))
-                    )
-                values, uncertainties = fidelity_ghz_randomized_measurements(
-                    dataset, qubit_layout, ideal_probabilities, len(qubit_layout), run.circuits
-                )
-                observation_list.extend(
-                    [
-                        BenchmarkObservation(
-                            name=key,
-                            identifier=BenchmarkObservationIdentifier(qubit_layout),
-                            value=value,
-                            uncertainty=uncertainties[key],
-                        )
-                        for key, value in values.items()
-                    ]
-                )
-            case "coherences":
-                fidelity = fidelity_ghz_coherences(dataset, qubit_layout, run.circuits)
-                observation_list.extend(
-                    [
-                        BenchmarkObservation(
-                            name="fidelity", identifier=BenchmarkObservationIdentifier(qubit_layout), value=fidelity[0]
-                        )
-                    ]
+        values, uncertainties = ghz_layout_fidelities(dataset, qubit_layout, run.circuits)
+        observation_list.extend(
+            [
+                BenchmarkObservation(
+                    name=key,
+                    identifier=BenchmarkObservationIdentifier(qubit_layout),
+                    value=value,
+                    uncertainty=uncertainties[key],
                 )
-                if len(fidelity) > 1:
-                    observation_list.append(
-                        BenchmarkObservation(
-                            name="fidelity_rem",
-                            identifier=BenchmarkObservationIdentifier(qubit_layout),
-                            value=fidelity[1],
-                        )
-                    )
+                for key, value in values.items()
+            ]
+        )
     plots = {"All layout fidelities": plot_fidelities(observation_list, qubit_layouts)}
+
+    # Largest GHZ state above the fidelity threshold of each size sweep, reached through all smaller sizes
+    for base_layout, sweep_layouts in dataset.attrs.get("sweep_layouts", []):
+        key = "fidelity_rem" if dataset.attrs["rem"] else "fidelity"
+        fidelities = {str(o.identifier.qubit_indices): o.value for o in observation_list if o.name == key}
+        largest_size = 1
+        for sweep_layout in sweep_layouts:
+            if fidelities[str(sweep_layout)] < dataset.attrs["fidelity_threshold"]:
+                break
+            largest_size = len(sweep_layout)
+        observation_list.append(
+            BenchmarkObservation(
+                name="largest_ghz_size",
+                identifier=BenchmarkObservationIdentifier(base_layout),
+                value=largest_size,
+            )
+        )
     return BenchmarkAnalysisResult(dataset=dataset, observations=observation_list, plots=plots)
 
 
@@ -393,31 +853,63 @@ def generate_ghz_spanning_tree(
             The list of qubits on which the GHZ state is defined. This is a subset of qubit_layout with size n_state
     """
 
-    cx_map = get_cx_map(qubit_layout, graph)
+    return ghz_circuit_from_cx_map(get_cx_map(qubit_layout, graph), qubit_layout, n_state)
+
+
+def ghz_circuit_from_cx_map(
+    cx_map: List[List[int]], qubit_layout: List[int], n_state: int | None = None
+) -> Tuple[QuantumCircuit, List[int]]:
+    """
+    Generates the circuit preparing a GHZ state with the first CX gates of a CX map.
+
+    Args:
+        cx_map: List[List[int]]
+            A list of CX gates on system-qubits, in which the control of every gate is already entangled
+        qubit_layout: List[int]
+            The subset of system-qubits used in the protocol, indexed from 0
+        n_state: int
+            The number of qubits for which a GHZ state should be created
+
+    Returns:
+        qc: QuantumCircuit
+            A quantum circuit generating a GHZ state of n qubits, whose qubits are the participating qubits
+        participating_qubits: List[int]
+            The list of qubits on which the GHZ state is defined, in the order of qubit_layout
+    """
     if n_state is None:
         n_state = len(cx_map) + 1
-    participating_qubits = set(qubit for pair in cx_map[: n_state - 1] for qubit in pair)
+    root = cx_map[0][0] if cx_map else qubit_layout[0]
+    participating = set(qubit for pair in cx_map[: n_state - 1] for qubit in pair) | {root}
+    participating_qubits = [qubit for qubit in qubit_layout if qubit in participating]
 
     relabeling = {idx_old: idx_new for idx_new, idx_old in enumerate(participating_qubits)}
     n_state_register = QuantumRegister(n_state)
     qc = QuantumCircuit(n_state_register, name="ghz")
-    qc.h([relabeling[cx_map[0][0]]])
-    for _, pair in zip(np.arange(n_state - 1), cx_map):
+    qc.h([relabeling[root]])
+    for pair in cx_map[: n_state - 1]:
         relabeled_pair = [relabeling[pair[0]], relabeling[pair[1]]]
         qc.barrier(relabeled_pair)
         qc.cx(*relabeled_pair)
     qc.measure_active()
-    return qc, list(participating_qubits)
+    return qc, participating_qubits
 
 
-def extract_fidelities(cal_url: str, qubit_layout: List[int]) -> Tuple[List[List[int]], List[float]]:
+def extract_fidelities(
+    cal_url: str, qubit_layout: List[int], calset_id: Optional[str] = None, cache_dir: Optional[str] = None
+) -> Tuple[List[List[int]], List[float]]:
     """Returns couplings and CZ-fidelities from calibration data URL
 
+    The calibration metrics are retrieved once through the shared calibration client and reused for all layouts.
+
     Args:
         cal_url: str
-            The url under which the calibration data for the backend can be found
+            The url under which the calibration data for the backend can be found, or the path of a local copy
         qubit_layout: List[int]
             The subset of system-qubits used in the protocol, indexed from 0
+        calset_id: Optional[str]
+            The calibration set ID the data belongs to
+        cache_dir: Optional[str]
+            The directory of the on-disk cache of calibration data, if any
     Returns:
         list_couplings: List[List[int]]
             A list of pairs, each of which is a qubit coupling for which the calibration
@@ -425,30 +917,7 @@ def extract_fidelities(cal_url: str, qubit_layout: List[int]) -> Tuple[List[List
         list_fids: List[float]
             A list of CZ fidelities from the calibration url, ordered in the same way as list_couplings
     """
-
-    byteobj = BytesIO()  # buffer creation
-    curlobj = pycurl.Curl()  # pylint: disable=c-extension-no-member
-    curlobj.setopt(curlobj.URL, f"{cal_url}")  # type: ignore
-    curlobj.setopt(curlobj.WRITEDATA, byteobj)  # type: ignore
-    curlobj.perform()  # perform file transfer
-    curlobj.close()  # end of session
-    body = byteobj.getvalue()
-    res = json.loads(body.decode())
-
-    qubit_mapping = {qubit: idx for idx, qubit in enumerate(qubit_layout)}
-    list_couplings = []
-    list_fids = []
-    for key in res["metrics"]:
-        if "irb.cz" in key:
-            idx_1 = key.index(".QB")
-            idx_2 = key.index("__QB")
-            idx_3 = key.index(".fidelity")
-            qb1 = int(key[idx_1 + 3 : idx_2]) - 1
-            qb2 = int(key[idx_2 + 4 : idx_3]) - 1
-            if all([qb1 in qubit_layout, qb2 in qubit_layout]):
-                list_couplings.append([qubit_mapping[qb1], qubit_mapping[qb2]])
-                list_fids.append(float(res["metrics"][key]["value"]))
-    return list_couplings, list_fids
+    return get_calibration_snapshot(cal_url, calset_id, cache_dir).layout_cz_fidelities(qubit_layout)
 
 
 def get_edges(
@@ -466,7 +935,8 @@ def get_edges(
         qubit_layout (List[int]):
             The subset of system-qubits used in the protocol, indexed from 0
         edges_cal (Optional[List[List[int]]]):
-            A coupling map of qubit pairs that have CZ fidelities in the calibration data
+            A coupling map of qubit pairs that have CZ fidelities in the calibration data, given as indices into
+            qubit_layout (as returned by extract_fidelities)
         fidelities_cal (Optional[List[float]]):
             A list of CZ fidelities ordered in the same way as edges_cal
 
@@ -474,32 +944,43 @@ def get_edges(
         graph: networkx.Graph
             The final weighted graph for the given calibration or coupling map
     """
-    edges_coupling = list(coupling_map.get_edges())[::2]
-    edges_patch = []
-    for idx, edge in enumerate(edges_coupling):
-        if edge[0] in qubit_layout and edge[1] in qubit_layout:
-            edges_patch.append([edge[0], edge[1]])
-
+    cz_fidelities = None
     if fidelities_cal is not None:
-        fidelities_cal = list(
-            np.minimum(np.array(fidelities_cal), np.ones(len(fidelities_cal)))
-        )  # get rid of > 1 fidelities
-        fidelities_patch = []
-        for edge in edges_patch:
-            for idx, edge_2 in enumerate(cast(List[int], edges_cal)):
-                if edge == edge_2:
-                    fidelities_patch.append(fidelities_cal[idx])
-        weights = -np.log(np.array(fidelities_patch))
-    else:
-        weights = np.ones(len(edges_patch))
-    graph = Graph()
-    for idx, edge in enumerate(edges_patch):
-        graph.add_edge(*edge, weight=weights[idx])
+        cz_fidelities = {
+            (qubit_layout[edge[0]], qubit_layout[edge[1]]): fidelity
+            for edge, fidelity in zip(cast(List[List[int]], edges_cal), fidelities_cal)
+        }
+    graph = GHZPlanner(coupling_map, cz_fidelities).layout_graph(qubit_layout)
     if not is_connected(graph):
         print("Warning: The subgraph of selected qubit_layout is not connected.")
     return graph
 
 
+def bfs_cx_schedule(tree: Graph, qubit_layout: List[int]) -> List[List[int]]:
+    """Calculate the CX gates preparing a GHZ state along a tree, layer by layer from its most central qubit.
+
+    The CX gates of each layer entangle the qubits at the same distance from the central qubit, starting with those
+    heading the deepest branches, so that any prefix of the schedule prepares a GHZ state on a connected subset.
+
+    Args:
+        tree (Graph): a spanning tree of the qubits of qubit_layout.
+        qubit_layout (List[int]): the subset of system-qubits used in the protocol, indexed from 0.
+    Returns:
+        List[List[int]]: the CX gates, as [control, target] pairs of system-qubits, in the order of application.
+    """
+    eccentricities = networkx.eccentricity(tree)
+    central_qubit = min(qubit_layout, key=lambda qubit: eccentricities[qubit])
+    parents = dict(networkx.bfs_predecessors(tree, central_qubit))
+    depths = networkx.single_source_shortest_path_length(tree, central_qubit)
+    # The height of the subtree below each qubit, accumulated from the leaves
+    heights = {qubit: 0 for qubit in depths}
+    for qubit in sorted(parents, key=lambda q: -depths[q]):
+        heights[parents[qubit]] = max(heights[parents[qubit]], heights[qubit] + 1)
+    layout_position = {qubit: idx for idx, qubit in enumerate(qubit_layout)}
+    order = sorted(parents, key=lambda q: (depths[q], -heights[q], layout_position[q]))
+    return [[parents[qubit], qubit] for qubit in order]
+
+
 def get_cx_map(qubit_layout: List[int], graph: networkx.Graph) -> list[list[int]]:
     """Calculate the cx_map based on participating qubits and the 2QB gate fidelities between them.
 
@@ -517,28 +998,125 @@ def get_cx_map(qubit_layout: List[int], graph: networkx.Graph) -> list[list[int]
         cx_map: List[List[int]]
             A list of CX gates for the GHZ generation circuit, starting from the first gate to be applied
     """
+    return bfs_cx_schedule(minimum_spanning_tree(graph), qubit_layout)
 
-    rev_mapping = {component: component for i, component in enumerate(qubit_layout)}
-    span = minimum_spanning_tree(graph)
-    path = dict(all_pairs_shortest_path(span))
-    all_distances = [max(len(path[target_qubit][qubit]) for qubit in qubit_layout) for target_qubit in qubit_layout]
-    shortest_distance = min(all_distances)
-    central_qubit = qubit_layout[np.argmin(all_distances)]
-    all_paths = list(path[central_qubit].values())
-    all_paths.sort(key=lambda x: -len(x))
-    already_entangled = [central_qubit]
-    cx_map = []
-    for i in range(1, shortest_distance):
-        for qubit_path in all_paths:
-            if i < len(qubit_path):
-                new_qubit = qubit_path[i]
-            else:
-                continue
-            if new_qubit in already_entangled:
-                continue
-            cx_map.append([rev_mapping[qubit_path[i - 1]], rev_mapping[new_qubit]])
-            already_entangled.append(new_qubit)
-    return cx_map
+
+class GHZPlanner:
+    """Plans GHZ state preparations along minimum spanning trees of a weighted device graph.
+
+    The device graph, with edge weights -log(CZ fidelity), and its minimum spanning tree are built once per
+    calibration. The spanning tree of a qubit layout is the restriction of the device tree whenever that restriction
+    is connected (it is then a minimum spanning tree of the layout), and the CX schedule of each layout is computed
+    once, so GHZ states of any size on the layout are prefixes of the same schedule.
+
+    Args:
+        coupling_map (CouplingMap): the coupling map of the device.
+        cz_fidelities (Optional[Dict[Tuple[int, int], float]]): the CZ fidelity of each coupling, in either
+            orientation. Couplings without a fidelity get the weight of the worst calibrated coupling. If None, all
+            couplings have unit weight.
+    """
+
+    def __init__(self, coupling_map: CouplingMap, cz_fidelities: Optional[Dict[Tuple[int, int], float]] = None):
+        weights: Dict[Tuple[int, int], float] = {}
+        if cz_fidelities:
+            for (qb1, qb2), fidelity in cz_fidelities.items():
+                # Get rid of > 1 fidelities
+                weights[(qb1, qb2)] = weights[(qb2, qb1)] = -np.log(min(fidelity, 1.0))
+        default_weight = max(weights.values()) if weights else 1.0
+        self.graph = Graph()
+        for qb1, qb2 in coupling_map.get_edges():
+            if not self.graph.has_edge(qb1, qb2):
+                self.graph.add_edge(qb1, qb2, weight=weights.get((qb1, qb2), default_weight))
+        self.tree = minimum_spanning_tree(self.graph)
+        self._schedules: Dict[Tuple[int, ...], List[List[int]]] = {}
+        self._native_circuits: Dict[Tuple[Tuple[int, ...], int], QuantumCircuit] = {}
+
+    def layout_graph(self, qubit_layout: List[int]) -> Graph:
+        """Return the weighted subgraph of the device graph induced by a qubit layout.
+
+        Args:
+            qubit_layout (List[int]): the subset of system-qubits, indexed from 0.
+        Returns:
+            Graph: the subgraph.
+        """
+        graph = Graph()
+        graph.add_nodes_from(qubit_layout)
+        graph.add_edges_from(self.graph.subgraph(qubit_layout).edges(data=True))
+        return graph
+
+    def spanning_tree(self, qubit_layout: List[int]) -> Graph:
+        """Return a minimum spanning tree of the subgraph induced by a qubit layout.
+
+        Args:
+            qubit_layout (List[int]): the subset of system-qubits, indexed from 0.
+        Returns:
+            Graph: the spanning tree.
+        """
+        restricted_tree = self.tree.subgraph(qubit_layout)
+        if len(restricted_tree) == len(qubit_layout) and is_connected(restricted_tree):
+            return restricted_tree
+        return minimum_spanning_tree(self.layout_graph(qubit_layout))
+
+    def cx_schedule(self, qubit_layout: List[int], n_state: Optional[int] = None) -> List[List[int]]:
+        """Return the CX gates preparing a GHZ state on a qubit layout, layered from its most central qubit.
+
+        Args:
+            qubit_layout (List[int]): the subset of system-qubits, indexed from 0.
+            n_state (Optional[int]): the number of qubits of the GHZ state; all qubits of the layout if None.
+        Returns:
+            List[List[int]]: the first n_state - 1 CX gates of the schedule of the layout.
+        """
+        key = tuple(qubit_layout)
+        if key not in self._schedules:
+            self._schedules[key] = bfs_cx_schedule(self.spanning_tree(qubit_layout), qubit_layout)
+        schedule = self._schedules[key]
+        return schedule if n_state is None else schedule[: n_state - 1]
+
+    def ghz_circuit(self, qubit_layout: List[int], n_state: Optional[int] = None) -> Tuple[QuantumCircuit, List[int]]:
+        """Generate the circuit preparing a GHZ state on (a connected subset of) a qubit layout.
+
+        Args:
+            qubit_layout (List[int]): the subset of system-qubits, indexed from 0.
+            n_state (Optional[int]): the number of qubits of the GHZ state; all qubits of the layout if None.
+        Returns:
+            Tuple[QuantumCircuit, List[int]]: the circuit and the qubits on which the GHZ state is defined.
+        """
+        return ghz_circuit_from_cx_map(self.cx_schedule(qubit_layout), qubit_layout, n_state)
+
+    def native_ghz_circuit(self, qubit_layout: List[int], n_state: int, num_qubits: int) -> QuantumCircuit:
+        """Generate the circuit preparing a GHZ state on a qubit layout directly in native "r" and "cz" gates.
+
+        The circuits of all sizes are prefixes of the native circuit of the whole layout, which is built once: the
+        root is prepared with RY(pi/2) and every CX gate is lowered to RY(-pi/2) CZ RY(pi/2) on its target.
+
+        Args:
+            qubit_layout (List[int]): the subset of system-qubits, indexed from 0.
+            n_state (int): the number of qubits of the GHZ state.
+            num_qubits (int): the number of qubits of the backend.
+        Returns:
+            QuantumCircuit: the circuit on the backend qubits, measuring the participating qubits in layout order.
+        """
+        key = (tuple(qubit_layout), num_qubits)
+        if key not in self._native_circuits:
+            schedule = self.cx_schedule(qubit_layout)
+            native = QuantumCircuit(num_qubits)
+            native.r(np.pi / 2, np.pi / 2, schedule[0][0] if schedule else qubit_layout[0])
+            for control, target in schedule:
+                native.r(-np.pi / 2, np.pi / 2, target)
+                native.cz(control, target)
+                native.r(np.pi / 2, np.pi / 2, target)
+            self._native_circuits[key] = native
+        native = self._native_circuits[key]
+        _, participating_qubits = ghz_circuit_from_cx_map(self.cx_schedule(qubit_layout), qubit_layout, n_state)
+
+        qc = native.copy_empty_like()
+        for instruction in native.data[: 1 + 3 * (n_state - 1)]:
+            qc.append(instruction)
+        measure_register = ClassicalRegister(n_state, "meas")
+        qc.add_register(measure_register)
+        qc.barrier(participating_qubits)
+        qc.measure(participating_qubits, measure_register)
+        return qc
 
 
 def plot_fidelities(observations: List[BenchmarkObservation], qubit_layouts: List[List[int]]) -> Figure:
@@ -558,6 +1136,7 @@ def plot_fidelities(observations: List[BenchmarkObservation], qubit_layouts: Lis
     """
     fig, ax = plt.subplots()
     layout_short = {str(qubit_layout): f" L{i}" for i, qubit_layout in enumerate(qubit_layouts)}
+    layout_sizes = {str(qubit_layout): len(qubit_layout) for qubit_layout in qubit_layouts}
     recorded_labels = []
     for i, obs in enumerate(observations):
         label = "With REM" if "rem" in obs.name else "Unmitigated"
@@ -565,7 +1144,7 @@ def plot_fidelities(observations: List[BenchmarkObservation], qubit_layouts: Lis
             label = "_nolegend_"
         else:
             recorded_labels.append(label)
-        x = sum(c.isdigit() for c in obs.identifier.string_identifier)
+        x = layout_sizes[obs.identifier.string_identifier]
         y = obs.value
         ax.errorbar(
             x,
@@ -623,8 +1202,32 @@ class GHZBenchmark(Benchmark):
         self.num_RMs = configuration.num_RMs
         self.rem = configuration.rem
         self.mit_shots = configuration.mit_shots
+        self.rem_cache_dir = configuration.rem_cache_dir
+        self.async_rem_calibration = configuration.async_rem_calibration
+        self.rem_method = configuration.rem_method
         self.cal_url = configuration.cal_url
+        self.cal_cache_dir = configuration.cal_cache_dir
+        self.ghz_planner: Optional[GHZPlanner] = None
+        self.size_sweep = configuration.size_sweep
+        self.sweep_sizes = configuration.sweep_sizes
+        self.sweep_batch_size = configuration.sweep_batch_size
+        self.fidelity_threshold = configuration.fidelity_threshold
         self.timestamp = strftime("%Y%m%d-%H%M%S")
+        self.rm_clifford_indices: Dict[str, List[List[int]]] = {}
+
+    def get_ghz_planner(self) -> GHZPlanner:
+        """
+        Returns the GHZ planner of the backend, built once from the calibration data if cal_url is given
+
+        Returns:
+            GHZPlanner: the planner shared by all qubit layouts
+        """
+        if self.ghz_planner is None:
+            cz_fidelities = None
+            if self.cal_url:
+                cz_fidelities = get_calibration_snapshot(self.cal_url, self.calset_id, self.cal_cache_dir).cz_fidelities
+            self.ghz_planner = GHZPlanner(self.backend.coupling_map, cz_fidelities)
+        return self.ghz_planner
 
     def generate_native_ghz(self, qubit_layout: List[int], qubit_count: int, routine: str) -> CircuitGroup:
         """
@@ -660,18 +1263,13 @@ class GHZBenchmark(Benchmark):
             )
             final_ghz = ghz_native_transpiled
         elif routine == "tree":
-            if self.cal_url:
-                edges_cal, fidelities_cal = extract_fidelities(self.cal_url, qubit_layout)
-                graph = get_edges(self.backend.coupling_map, qubit_layout, edges_cal, fidelities_cal)
-            else:
-                graph = get_edges(self.backend.coupling_map, qubit_layout)
-            ghz, _ = generate_ghz_spanning_tree(graph, qubit_layout, qubit_count)
+            ghz, participating_qubits = self.get_ghz_planner().ghz_circuit(qubit_layout, qubit_count)
             circuit_group.add_circuit(ghz)
             ghz_native_transpiled, _ = perform_backend_transpilation(
                 [ghz],
                 self.backend,
-                qubit_layout,
-                fixed_coupling_map,
+                participating_qubits,
+                set_coupling_map(participating_qubits, self.backend, "fixed"),
                 qiskit_optim_level=self.qiskit_optim_level,
                 optimize_sqg=self.optimize_sqg,
             )
@@ -689,25 +1287,32 @@ class GHZBenchmark(Benchmark):
             # Use either the circuit with min depth after transpilation or min #2q gates
             if ghz_native_transpiled[0].depth() == ghz_native_transpiled[1].depth():
                 index_min_2q = np.argmin([c.count_ops()["cz"] for c in ghz_native_transpiled])
-                final_ghz = ghz_native_transpiled[index_min_2q]
+                final_ghz = [ghz_native_transpiled[index_min_2q]]
                 circuit_group.add_circuit(ghz_log[index_min_2q])
             else:
                 index_min_depth = np.argmin([c.depth() for c in ghz_native_transpiled])
-                final_ghz = ghz_native_transpiled[index_min_depth]
-                circuit_group.add_circuit([ghz_log[index_min_depth]])
+                final_ghz = [ghz_native_transpiled[index_min_depth]]
+                circuit_group.add_circuit(ghz_log[index_min_depth])
         self.circuits["untranspiled_circuits"].circuit_groups.append(circuit_group)
         return CircuitGroup(name=f"{qubit_layout}_native_ghz", circuits=[final_ghz[0]])
 
-    def generate_coherence_meas_circuits(self, qubit_layout: List[int], qubit_count: int) -> List[QuantumCircuit]:
+    def generate_coherence_meas_circuits(
+        self, qubit_layout: List[int], qubit_count: int, transpiled_ghz: Optional[QuantumCircuit] = None
+    ) -> List[QuantumCircuit]:
         """
         Takes a given GHZ circuit and outputs circuits needed to measure fidelity via mult. q. coherences method
 
+        A single coherence circuit with a parametrized phase is transpiled, and the phases are bound as virtual Z
+        rotations absorbed into the phases of the native "r" gates that follow them.
+
         Args:
             qubit_layout: List[int]
                 The subset of system-qubits used in the protocol, indexed from 0
             qubit_count: int
                 The number of qubits for which a GHZ state should be created. This values should be smaller or equal to
                 the number of qubits in qubit_layout
+            transpiled_ghz: Optional[QuantumCircuit]
+                The transpiled GHZ circuit, if already available
         Returns:
              qc_list_transpiled: List[QuantumCircuit]
                 A list of transpiled quantum circuits to be measured
@@ -719,31 +1324,41 @@ class GHZBenchmark(Benchmark):
         qc = qc_list[0].copy()
         qc.remove_final_measurements()
         qc_inv = qc.inverse()
+        phase_parameter = Parameter("phase")
+        template = qc.copy()
+        template.barrier()
+        for qubit, _ in enumerate(qubit_layout):
+            template.p(phase_parameter, qubit)
+        template.barrier()
+        template.compose(qc_inv, inplace=True)
+        template.measure_active()
         phases = [np.pi * i / (qubit_count + 1) for i in range(2 * qubit_count + 2)]
-        for phase in phases:
-            qc_phase = qc.copy()
-            qc_phase.barrier()
-            for qubit, _ in enumerate(qubit_layout):
-                qc_phase.p(phase, qubit)
-            qc_phase.barrier()
-            qc_phase.compose(qc_inv, inplace=True)
-            qc_phase.measure_active()
-            qc_list.append(qc_phase)
+        qc_list.extend(template.assign_parameters({phase_parameter: phase}) for phase in phases)
 
         fixed_coupling_map = set_coupling_map(qubit_layout, self.backend, "fixed")
         qc_list_transpiled, _ = perform_backend_transpilation(
-            qc_list,
+            [template] if transpiled_ghz is not None else [qc_list[0], template],
             self.backend,
             qubit_layout,
             fixed_coupling_map,
             qiskit_optim_level=self.qiskit_optim_level,
             optimize_sqg=self.optimize_sqg,
         )
+        transpiled_template = qc_list_transpiled[-1]
+        try:
+            native_templates = lower_native_templates([transpiled_template])
+            phase_circuits = [native_templates.bind([[phase]])[0] for phase in phases]
+        except ValueError:
+            # Templates with other than "r" and "cz" gates (e.g., MOVE gates) are bound by qiskit
+            phase_circuits = [transpiled_template.assign_parameters({phase_parameter: phase}) for phase in phases]
+
         circuit_group = CircuitGroup(name=idx, circuits=qc_list)
         self.circuits["untranspiled_circuits"].circuit_groups.append(circuit_group)
-        return qc_list_transpiled
+        return [transpiled_ghz if transpiled_ghz is not None else qc_list_transpiled[0]] + phase_circuits
 
-    def generate_readout_circuit(self, qubit_layout: List[int], qubit_count: int) -> CircuitGroup:
+    def generate_readout_circuit(
+        self, qubit_layout: List[int], qubit_count: int, transpiled_ghz_group: Optional[CircuitGroup] = None
+    ) -> CircuitGroup:
         """
         A wrapper for the creation of different circuits to estimate the fidelity
 
@@ -753,6 +1368,8 @@ class GHZBenchmark(Benchmark):
             qubit_count: int
                 The number of qubits for which a GHZ state should be created. This values should be smaller or equal to
                 the number of qubits in qubit_layout
+            transpiled_ghz_group: Optional[CircuitGroup]
+                The transpiled GHZ state preparation, if already generated
 
         Returns:
              all_circuits_list: List[QuantumCircuit]
@@ -761,18 +1378,22 @@ class GHZBenchmark(Benchmark):
         # Generate the list of circuits
 
         qcvv_logger.info(f"Now generating a {len(qubit_layout)}-qubit GHZ state on qubits {qubit_layout}")
-        transpiled_ghz_group: CircuitGroup = self.generate_native_ghz(
-            qubit_layout, qubit_count, self.state_generation_routine
-        )
+        if transpiled_ghz_group is None:
+            transpiled_ghz_group = self.generate_native_ghz(qubit_layout, qubit_count, self.state_generation_routine)
 
         match self.fidelity_routine:
             case "randomized_measurements":
-                all_circuits_list, _ = append_rms(
+                (all_circuits_list, clifford_indices), _ = append_rms(
                     transpiled_ghz_group.circuits[0], cast(int, self.num_RMs), self.backend
                 )
                 transpiled_ghz_group.circuits = all_circuits_list
+                self.rm_clifford_indices[BenchmarkObservationIdentifier(qubit_layout).string_identifier] = (
+                    clifford_indices.tolist()
+                )
             case "coherences":
-                all_circuits_list = self.generate_coherence_meas_circuits(qubit_layout, qubit_count)
+                all_circuits_list = self.generate_coherence_meas_circuits(
+                    qubit_layout, qubit_count, transpiled_ghz_group.circuits[0]
+                )
                 transpiled_ghz_group.circuits = all_circuits_list
         self.circuits["transpiled_circuits"].circuit_groups.append(transpiled_ghz_group)
         return transpiled_ghz_group
@@ -794,11 +1415,15 @@ class GHZBenchmark(Benchmark):
                 dataset.attrs[key] = value
         dataset.attrs[f"backend_name"] = self.backend.name
         dataset.attrs["fidelity_routine"] = self.fidelity_routine
+        for idx, clifford_indices in self.rm_clifford_indices.items():
+            dataset.attrs[f"{idx}_rm_clifford_indices"] = clifford_indices
 
     def execute(self, backend) -> xr.Dataset:
         """
         Executes the benchmark.
         """
+        if self.size_sweep:
+            return self.execute_size_sweep(backend)
         aux_custom_qubits_array = cast(List[List[int]], self.custom_qubits_array).copy()
         dataset = xr.Dataset()
 
@@ -808,6 +1433,7 @@ class GHZBenchmark(Benchmark):
         self.circuits = Circuits()
         self.circuits.benchmark_circuits.append(BenchmarkCircuit(name="transpiled_circuits"))
         self.circuits.benchmark_circuits.append(BenchmarkCircuit(name="untranspiled_circuits"))
+        self.rm_clifford_indices = {}
         for qubit_layout in aux_custom_qubits_array:
             Id = BenchmarkObservationIdentifier(qubit_layout)
             idx = Id.string_identifier
@@ -815,6 +1441,9 @@ class GHZBenchmark(Benchmark):
             qubit_count = len(qubit_layout)
             circuit_group: CircuitGroup = self.generate_readout_circuit(qubit_layout, qubit_count)
             transpiled_circuit_dict = {tuple(qubit_layout): circuit_group.circuits}
+            self.submit_rem_calibration(
+                backend, {q for qc in circuit_group.circuits for q in final_measurement_mapping(qc).values()}
+            )
             all_jobs[idx], _ = submit_execute(
                 transpiled_circuit_dict,
                 backend,
@@ -831,15 +1460,159 @@ class GHZBenchmark(Benchmark):
             idx = Id.string_identifier
             qubit_count = len(qubit_layout)
             counts, _ = retrieve_all_counts(all_jobs[idx])
-            dataset, _ = add_counts_to_dataset(counts, idx, dataset)
-            if self.rem:
-                qcvv_logger.info(f"Applying readout error mitigation")
-                circuit_group = self.circuits["transpiled_circuits"][f"{idx}_native_ghz"]
-                rem_results, _ = apply_readout_error_mitigation(backend, circuit_group.circuits, counts, self.mit_shots)
+            dataset = self.add_layout_counts_to_dataset(backend, idx, counts, dataset)
+
+        self.add_configuration_to_dataset(dataset)
+        return dataset
+
+    def submit_rem_calibration(self, backend, qubits: Iterable[int]):
+        """
+        Submits the readout calibration of the qubits to be measured ahead of the circuits measuring them, if
+        async_rem_calibration=True, so that it is executed alongside them rather than after their counts are retrieved.
+
+        Args:
+            backend: the backend the circuits are executed on.
+            qubits (Iterable[int]): the physical qubits to be measured.
+        """
+        if self.rem and self.async_rem_calibration:
+            submit_readout_error_mitigation_calibration(
+                backend, qubits, self.mit_shots, self.calset_id, self.rem_cache_dir
+            )
+
+    def add_layout_counts_to_dataset(
+        self, backend, idx: str, counts: List[Dict[str, int]], dataset: xr.Dataset
+    ) -> xr.Dataset:
+        """
+        Adds the counts of a qubit layout, and their readout error mitigated version if rem=True, to the dataset.
+
+        Args:
+            backend: the backend the circuits were executed on.
+            idx (str): the string identifier of the qubit layout.
+            counts (List[Dict[str, int]]): the counts of the circuits of the layout.
+            dataset (xr.Dataset): the dataset.
+        Returns:
+            xr.Dataset: the dataset with the counts added.
+        """
+        dataset, _ = add_counts_to_dataset(counts, idx, dataset)
+        if self.rem:
+            qcvv_logger.info(f"Applying readout error mitigation")
+            circuit_group = self.circuits["transpiled_circuits"][f"{idx}_native_ghz"]
+            if self.rem_method == "tensored":
+                rem_results_dist, _ = apply_tensored_readout_error_mitigation(
+                    backend,
+                    circuit_group.circuits,
+                    counts,
+                    self.mit_shots,
+                    calset_id=self.calset_id,
+                    cache_dir=self.rem_cache_dir,
+                )
+            else:
+                rem_results, _ = apply_readout_error_mitigation(
+                    backend,
+                    circuit_group.circuits,
+                    counts,
+                    self.mit_shots,
+                    calset_id=self.calset_id,
+                    cache_dir=self.rem_cache_dir,
+                )
                 rem_results_dist = [counts_mit.nearest_probability_distribution() for counts_mit in rem_results]
-                dataset, _ = add_counts_to_dataset(rem_results_dist, f"{idx}_rem", dataset)
+            dataset, _ = add_counts_to_dataset(rem_results_dist, f"{idx}_rem", dataset)
+        return dataset
+
+    def generate_sweep_ghz(self, base_layout: List[int], qubit_count: int) -> Tuple[List[int], CircuitGroup]:
+        """
+        Generates the GHZ state of a given size of a size sweep, as a prefix of the planned tree of the base layout
+
+        Args:
+            base_layout: List[int]
+                The qubit layout over which the GHZ states are grown
+            qubit_count: int
+                The number of qubits of the GHZ state
+
+        Returns:
+            participating_qubits: List[int]
+                The qubits on which the GHZ state is defined, in the order of base_layout
+            transpiled_ghz_group: CircuitGroup
+                The group containing the native GHZ circuit
+        """
+        planner = self.get_ghz_planner()
+        ghz, participating_qubits = planner.ghz_circuit(base_layout, qubit_count)
+        self.circuits["untranspiled_circuits"].circuit_groups.append(
+            CircuitGroup(name=f"{participating_qubits}_native_ghz", circuits=[ghz])
+        )
+        if "move" in self.backend.operation_names:
+            # Star architectures route two-qubit gates through the resonator
+            native_ghz, _ = perform_backend_transpilation(
+                [ghz],
+                self.backend,
+                participating_qubits,
+                set_coupling_map(participating_qubits, self.backend, "fixed"),
+                qiskit_optim_level=self.qiskit_optim_level,
+                optimize_sqg=self.optimize_sqg,
+            )
+        else:
+            native_ghz = [planner.native_ghz_circuit(base_layout, qubit_count, self.backend.num_qubits)]
+        return participating_qubits, CircuitGroup(name=f"{participating_qubits}_native_ghz", circuits=native_ghz)
 
+    def execute_size_sweep(self, backend) -> xr.Dataset:
+        """
+        Executes the benchmark as a sweep over GHZ sizes, grown along the planned tree of each qubit layout.
+
+        The sizes are submitted in batches of sweep_batch_size, each batch in a single submission, and no larger sizes
+        are submitted once a size has a fidelity below fidelity_threshold.
+        """
+        dataset = xr.Dataset()
+        self.circuits = Circuits()
+        self.circuits.benchmark_circuits.append(BenchmarkCircuit(name="transpiled_circuits"))
+        self.circuits.benchmark_circuits.append(BenchmarkCircuit(name="untranspiled_circuits"))
+        self.rm_clifford_indices = {}
         self.add_configuration_to_dataset(dataset)
+
+        executed_layouts: List[List[int]] = []
+        sweep_layouts: List[List[Any]] = []
+        for base_layout in cast(List[List[int]], self.custom_qubits_array):
+            sizes = [k for k in (self.sweep_sizes or range(2, len(base_layout) + 1)) if 2 <= k <= len(base_layout)]
+            # The states of all sizes are measured on qubits of the base layout
+            self.submit_rem_calibration(backend, base_layout)
+            base_sweep_layouts: List[List[int]] = []
+            for batch in chunked(sizes, self.sweep_batch_size or max(len(sizes), 1)):
+                batch_layouts, batch_groups = [], []
+                for qubit_count in batch:
+                    qubits, transpiled_ghz_group = self.generate_sweep_ghz(base_layout, qubit_count)
+                    batch_groups.append(self.generate_readout_circuit(qubits, qubit_count, transpiled_ghz_group))
+                    batch_layouts.append(qubits)
+                jobs, _ = submit_execute(
+                    {tuple(base_layout): [qc for group in batch_groups for qc in group.circuits]},
+                    backend,
+                    self.shots,
+                    self.calset_id,
+                    max_gates_per_batch=self.max_gates_per_batch,
+                )
+                counts, _ = retrieve_all_counts(jobs)
+
+                below_threshold = False
+                offset = 0
+                for qubits, group in zip(batch_layouts, batch_groups):
+                    idx = BenchmarkObservationIdentifier(qubits).string_identifier
+                    dataset = self.add_layout_counts_to_dataset(
+                        backend, idx, counts[offset : offset + len(group.circuits)], dataset
+                    )
+                    offset += len(group.circuits)
+                    if idx in self.rm_clifford_indices:
+                        dataset.attrs[f"{idx}_rm_clifford_indices"] = self.rm_clifford_indices[idx]
+                    values, _ = ghz_layout_fidelities(dataset, qubits, self.circuits)
+                    fidelity = values.get("fidelity_rem", values["fidelity"])
+                    qcvv_logger.info(f"GHZ fidelity on {len(qubits)} qubits {qubits}: {fidelity:.3f}")
+                    below_threshold |= fidelity < self.fidelity_threshold
+                base_sweep_layouts.extend(batch_layouts)
+                if below_threshold:
+                    qcvv_logger.info(f"Fidelity below {self.fidelity_threshold}: stopping the sweep on {base_layout}")
+                    break
+            executed_layouts.extend(base_sweep_layouts)
+            sweep_layouts.append([list(base_layout), base_sweep_layouts])
+
+        dataset.attrs["custom_qubits_array"] = executed_layouts
+        dataset.attrs["sweep_layouts"] = sweep_layouts
         return dataset
 
 
@@ -882,10 +1655,32 @@ class GHZConfiguration(BenchmarkConfigurationBase):
             * Default: True
         mit_shots (int): Total number of shots for readout error mitigation
             * Default: 1000
+        rem_cache_dir (Optional[str]): Optional directory where the readout calibrations are cached on disk, in
+            addition to the in-memory cache shared by all benchmarks of the process
+            * Default: None
+        async_rem_calibration (bool): Whether the readout calibration of the measured qubits is submitted before the
+            GHZ circuits and executed alongside them, instead of after their counts are retrieved
+            * Default: False
+        rem_method (str): The readout error mitigation method
+            - "m3": M3 correction on the observed outcomes of each circuit
+            - "tensored": Tensored correction of all circuits in bulk, with the same single-qubit calibrations
+            * Default: "m3"
         cal_url (Optional[str]): Optional URL where the calibration data for the selected backend can be retrieved from
             The calibration data is used for the "tree" state generation routine to prioritize couplings with high
-            CZ fidelity.
+            CZ fidelity. The path of a local JSON file with the same content can be given instead.
+            * Default: None
+        cal_cache_dir (Optional[str]): Optional directory where the retrieved calibration data is cached on disk
             * Default: None
+        size_sweep (bool): Whether to sweep the GHZ state size over each qubit layout instead of preparing a single
+            GHZ state on it. The states of all sizes are grown along one planned tree of the layout.
+            * Default: False
+        sweep_sizes (Optional[Sequence[int]]): The GHZ state sizes of the sweep
+            * Default: None (all sizes from 2 to the number of qubits of the layout)
+        sweep_batch_size (Optional[int]): The number of sizes submitted together in the sweep. Larger sizes are not
+            submitted once a size has a fidelity below fidelity_threshold.
+            * Default: 4 (None submits all sizes at once)
+        fidelity_threshold (float): The fidelity threshold of the sweep
+            * Default: 0.5
     """
 
     benchmark: Type[Benchmark] = GHZBenchmark
@@ -899,4 +1694,12 @@ class GHZConfiguration(BenchmarkConfigurationBase):
     num_RMs: Optional[int] = 100
     rem: bool = True
     mit_shots: int = 1_000
+    rem_cache_dir: Optional[str] = None
+    async_rem_calibration: bool = False
+    rem_method: str = "m3"
     cal_url: Optional[str] = None
+    cal_cache_dir: Optional[str] = None
+    size_sweep: bool = False
+    sweep_sizes: Optional[Sequence[int]] = None
+    sweep_batch_size: Optional[int] = 4
+    fidelity_threshold: float = 0.5
@@ -0,0 +1,542 @@
+# Copyright 2024 IQM Benchmarks developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Local, latency-configurable stand-in for an IQM backend, to profile client-side throughput offline.
+
+Jobs are serialized as for a remote IQM server, go through simulated queueing, compilation and execution stages and
+return synthetic (uniformly random) counts together with the `timestamps` job metadata of a real server.
+The job engine can run in-process or behind a localhost HTTP service (`LocalBackendServer`).
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from queue import Queue
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+from urllib import request as urllib_request
+from urllib.error import HTTPError
+import uuid
+import weakref
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.providers import JobStatus, JobV1, Options
+from qiskit.result import Counts, Result
+
+from iqm.iqm_client import Circuit, DynamicQuantumArchitecture, QuantumArchitectureSpecification, RunRequest
+from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
+from iqm.qiskit_iqm.iqm_provider import _serialize_instructions
+from iqm.qiskit_iqm.qiskit_to_iqm import MeasurementKey
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+
+@dataclass
+class LocalLatencyProfile:
+    """Latencies and limits of a local backend stand-in.
+
+    Attributes:
+        submit_latency (float): The time (in seconds) a client blocks on each job submission.
+        queue_latency (float): The time (in seconds) a job waits after reception before being compiled.
+        compile_time_per_circuit (float): The compilation time (in seconds) per circuit.
+        execution_overhead (float): The fixed execution time (in seconds) per job.
+        shot_time (float): The execution time (in seconds) per shot of each circuit.
+        max_circuits (Optional[int]): The maximum number of circuits per job, if any.
+        max_shots (Optional[int]): The maximum number of shots per job, if any.
+    """
+
+    submit_latency: float = 0.0
+    queue_latency: float = 0.0
+    compile_time_per_circuit: float = 0.0
+    execution_overhead: float = 0.0
+    shot_time: float = 0.0
+    max_circuits: Optional[int] = None
+    max_shots: Optional[int] = None
+
+
+def synthetic_counts(circuit: Circuit, shots: int, rng: np.random.Generator) -> Dict[str, int]:
+    """Sample uniformly random counts for the measurements of a serialized circuit.
+
+    Bitstrings are formatted as by `IQMJob`: classical registers separated by spaces, in little-endian order.
+
+    Args:
+        circuit (Circuit): the serialized circuit.
+        shots (int): the number of shots.
+        rng (np.random.Generator): the random number generator.
+    Returns:
+        Dict[str, int]: the counts of the circuit.
+    """
+    keys = [
+        MeasurementKey.from_string(instruction.args["key"])
+        for instruction in circuit.instructions
+        if instruction.name == "measure" and not instruction.args["key"].startswith("_reset")
+    ]
+    if not keys:
+        return {"": shots}
+    creg_lengths = {key.creg_idx: key.creg_len for key in keys}
+    bits = {creg_idx: np.zeros((shots, creg_len), dtype=int) for creg_idx, creg_len in creg_lengths.items()}
+    samples = rng.integers(0, 2, size=(shots, len(keys)))
+    for column, key in enumerate(keys):
+        bits[key.creg_idx][:, key.clbit_idx] = samples[:, column]
+    creg_bitstrings = [
+        ["".join(map(str, row)) for row in bits[creg_idx].tolist()] for creg_idx in sorted(creg_lengths.keys())
+    ]
+    return dict(Counter(" ".join(registers)[::-1] for registers in zip(*creg_bitstrings)))
+
+
+class LocalJobEngine:
+    """Job engine of a local backend stand-in.
+
+    Jobs are compiled by one worker thread and executed by another, so that a job can be compiled while the previous
+    one is executing, as in a remote server. The worker threads run until `close` is called, after which no jobs can be
+    submitted. Jobs whose compilation or execution fails end in the `JobStatus.ERROR` status.
+
+    Args:
+        latency_profile (Optional[LocalLatencyProfile]): the latencies and limits of the engine.
+        seed (Optional[int]): the seed of the synthetic counts.
+    """
+
+    def __init__(self, latency_profile: Optional[LocalLatencyProfile] = None, seed: Optional[int] = None):
+        self.latency_profile = latency_profile if latency_profile is not None else LocalLatencyProfile()
+        self._rng = np.random.default_rng(seed)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._compile_queue: Queue = Queue()
+        self._execution_queue: Queue = Queue()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=target, daemon=True) for target in (self._compile_worker, self._execution_worker)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+    def submit(self, circuits: List[Circuit], shots: int) -> str:
+        """Submit serialized circuits for execution.
+
+        Args:
+            circuits (List[Circuit]): the serialized circuits.
+            shots (int): the number of shots per circuit.
+        Returns:
+            str: the job ID.
+        Raises:
+            ValueError: if the job exceeds the limits of the engine.
+            RuntimeError: if the engine is closed.
+        """
+        max_circuits, max_shots = self.latency_profile.max_circuits, self.latency_profile.max_shots
+        if not circuits:
+            raise ValueError("Empty list of circuits submitted for execution.")
+        if max_circuits is not None and len(circuits) > max_circuits:
+            raise ValueError(f"Job with {len(circuits)} circuits exceeds the limit of {max_circuits} circuits.")
+        if max_shots is not None and shots > max_shots:
+            raise ValueError(f"Job with {shots} shots exceeds the limit of {max_shots} shots.")
+
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The job engine is closed.")
+            self._jobs[job_id] = {
+                "circuits": circuits,
+                "shots": shots,
+                "status": JobStatus.QUEUED,
+                "done": threading.Event(),
+                "timestamps": {"job_start": self._now()},
+                "counts": None,
+                "error": None,
+            }
+            self._compile_queue.put(job_id)
+        return job_id
+
+    def close(self):
+        """Stop the worker threads once the jobs submitted so far are done, and reject further submissions."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                # Jobs are processed in order, so the shutdown sentinel reaches the workers after every submitted job
+                self._compile_queue.put(None)
+
+    def _compile_worker(self):
+        while True:
+            job_id = self._compile_queue.get()
+            if job_id is None:
+                self._execution_queue.put(None)
+                return
+            job = self._jobs[job_id]
+            try:
+                time.sleep(self.latency_profile.queue_latency)
+                job["timestamps"]["compile_start"] = self._now()
+                time.sleep(self.latency_profile.compile_time_per_circuit * len(job["circuits"]))
+                job["timestamps"]["compile_end"] = self._now()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                self._fail(job, exc)
+            else:
+                self._execution_queue.put(job)
+
+    def _execution_worker(self):
+        while True:
+            job = self._execution_queue.get()
+            if job is None:
+                return
+            try:
+                job["timestamps"]["submit_start"] = self._now()
+                job["timestamps"]["submit_end"] = self._now()
+                job["status"] = JobStatus.RUNNING
+                job["timestamps"]["execution_start"] = self._now()
+                time.sleep(
+                    self.latency_profile.execution_overhead
+                    + self.latency_profile.shot_time * job["shots"] * len(job["circuits"])
+                )
+                job["counts"] = [synthetic_counts(circuit, job["shots"], self._rng) for circuit in job["circuits"]]
+                job["timestamps"]["execution_end"] = self._now()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                self._fail(job, exc)
+                continue
+            job["timestamps"]["job_end"] = self._now()
+            job["status"] = JobStatus.DONE
+            job["done"].set()
+
+    def _fail(self, job: Dict[str, Any], exc: Exception):
+        # The worker keeps serving the next jobs, and the waiters of this one are released with the error
+        job["error"] = f"{type(exc).__name__}: {exc}"
+        job["timestamps"]["job_end"] = self._now()
+        job["status"] = JobStatus.ERROR
+        job["done"].set()
+
+    def status(self, job_id: str) -> JobStatus:
+        """Get the status of a job.
+
+        Args:
+            job_id (str): the job ID.
+        Returns:
+            JobStatus: the status of the job.
+        Raises:
+            KeyError: if there is no job with the given ID.
+        """
+        return self._job(job_id)["status"]
+
+    def wait_for_results(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a job to finish and get its results.
+
+        Args:
+            job_id (str): the job ID.
+            timeout (Optional[float]): the maximum time to wait, in seconds.
+        Returns:
+            Dict[str, Any]: the "counts" of every circuit and the "timestamps" of the job.
+        Raises:
+            KeyError: if there is no job with the given ID.
+            TimeoutError: if the job did not finish in time.
+            RuntimeError: if the job failed.
+        """
+        job = self._job(job_id)
+        if not job["done"].wait(timeout):
+            raise TimeoutError(f"Job {job_id} did not finish in {timeout} seconds.")
+        if job["status"] == JobStatus.ERROR:
+            raise RuntimeError(f"Job {job_id} failed: {job['error']}")
+        return {"counts": job["counts"], "timestamps": dict(job["timestamps"])}
+
+    def _job(self, job_id: str) -> Dict[str, Any]:
+        with self._lock:
+            if job_id not in self._jobs:
+                raise KeyError(f"Unknown job {job_id}.")
+            return self._jobs[job_id]
+
+
+class LocalBackendServer:
+    """Localhost HTTP service exposing a `LocalJobEngine`.
+
+    Jobs are submitted with `POST /jobs` and polled with `GET /jobs/<job_id>`. Use `IQMLocalBackend(server_url=...)`
+    to submit through the service.
+
+    Args:
+        latency_profile (Optional[LocalLatencyProfile]): the latencies and limits of the engine.
+        seed (Optional[int]): the seed of the synthetic counts.
+        port (int): the port to listen on. Defaults to 0, which picks a free port.
+    """
+
+    def __init__(
+        self, latency_profile: Optional[LocalLatencyProfile] = None, seed: Optional[int] = None, port: int = 0
+    ):
+        engine = self._engine = LocalJobEngine(latency_profile, seed)
+
+        class Handler(BaseHTTPRequestHandler):
+            """Request handler of the local backend service."""
+
+            def _reply(self, code: int, payload: Dict[str, Any]):
+                body = json.dumps(payload).encode()
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):  # pylint: disable=invalid-name
+                """Submit a job."""
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                try:
+                    circuits = [Circuit.model_validate(circuit) for circuit in payload["circuits"]]
+                    self._reply(200, {"job_id": engine.submit(circuits, payload["shots"])})
+                except ValueError as exc:
+                    self._reply(400, {"error": str(exc)})
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """Poll a job."""
+                job_id = self.path.rsplit("/", 1)[-1]
+                try:
+                    status = engine.status(job_id)
+                except KeyError as exc:
+                    self._reply(404, {"error": exc.args[0]})
+                    return
+                if status == JobStatus.DONE:
+                    self._reply(200, {"status": status.name, **engine.wait_for_results(job_id)})
+                elif status == JobStatus.ERROR:
+                    try:
+                        engine.wait_for_results(job_id)
+                    except RuntimeError as exc:
+                        self._reply(200, {"status": status.name, "error": exc.args[0]})
+                else:
+                    self._reply(200, {"status": status.name})
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                return
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def start(self) -> "LocalBackendServer":
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the service and its job engine."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._engine.close()
+
+    def __enter__(self) -> "LocalBackendServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class IQMLocalJob(JobV1):
+    """Job of an `IQMLocalBackend`, exposing the same results and metadata as `IQMJob`.
+
+    Args:
+        backend (IQMLocalBackend): the backend the job was submitted to.
+        job_id (str): the job ID.
+        circuit_names (List[str]): the names of the circuits of the job.
+        shots (int): the number of shots per circuit.
+    """
+
+    def __init__(self, backend: "IQMLocalBackend", job_id: str, circuit_names: List[str], shots: int):
+        super().__init__(backend, job_id=job_id, shots=shots)
+        self.circuit_metadata: List[Dict[str, Any]] = [{} for _ in circuit_names]
+        self._circuit_names = circuit_names
+        self._counts: Optional[List[Dict[str, int]]] = None
+
+    def submit(self):
+        raise NotImplementedError("Jobs are submitted by IQMLocalBackend.run.")
+
+    def result(self) -> Result:
+        if self._counts is None:
+            results = self.backend().wait_for_results(self.job_id())
+            self.metadata["timestamps"] = results["timestamps"]
+            self._counts = results["counts"]
+        return Result.from_dict(
+            {
+                "backend_name": self.backend().name,
+                "backend_version": None,
+                "qobj_id": None,
+                "job_id": self.job_id(),
+                "success": True,
+                "results": [
+                    {
+                        "shots": self.metadata["shots"],
+                        "success": True,
+                        "data": {"counts": Counts(counts), "metadata": {}},
+                        "header": {"name": name},
+                    }
+                    for name, counts in zip(self._circuit_names, self._counts)
+                ],
+                "date": date.today().isoformat(),
+                "timestamps": self.metadata.get("timestamps"),
+            }
+        )
+
+    def status(self) -> JobStatus:
+        if self._counts is not None:
+            return JobStatus.DONE
+        return self.backend().job_status(self.job_id())
+
+
+class IQMLocalBackend(IQMBackendBase):
+    """Local stand-in for an IQM backend returning synthetic counts with configurable latencies.
+
+    Circuits are validated and serialized as for a remote IQM server, so client-side overheads are representative.
+
+    Args:
+        architecture (Union[QuantumArchitectureSpecification, DynamicQuantumArchitecture]): the architecture to mimic.
+        latency_profile (Optional[LocalLatencyProfile]): the latencies and limits of the in-process engine.
+            Ignored if `server_url` is given.
+        server_url (Optional[str]): the URL of a `LocalBackendServer` to submit jobs to, instead of an in-process engine.
+        seed (Optional[int]): the seed of the synthetic counts of the in-process engine.
+        name (str): the name of the backend.
+        poll_interval (float): the time between polls of job results when using a `LocalBackendServer`, in seconds.
+
+    The worker threads of the in-process engine are stopped by `close`, or when the backend is garbage collected.
+    """
+
+    def __init__(
+        self,
+        architecture: Union[QuantumArchitectureSpecification, DynamicQuantumArchitecture],
+        latency_profile: Optional[LocalLatencyProfile] = None,
+        server_url: Optional[str] = None,
+        seed: Optional[int] = None,
+        name: str = "IQMLocalBackend",
+        poll_interval: float = 0.01,
+    ):
+        super().__init__(architecture)
+        self.name = name
+        self.server_url = server_url
+        self.poll_interval = poll_interval
+        self.latency_profile = latency_profile if latency_profile is not None else LocalLatencyProfile()
+        self._engine = LocalJobEngine(self.latency_profile, seed) if server_url is None else None
+        # The finalizer only references the engine, so that it does not keep the backend alive
+        self._finalizer = weakref.finalize(self, self._engine.close) if self._engine is not None else None
+
+    @classmethod
+    def _default_options(cls) -> Options:
+        return Options(shots=1024, calibration_set_id=None)
+
+    @property
+    def max_circuits(self) -> Optional[int]:
+        return self.latency_profile.max_circuits if self._engine is not None else None
+
+    def run(self, run_input: Union[QuantumCircuit, List[QuantumCircuit]], **options) -> IQMLocalJob:
+        """Serialize and submit circuits for execution.
+
+        Args:
+            run_input (Union[QuantumCircuit, List[QuantumCircuit]]): the circuits to execute.
+            options: the run options, e.g. "shots". "calibration_set_id" is accepted and ignored.
+        Returns:
+            IQMLocalJob: the submitted job.
+        """
+        return self.submit_run_request(self.create_run_request(run_input, **options))
+
+    def create_run_request(self, run_input: Union[QuantumCircuit, List[QuantumCircuit]], **options) -> RunRequest:
+        """Serialize circuits into a run request without submitting it, as `IQMBackend.create_run_request`.
+
+        Args:
+            run_input (Union[QuantumCircuit, List[QuantumCircuit]]): the circuits to execute.
+            options: the run options, e.g. "shots". "calibration_set_id" is accepted and ignored.
+        Returns:
+            RunRequest: the run request.
+        """
+        circuits = [run_input] if isinstance(run_input, QuantumCircuit) else run_input
+        serialized = [
+            Circuit(
+                name=circuit.name, instructions=tuple(_serialize_instructions(circuit, self._idx_to_qb)), metadata=None
+            )
+            for circuit in circuits
+        ]
+        return RunRequest.model_validate({"circuits": serialized, "shots": options.get("shots", self.options.shots)})
+
+    def submit_run_request(self, run_request: RunRequest) -> IQMLocalJob:
+        """Submit a run request for execution.
+
+        Args:
+            run_request (RunRequest): the run request.
+        Returns:
+            IQMLocalJob: the submitted job.
+        """
+        time.sleep(self.latency_profile.submit_latency)
+        if self._engine is not None:
+            job_id = self._engine.submit(run_request.circuits, run_request.shots)
+        else:
+            payload = json.dumps(
+                {"circuits": [c.model_dump() for c in run_request.circuits], "shots": run_request.shots}
+            ).encode()
+            http_request = urllib_request.Request(
+                f"{self.server_url}/jobs", data=payload, headers={"Content-Type": "application/json"}
+            )
+            try:
+                with urllib_request.urlopen(http_request) as response:
+                    job_id = json.loads(response.read())["job_id"]
+            except HTTPError as exc:
+                raise ValueError(json.loads(exc.read())["error"]) from exc
+
+        return IQMLocalJob(self, job_id, [circuit.name for circuit in run_request.circuits], run_request.shots)
+
+    def close(self):
+        """Stop the worker threads of the in-process engine, once the jobs submitted so far are done.
+
+        Jobs can no longer be submitted to the backend afterwards.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def _poll(self, job_id: str) -> Dict[str, Any]:
+        try:
+            with urllib_request.urlopen(f"{self.server_url}/jobs/{job_id}") as response:
+                return json.loads(response.read())
+        except HTTPError as exc:
+            raise KeyError(json.loads(exc.read())["error"]) from exc
+
+    def job_status(self, job_id: str) -> JobStatus:
+        """Get the status of a job submitted to this backend.
+
+        Args:
+            job_id (str): the job ID.
+        Returns:
+            JobStatus: the status of the job.
+        """
+        if self._engine is not None:
+            return self._engine.status(job_id)
+        return JobStatus[self._poll(job_id)["status"]]
+
+    def wait_for_results(self, job_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for a job submitted to this backend to finish and get its results.
+
+        Args:
+            job_id (str): the job ID.
+            timeout (Optional[float]): the maximum time to wait, in seconds.
+        Returns:
+            Dict[str, Any]: the "counts" of every circuit and the "timestamps" of the job.
+        Raises:
+            RuntimeError: if the job failed.
+        """
+        if self._engine is not None:
+            return self._engine.wait_for_results(job_id, timeout)
+        start = time.perf_counter()
+        while True:
+            results = self._poll(job_id)
+            if results["status"] == JobStatus.DONE.name:
+                return {"counts": results["counts"], "timestamps": results["timestamps"]}
+            if results["status"] == JobStatus.ERROR.name:
+                raise RuntimeError(results["error"])
+            if timeout is not None and time.perf_counter() - start > timeout:
+                raise TimeoutError(f"Job {job_id} did not finish in {timeout} seconds.")
+            time.sleep(self.poll_interval)
@@ -16,25 +16,340 @@
 Q-score benchmark
 """
 
+# pylint: disable=too-many-lines
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
 import itertools
 import logging
+import threading
+import time
 from time import strftime
-from typing import Callable, Dict, List, Literal, Optional, Tuple, Type
+from typing import Callable, Dict, List, Literal, Optional, Sequence, Tuple, Type
 
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 from networkx import Graph
 import networkx as nx
 import numpy as np
-from scipy.optimize import basinhopping, minimize
+from qiskit.circuit import ParameterExpression, ParameterVector
+from scipy.optimize import OptimizeResult, minimize
 
 from iqm.benchmarks.benchmark import BenchmarkBase, BenchmarkConfigurationBase
 from iqm.benchmarks.logging_config import qcvv_logger
+from iqm.benchmarks.quantum_volume.parameter_binding import NativeTemplates, lower_native_templates
 from iqm.benchmarks.utils import perform_backend_transpilation, retrieve_all_counts, submit_execute, timeit
 from iqm.qiskit_iqm import IQMCircuit as QuantumCircuit
 from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
 
 
+class MaxCutEvaluator:
+    """Vectorized evaluation of the cut sizes of the bitstrings sampled from a QAOA MaxCut ansatz.
+
+    The qubit-to-node permutation, the values of the virtual nodes and the edges are precomputed as index arrays into
+    the measured bits, extended with a constant 0 and a constant 1 column standing for the virtual nodes. The cut
+    sizes of all measured bitstrings are then obtained at once by XORing the columns of the ends of every edge.
+
+    Args:
+        graph (Graph): the MaxCut problem graph.
+        qubit_to_node (Dict[int, int]): the node of the graph measured by each qubit.
+        virtual_nodes (List[Tuple[int, int]]): the nodes of the graph that are not measured, with their fixed values.
+    """
+
+    def __init__(self, graph: Graph, qubit_to_node: Dict[int, int], virtual_nodes: List[Tuple[int, int]]):
+        self.num_qubits = len(qubit_to_node)
+        node_columns = {node: qubit for qubit, node in qubit_to_node.items()}
+        for node, value in virtual_nodes:
+            if node is not None:
+                node_columns[node] = self.num_qubits + value
+        edges = [[node_columns[i], node_columns[j]] for i, j in graph.edges()]
+        self.edge_columns = np.array(edges, dtype=int).reshape((-1, 2))
+
+    def outcome_bits(self, bitstrings: Sequence[str]) -> np.ndarray:
+        """Convert measured bitstrings to an integer array of bits, extended with the virtual node columns.
+
+        Args:
+            bitstrings (Sequence[str]): the measured bitstrings, in qiskit endianness.
+        Returns:
+            np.ndarray: array of shape (len(bitstrings), num_qubits + 2), with the bit of each qubit followed by a
+            constant 0 and a constant 1 column.
+        """
+        bits = np.zeros((len(bitstrings), self.num_qubits + 2), dtype=np.uint8)
+        if self.num_qubits > 0:
+            characters = np.frombuffer("".join(bitstrings).encode(), dtype=np.uint8)
+            # Go from qiskit endianness to qubit order
+            bits[:, self.num_qubits - 1 :: -1] = characters.reshape((len(bitstrings), self.num_qubits)) - ord("0")
+        bits[:, -1] = 1
+        return bits
+
+    def cut_sizes(self, bitstrings: Sequence[str]) -> np.ndarray:
+        """Compute the number of cut edges of measured bitstrings.
+
+        Args:
+            bitstrings (Sequence[str]): the measured bitstrings, in qiskit endianness.
+        Returns:
+            np.ndarray: the number of cut edges of each bitstring.
+        """
+        bits = self.outcome_bits(bitstrings)
+        return np.sum(bits[:, self.edge_columns[:, 0]] ^ bits[:, self.edge_columns[:, 1]], axis=1, dtype=int)
+
+    def expectation_value(self, counts: Dict[str, int]) -> float:
+        """Compute the expectation value of the cost function (the number of cut edges with minus sign) from counts.
+
+        Args:
+            counts (Dict[str, int]): key as bitstring, val as count.
+        Returns:
+            float: expectation value of the cut edges for number of counts, with minus sign.
+        """
+        weights = np.fromiter(counts.values(), dtype=float, count=len(counts))
+        return -float(np.dot(self.cut_sizes(list(counts.keys())), weights) / np.sum(weights))
+
+
+def minimize_spsa(  # pylint: disable=too-many-arguments,too-many-locals
+    batch_objective_function: Callable[[np.ndarray], np.ndarray],
+    x0: Sequence[float],
+    bounds: Sequence[Tuple[float, float]],
+    maxiter: int = 30,
+    num_perturbations: int = 4,
+    rng: Optional[np.random.Generator] = None,
+    perturbation: float = 0.1,
+    first_step: float = 0.1,
+) -> OptimizeResult:
+    """Minimize a noisy objective function with simultaneous perturbation stochastic approximation (SPSA).
+
+    At every iteration, the gradient is estimated from several pairs of opposite random perturbations of the current
+    point, which are all evaluated by a single call of the batch objective function (a single submission to the
+    backend). The step size is calibrated so that the first step has length `first_step`.
+
+    Args:
+        batch_objective_function (Callable[[np.ndarray], np.ndarray]): function giving the values of the objective
+            function for an array of points of shape (num_points, num_parameters).
+        x0 (Sequence[float]): the initial point.
+        bounds (Sequence[Tuple[float, float]]): the lower and upper bounds of each parameter.
+        maxiter (int): the number of iterations.
+        num_perturbations (int): the number of pairs of perturbations averaged in each gradient estimate.
+        rng (Optional[np.random.Generator]): the random number generator of the perturbations.
+        perturbation (float): the initial magnitude of the perturbations.
+        first_step (float): the length of the first step.
+    Returns:
+        OptimizeResult: the optimization result, with the final point and the value of the objective function there.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    x = np.asarray(x0, dtype=float)
+    lower, upper = np.array(bounds, dtype=float).T
+    alpha, gamma = 0.602, 0.101
+    stability = 0.1 * maxiter
+    learning_rate = None
+
+    for k in range(maxiter):
+        c_k = perturbation / (k + 1) ** gamma
+        deltas = rng.choice([-1.0, 1.0], size=(num_perturbations, len(x)))
+        values = batch_objective_function(np.concatenate([x + c_k * deltas, x - c_k * deltas]))
+        differences = values[:num_perturbations] - values[num_perturbations:]
+        gradient = np.mean(differences[:, None] / (2 * c_k) * deltas, axis=0)
+        if learning_rate is None:
+            learning_rate = first_step * (stability + 1) ** alpha / max(float(np.linalg.norm(gradient)), 1e-12)
+        x = np.clip(x - learning_rate / (k + 1 + stability) ** alpha * gradient, lower, upper)
+
+    fun = float(batch_objective_function(x[None, :])[0])
+    return OptimizeResult(x=x, fun=fun, nit=maxiter, nfev=2 * num_perturbations * maxiter + 1, success=True)
+
+
+@dataclass
+class CoalescedRequest:
+    """Circuits of a client of a `CoalescingSubmitter`, with their counts once executed.
+
+    Attributes:
+        qubits (Tuple): the qubits the circuits are transpiled to.
+        circuits (List[QuantumCircuit]): the circuits to execute.
+        positions (slice): the positions of the circuits in the combined submission of their qubits.
+        counts (List[Dict[str, int]]): the counts of the circuits.
+        error (Optional[Exception]): the error raised by the combined submission, if any.
+        done (bool): whether the combined submission has completed.
+    """
+
+    qubits: Tuple
+    circuits: List[QuantumCircuit]
+    positions: slice = field(default_factory=lambda: slice(0))
+    counts: List[Dict[str, int]] = field(default_factory=list)
+    error: Optional[Exception] = None
+    done: bool = False
+
+
+class CoalescingSubmitter:
+    """Submitter shared by concurrent optimizations, coalescing their outstanding circuits into combined submissions.
+
+    Each optimization (client) blocks in `run` until all active clients have outstanding circuits, or until the
+    timeout expires, at which point all outstanding circuits are executed together, grouped by qubit set, and the
+    counts are returned to their clients. Clients must call `leave` when they finish, so that the remaining clients
+    are not kept waiting for them.
+
+    Args:
+        execute (Callable[[Dict[Tuple, List[QuantumCircuit]]], Dict[Tuple, List[Dict[str, int]]]]): function
+            executing circuits grouped by qubit set, and returning their counts grouped in the same way.
+        num_clients (int): the number of concurrent optimizations.
+        timeout (float): the maximum time (in seconds) to wait for the other clients before submitting.
+    """
+
+    def __init__(
+        self,
+        execute: Callable[[Dict[Tuple, List[QuantumCircuit]]], Dict[Tuple, List[Dict[str, int]]]],
+        num_clients: int,
+        timeout: float = 1.0,
+    ):
+        self.execute = execute
+        self.timeout = timeout
+        self.num_submissions = 0
+        self._num_clients = num_clients
+        self._pending: List[CoalescedRequest] = []
+        self._condition = threading.Condition()
+
+    def run(self, qubit_set: Sequence[int], circuits: List[QuantumCircuit]) -> List[Dict[str, int]]:
+        """Execute circuits together with the outstanding circuits of the other clients.
+
+        Args:
+            qubit_set (Sequence[int]): the qubits the circuits are transpiled to.
+            circuits (List[QuantumCircuit]): the circuits to execute.
+        Returns:
+            List[Dict[str, int]]: the counts of the circuits.
+        """
+        request = CoalescedRequest(tuple(qubit_set), circuits)
+        with self._condition:
+            self._pending.append(request)
+            self._condition.notify_all()
+            deadline = time.monotonic() + self.timeout
+            while not request.done:
+                if len(self._pending) >= self._num_clients or time.monotonic() >= deadline:
+                    self._flush()
+                else:
+                    self._condition.wait(deadline - time.monotonic())
+        if request.error is not None:
+            raise request.error
+        return request.counts
+
+    def run_client(self, function: Callable[[], float]) -> float:
+        """Run the function of a client, and remove the client when it finishes.
+
+        Args:
+            function (Callable[[], float]): the function of the client, submitting its circuits with `run`.
+        Returns:
+            float: the return value of the function.
+        """
+        try:
+            return function()
+        finally:
+            self.leave()
+
+    def leave(self):
+        """Remove a finished client, so that the others no longer wait for it."""
+        with self._condition:
+            self._num_clients -= 1
+            self._condition.notify_all()
+
+    def _flush(self):
+        requests, self._pending = self._pending, []
+        sorted_transpiled_qc_list: Dict[Tuple, List[QuantumCircuit]] = {}
+        for request in requests:
+            qc_list = sorted_transpiled_qc_list.setdefault(request.qubits, [])
+            request.positions = slice(len(qc_list), len(qc_list) + len(request.circuits))
+            qc_list.extend(request.circuits)
+        try:
+            all_counts = self.execute(sorted_transpiled_qc_list)
+            self.num_submissions += 1
+            for request in requests:
+                request.counts = all_counts[request.qubits][request.positions]
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # The error is raised in the threads of all the clients of the submission
+            for request in requests:
+                request.error = exc
+        for request in requests:
+            request.done = True
+        self._condition.notify_all()
+
+
+def maxcut_p1_edge_statistics(graph: Graph) -> Tuple[Tuple[int, int, int], ...]:
+    """Computes the degrees of the ends and the number of triangles of every edge of a graph.
+
+    The expectation values of single layer QAOA MaxCut only depend on these statistics, so their sorted tuple is a
+    canonical key of the graph for the optimal angles: it does not depend on the labeling of the nodes.
+
+    Args:
+        graph (networkx graph): the MaxCut problem graph.
+
+    Returns:
+        Tuple[Tuple[int, int, int], ...]: the sorted smaller and larger degrees of the ends and the number of common
+        neighbours of the ends of every edge.
+    """
+    nodes = list(graph.nodes)
+    index = {node: k for k, node in enumerate(nodes)}
+    adjacency = nx.to_numpy_array(graph, nodelist=nodes, dtype=int)
+    degrees = adjacency.sum(axis=1)
+    edges = np.array([[index[i], index[j]] for i, j in graph.edges], dtype=int).reshape((-1, 2))
+    first, second = degrees[edges[:, 0]], degrees[edges[:, 1]]
+    # The number of triangles containing the edge ij is the number of paths of length 2 between i and j
+    triangles = np.einsum("ek,ek->e", adjacency[edges[:, 0]], adjacency[edges[:, 1]])
+    statistics = np.stack([np.minimum(first, second), np.maximum(first, second), triangles], axis=1)
+    return tuple(sorted(map(tuple, statistics.tolist())))
+
+
+def expected_zz_edge_density_p1(
+    edge_statistics: np.ndarray, gamma: float | np.ndarray, beta: float | np.ndarray
+) -> np.ndarray:
+    """Computes the average of <p1_QAOA | Z_i Z_j | p1_QAOA> over the edges ij of a graph, vectorized over the angles.
+
+    Args:
+        edge_statistics (np.ndarray): array of shape (num_edges, 3) with the degrees of the ends and the number of
+            triangles of every edge, as given by `maxcut_p1_edge_statistics`.
+        gamma (float | np.ndarray): the angles gamma.
+        beta (float | np.ndarray): the angles beta, broadcastable against gamma.
+
+    Returns:
+        np.ndarray: the average expectation value for each pair of angles.
+    """
+    gamma, beta = np.broadcast_arrays(
+        np.asarray(gamma, dtype=float)[..., None], np.asarray(beta, dtype=float)[..., None]
+    )
+    di, dj, triangles = edge_statistics.T
+    cos_2gamma = np.cos(2 * gamma)
+
+    first = cos_2gamma ** (di - 1) + cos_2gamma ** (dj - 1)
+    first *= 0.5 * np.sin(4 * beta) * np.sin(2 * gamma)
+    # Neighbours of exactly one end contribute cos(2 gamma), common neighbours cos(4 gamma) or nothing
+    second = cos_2gamma ** (di + dj - 2 - 2 * triangles) * (np.cos(4 * gamma) ** triangles - 1)
+    second *= 0.5 * np.sin(2 * beta) ** 2
+    return np.mean(first - second, axis=-1)
+
+
+@lru_cache(maxsize=None)
+def optimal_angles_for_QAOA_p1(edge_statistics: Tuple[Tuple[int, int, int], ...]) -> Tuple[float, float]:
+    """Calculates the optimal angles for single layer QAOA MaxCut ansatz of graphs with given edge statistics.
+
+    The expectation value is evaluated on a grid of angles at once, and the best grid point is refined with L-BFGS-B.
+
+    Args:
+        edge_statistics (Tuple[Tuple[int, int, int], ...]): the statistics of the edges of the graph, as given by
+            `maxcut_p1_edge_statistics`.
+
+    Returns:
+        Tuple[float, float]: optimal angles gamma and beta.
+    """
+    statistics = np.array(edge_statistics, dtype=int).reshape((-1, 3))
+    bounds = [(0.0, np.pi / 2), (-np.pi / 4, 0.0)]
+    gamma_grid, beta_grid = np.meshgrid(np.linspace(*bounds[0], 101), np.linspace(*bounds[1], 51), indexing="ij")
+    values = expected_zz_edge_density_p1(statistics, gamma_grid, beta_grid)
+    best = np.unravel_index(np.argmin(values), values.shape)
+
+    res = minimize(
+        lambda x: float(expected_zz_edge_density_p1(statistics, x[0], x[1])),
+        [gamma_grid[best], beta_grid[best]],
+        method="L-BFGS-B",
+        bounds=bounds,
+    )
+    return float(res.x[0]), float(res.x[1])
+
+
 class QScoreBenchmark(BenchmarkBase):
     """
     Q-score estimates the size of combinatorial optimization problems a given number of qubits can execute with meaningful results.
@@ -58,6 +373,12 @@ class QScoreBenchmark(BenchmarkBase):
         self.choose_qubits_routine = configuration.choose_qubits_routine
         self.qiskit_optim_level = configuration.qiskit_optim_level
         self.optimize_sqg = configuration.optimize_sqg
+        self.optimizer = configuration.optimizer
+        self.spsa_maxiter = configuration.spsa_maxiter
+        self.spsa_num_perturbations = configuration.spsa_num_perturbations
+        self.concurrent_instances = configuration.concurrent_instances
+        self.search_mode = configuration.search_mode
+        self.num_confirmation_instances = configuration.num_confirmation_instances
         self.timestamp = strftime("%Y%m%d-%H%M%S")
         self.seed = configuration.seed
 
@@ -82,13 +403,14 @@ class QScoreBenchmark(BenchmarkBase):
     def generate_maxcut_ansatz(  # pylint: disable=too-many-branches
         self,
         graph: Graph,
-        theta: list[float],
+        theta: Sequence[float | ParameterExpression],
     ) -> QuantumCircuit:
         """Generate an ansatz circuit for QAOA MaxCut, with measurements at the end.
 
         Args:
             graph (networkx graph): the MaxCut problem graph
-            theta (list[float]): the variational parameters for QAOA, first gammas then betas
+            theta (Sequence[float | ParameterExpression]): the variational parameters for QAOA, first gammas then
+                betas, either numeric or symbolic
 
         Returns:
             QuantumCircuit: the QAOA ansatz quantum circuit.
@@ -169,28 +491,106 @@ class QScoreBenchmark(BenchmarkBase):
             avg (float): expectation value of the cut edges for number of counts
         """
 
-        avg = 0
-        sum_count = 0
-        for bitstring_aux, count in counts.items():
-            bitstring_aux_list = list(bitstring_aux)[::-1]  # go from qiskit endianness to networkx endianness
+        return MaxCutEvaluator(graph, self.qubit_to_node, self.virtual_nodes).expectation_value(counts)
 
-            # map the qubits back to nodes
-            bitstring = [""] * (len(bitstring_aux_list) + len(self.virtual_nodes))
-            for qubit, node in self.qubit_to_node.items():
-                bitstring[node] = bitstring_aux_list[qubit]
+    def execute_circuits(
+        self, sorted_transpiled_qc_list: Dict[Tuple, List[QuantumCircuit]]
+    ) -> Dict[Tuple, List[Dict[str, int]]]:
+        """Submits the circuits of all qubit sets before retrieving any of their counts.
 
-            # insert virtual node(s) to bitstring
-            for virtual_node in self.virtual_nodes:
-                if virtual_node[0] is not None:
-                    bitstring[virtual_node[0]] = str(virtual_node[1])
+        Args:
+            sorted_transpiled_qc_list (Dict[Tuple, List[QuantumCircuit]]): the circuits to execute, for each qubit set.
+        Returns:
+            Dict[Tuple, List[Dict[str, int]]]: the counts of the circuits, for each qubit set.
+        """
+        qcvv_logger.setLevel(logging.WARNING)
+        all_jobs = {}
+        for qubits, qc_list in sorted_transpiled_qc_list.items():
+            all_jobs[qubits], _ = submit_execute(
+                {qubits: qc_list},
+                self.backend,
+                self.shots,
+                self.calset_id,
+                max_gates_per_batch=self.max_gates_per_batch,
+            )
+        all_counts = {qubits: retrieve_all_counts(jobs)[0] for qubits, jobs in all_jobs.items()}
+        qcvv_logger.setLevel(logging.INFO)
+        return all_counts
 
-            obj = self.cost_function("".join(bitstring), graph)
-            avg += obj * count
-            sum_count += count
+    def create_batch_objective_function(
+        self, graph: Graph, qubit_set: List[int], submitter: Optional[CoalescingSubmitter] = None
+    ) -> Callable:
+        """
+        Creates a function that maps a batch of parameter points to the parametrized circuit,
+        runs all of them in a single submission and computes their expectation values.
+
+        Args:
+            graph (networkx graph): the MaxCut problem graph.
+            qubit_set (List[int]): indices of the used qubits.
+            submitter (Optional[CoalescingSubmitter]): the submitter coalescing the circuits with those of concurrent
+                optimizations, if any.
+        Returns:
+            callable: function that gives the expectation values of the cut edges from counts sampled from the ansatz,
+            for each of a sequence of parameter points
+        """
 
-        return avg / sum_count
+        # The ansatz is transpiled once with symbolic angles, and only bound at each evaluation
+        theta_parameters = ParameterVector("theta", 2 * self.num_qaoa_layers)
+        qc = self.generate_maxcut_ansatz(graph, theta_parameters)
+        evaluator = MaxCutEvaluator(graph, self.qubit_to_node, self.virtual_nodes)
+        trivial = len(qc.count_ops()) == 0  # to handle the case of physical graph with no edges
+        native_templates: Optional[NativeTemplates] = None
+
+        if not trivial:
+            coupling_map = self.backend.coupling_map.reduce(qubit_set)
+            qcvv_logger.setLevel(logging.WARNING)
+            transpiled_qc_list, _ = perform_backend_transpilation(
+                [qc],
+                backend=self.backend,
+                qubits=qubit_set,
+                coupling_map=coupling_map,
+                qiskit_optim_level=self.qiskit_optim_level,
+                optimize_sqg=self.optimize_sqg,
+                routing_method=self.routing_method,
+            )
+            qcvv_logger.setLevel(logging.INFO)
+            transpiled_template = transpiled_qc_list[0]
+            # Indices into theta of the parameters left in the transpiled template, in their binding order
+            parameter_indices = [parameter.index for parameter in transpiled_template.parameters]
+            try:
+                native_templates = lower_native_templates([transpiled_template])
+            except ValueError:
+                # Templates with other than "r" and "cz" gates (e.g., MOVE gates) are bound by qiskit
+                pass
+
+        def batch_objective_function(thetas: Sequence[Sequence[float]]) -> np.ndarray:
+            if trivial:
+                all_counts = [{"": 1}] * len(thetas)
 
-    def create_objective_function(self, graph: Graph, qubit_set: List[int]) -> Callable:
+            else:
+                bound_qc_list = []
+                for theta in thetas:
+                    values = [float(theta[index]) for index in parameter_indices]
+                    if native_templates is not None:
+                        bound_qc_list.append(native_templates.bind([values])[0])
+                    else:
+                        bound_qc_list.append(
+                            transpiled_template.assign_parameters(dict(zip(transpiled_template.parameters, values)))
+                        )
+
+                # Execute all parameter points on the backend at once
+                if submitter is not None:
+                    all_counts = submitter.run(qubit_set, bound_qc_list)
+                else:
+                    all_counts = self.execute_circuits({tuple(qubit_set): bound_qc_list})[tuple(qubit_set)]
+
+            return np.array([evaluator.expectation_value(counts) for counts in all_counts])
+
+        return batch_objective_function
+
+    def create_objective_function(
+        self, graph: Graph, qubit_set: List[int], submitter: Optional[CoalescingSubmitter] = None
+    ) -> Callable:
         """
         Creates a function that maps the parameters to the parametrized circuit,
         runs it and computes the expectation value.
@@ -198,43 +598,15 @@ class QScoreBenchmark(BenchmarkBase):
         Args:
             graph (networkx graph): the MaxCut problem graph.
             qubit_set (List[int]): indices of the used qubits.
+            submitter (Optional[CoalescingSubmitter]): the submitter coalescing the circuits with those of concurrent
+                optimizations, if any.
         Returns:
             callable: function that gives expectation value of the cut edges from counts sampled from the ansatz
         """
+        batch_objective_function = self.create_batch_objective_function(graph, qubit_set, submitter)
 
         def objective_function(theta):
-            qc = self.generate_maxcut_ansatz(graph, theta)
-
-            if len(qc.count_ops()) == 0:
-                counts = {"": 1.0}  # to handle the case of physical graph with no edges
-
-            else:
-                coupling_map = self.backend.coupling_map.reduce(qubit_set)
-                qcvv_logger.setLevel(logging.WARNING)
-                transpiled_qc_list, _ = perform_backend_transpilation(
-                    [qc],
-                    backend=self.backend,
-                    qubits=qubit_set,
-                    coupling_map=coupling_map,
-                    qiskit_optim_level=self.qiskit_optim_level,
-                    optimize_sqg=self.optimize_sqg,
-                    routing_method=self.routing_method,
-                )
-
-                sorted_transpiled_qc_list = {tuple(qubit_set): transpiled_qc_list}
-                # Execute on the backend
-                jobs, _ = submit_execute(
-                    sorted_transpiled_qc_list,
-                    self.backend,
-                    self.shots,
-                    self.calset_id,
-                    max_gates_per_batch=self.max_gates_per_batch,
-                )
-
-                counts = retrieve_all_counts(jobs)[0][0]
-                qcvv_logger.setLevel(logging.INFO)
-
-            return self.compute_expectation_value(counts, graph)
+            return float(batch_objective_function([theta])[0])
 
         return objective_function
 
@@ -250,47 +622,9 @@ class QScoreBenchmark(BenchmarkBase):
             List[float]: optimal angles gamma and beta.
 
         """
+        return list(optimal_angles_for_QAOA_p1(maxcut_p1_edge_statistics(graph)))
 
-        def get_Zij_maxcut_p1(edge_ij, gamma, beta):
-            """
-            Calculates <p1_QAOA | Z_i Z_j | p1_QAOA>, assuming ij is edge of G.
-            """
-            i, j = edge_ij
-            di = graph.degree[i]
-            dj = graph.degree[j]
-
-            first = np.cos(2 * gamma) ** (di - 1) + np.cos(2 * gamma) ** (dj - 1)
-            first *= 0.5 * np.sin(4 * beta) * np.sin(2 * gamma)
-
-            node_list = list(graph.nodes).copy()
-            node_list.remove(i)
-            node_list.remove(j)
-            f1 = 1
-            f2 = 1
-            for k in node_list:
-                if graph.has_edge(i, k) and graph.has_edge(j, k):  # ijk is triangle
-                    f1 *= np.cos(4 * gamma)
-                elif graph.has_edge(i, k) or graph.has_edge(j, k):  # ijk is no triangle
-                    f1 *= np.cos(2 * gamma)
-                    f2 *= np.cos(2 * gamma)
-            second = 0.5 * np.sin(2 * beta) ** 2 * (f1 - f2)
-            return first - second
-
-        def get_expected_zz_edgedensity(x):
-            gamma = x[0]
-            beta = x[1]
-            # pylint: disable=consider-using-generator
-            return sum([get_Zij_maxcut_p1(edge, gamma, beta) for edge in graph.edges]) / graph.number_of_edges()
-
-        bounds = [(0.0, np.pi / 2), (-np.pi / 4, 0.0)]
-        x_init = [0.15, -0.28]
-
-        minimizer_kwargs = {"method": "L-BFGS-B", "bounds": bounds}
-        res = basinhopping(get_expected_zz_edgedensity, x_init, minimizer_kwargs=minimizer_kwargs, niter=10, T=2)
-
-        return res.x
-
-    def run_QAOA(self, graph: Graph, qubit_set: List[int]) -> float:
+    def run_QAOA(self, graph: Graph, qubit_set: List[int], seed: Optional[int] = None) -> float:
         """
         Solves the cut size of MaxCut for a graph using QAOA.
         The result is average value sampled from the optimized ansatz.
@@ -298,20 +632,47 @@ class QScoreBenchmark(BenchmarkBase):
         Args:
             graph (networkx graph): the MaxCut problem graph.
             qubit_set (List[int]): indices of the used qubits.
+            seed (Optional[int]): the seed of the random perturbations of the SPSA optimizer.
 
         Returns:
             float: the expectation value of the maximum cut size.
 
         """
+        return self.prepare_QAOA(graph, qubit_set, seed=seed)()
 
-        objective_function = self.create_objective_function(graph, qubit_set)
+    def prepare_QAOA(
+        self,
+        graph: Graph,
+        qubit_set: List[int],
+        seed: Optional[int] = None,
+        submitter: Optional[CoalescingSubmitter] = None,
+    ) -> Callable[[], float]:
+        """
+        Prepares the QAOA solution of the cut size of MaxCut for a graph.
+        Everything depending on the current graph of the benchmark (such as the transpiled ansatz) is computed
+        immediately, so that the returned optimizations of several graphs can run concurrently.
+
+        Args:
+            graph (networkx graph): the MaxCut problem graph.
+            qubit_set (List[int]): indices of the used qubits.
+            seed (Optional[int]): the seed of the random perturbations of the SPSA optimizer.
+            submitter (Optional[CoalescingSubmitter]): the submitter shared with the concurrent optimizations, if any.
+
+        Returns:
+            Callable[[], float]: function running the optimization and returning the expectation value of the maximum
+            cut size.
+
+        """
 
         if self.use_classically_optimized_angles:
+            objective_function = self.create_objective_function(graph, qubit_set, submitter)
             if self.graph_physical.number_of_edges() != 0:
                 opt_angles = self.calculate_optimal_angles_for_QAOA_p1(self.graph_physical)
             else:
                 opt_angles = [1.0, 1.0]
-            res = minimize(objective_function, opt_angles, method="COBYLA", tol=1e-5, options={"maxiter": 0})
+            optimize = partial(
+                minimize, objective_function, opt_angles, method="COBYLA", tol=1e-5, options={"maxiter": 0}
+            )
         else:
             # Good initial angles from from Wurtz et.al. "The fixed angle conjecture for QAOA on regular MaxCut graphs." arXiv preprint arXiv:2107.00677 (2021).
             OPTIMAL_INITIAL_ANGLES = {
@@ -439,16 +800,29 @@ class QScoreBenchmark(BenchmarkBase):
             theta = OPTIMAL_INITIAL_ANGLES[str(self.num_qaoa_layers)]
             bounds = [(-np.pi, np.pi)] * self.num_qaoa_layers + [(0.0, np.pi)] * self.num_qaoa_layers
 
-            res = minimize(
-                objective_function,
-                theta,
-                bounds=bounds,
-                method="COBYLA",
-                tol=1e-5,
-                options={"maxiter": 300},
-            )
+            if self.optimizer == "SPSA":
+                # All perturbed points of an iteration are evaluated in a single submission
+                optimize = partial(
+                    minimize_spsa,
+                    self.create_batch_objective_function(graph, qubit_set, submitter),
+                    theta,
+                    bounds,
+                    maxiter=self.spsa_maxiter,
+                    num_perturbations=self.spsa_num_perturbations,
+                    rng=np.random.default_rng(seed),
+                )
+            else:
+                optimize = partial(
+                    minimize,
+                    self.create_objective_function(graph, qubit_set, submitter),
+                    theta,
+                    bounds=bounds,
+                    method="COBYLA",
+                    tol=1e-5,
+                    options={"maxiter": 300},
+                )
 
-        return -res.fun
+        return lambda: -optimize().fun
 
     @staticmethod
     def is_successful(
@@ -577,14 +951,22 @@ class QScoreBenchmark(BenchmarkBase):
 
         return fig_name, fig
 
-    def execute_single_benchmark(
+    def execute_single_benchmark(  # pylint: disable=too-many-branches
         self,
         num_nodes: int,
+        num_instances: Optional[int] = None,
+        seed: Optional[int] = None,
+        previous_cut_sizes: Optional[list[float]] = None,
     ) -> tuple[bool, float, list[float], list[int]]:
         """Execute a single benchmark, for a given number of qubits.
 
         Args:
             num_nodes (int): number of nodes in the MaxCut problem graphs.
+            num_instances (Optional[int]): number of problem graph instances, defaults to `num_instances` of the
+                configuration.
+            seed (Optional[int]): seed of the first problem graph instance, defaults to `seed` of the configuration.
+            previous_cut_sizes (Optional[list[float]]): cut sizes of instances already executed for the same number of
+                nodes, included in the approximation ratio.
 
         Returns:
             bool: whether the benchmark was successful.
@@ -593,10 +975,14 @@ class QScoreBenchmark(BenchmarkBase):
             list[int]: the set of qubits the Q-score benchmark was executed on.
         """
 
-        cut_sizes: list[float] = []
-        seed = self.seed
+        num_instances = self.num_instances if num_instances is None else num_instances
+        cut_sizes: list[float] = [] if previous_cut_sizes is None else list(previous_cut_sizes)
+        seed = self.seed if seed is None else seed
+        # The optimizations of all instances share a submitter coalescing their circuits, if run concurrently
+        solvers: Dict[int, Callable[[], float]] = {}
+        submitter = CoalescingSubmitter(self.execute_circuits, num_instances) if self.concurrent_instances else None
 
-        for i in range(self.num_instances):
+        for i in range(num_instances):
             graph = nx.generators.erdos_renyi_graph(num_nodes, 0.5, seed=seed)
             qcvv_logger.debug(f"graph: {graph}")
             self.graph_physical = graph.copy()
@@ -621,8 +1007,10 @@ class QScoreBenchmark(BenchmarkBase):
             # Graph with no edges has cut size = 0
             if graph.number_of_edges() == 0:
                 cut_sizes.append(0)
+                if submitter is not None:
+                    submitter.leave()
                 seed += 1
-                qcvv_logger.debug(f"Graph {i+1}/{self.num_instances} had no edges: cut size = 0.")
+                qcvv_logger.debug(f"Graph {i+1}/{num_instances} had no edges: cut size = 0.")
                 continue
 
             # Choose the qubit layout
@@ -635,9 +1023,23 @@ class QScoreBenchmark(BenchmarkBase):
                 raise ValueError('choose_qubits_routine must either be "naive" or "custom".')
 
             # Solve the maximum cut size with QAOA
-            cut_sizes.append(self.run_QAOA(graph, qubit_set))
+            solve = self.prepare_QAOA(graph, qubit_set, seed=seed, submitter=submitter)
             seed += 1
-            qcvv_logger.debug(f"Solved the MaxCut on graph {i+1}/{self.num_instances}.")
+            if submitter is not None:
+                solvers[len(cut_sizes)] = solve
+                cut_sizes.append(np.nan)
+                continue
+            cut_sizes.append(solve())
+            qcvv_logger.debug(f"Solved the MaxCut on graph {i+1}/{num_instances}.")
+
+        if submitter is not None and solvers:
+            with ThreadPoolExecutor(max_workers=len(solvers)) as executor:
+                futures = {index: executor.submit(submitter.run_client, solve) for index, solve in solvers.items()}
+            for index, future in futures.items():
+                cut_sizes[index] = future.result()
+            qcvv_logger.debug(
+                f"Solved the MaxCut on {len(solvers)} graphs concurrently in {submitter.num_submissions} submissions."
+            )
 
         average_cut_size = np.mean(cut_sizes) - num_nodes * (num_nodes - 1) / 8
         average_best_cut_size = 0.178 * pow(num_nodes, 3 / 2)
@@ -660,21 +1062,18 @@ class QScoreBenchmark(BenchmarkBase):
     @timeit
     def execute_full_benchmark(self) -> tuple[int, list[float], list[list[float]]]:
         """Execute the full benchmark, starting with self.min_num_nodes nodes up to failure.
+        If `search_mode` is "bisection", only the numbers of nodes needed to locate the Q-score are executed.
 
         Returns:
             int: the Q-score of the device.
             list[float]: the list of approximation rations over problem graph instances for each problem size.
             list[list[float]]: the list of lists of maximum average cut sizes of problem graph instances for each problem size.
         """
-        qscore = 0
+        if self.search_mode == "bisection":
+            return self.execute_bisection_search()
 
-        if self.max_num_nodes is None:
-            if self.use_virtual_node:
-                max_num_nodes = self.backend.num_qubits + 1
-            else:
-                max_num_nodes = self.backend.num_qubits
-        else:
-            max_num_nodes = self.max_num_nodes
+        qscore = 0
+        max_num_nodes = self.get_max_num_nodes()
 
         approximation_ratios = []
         list_of_cut_sizes = []
@@ -703,6 +1102,87 @@ class QScoreBenchmark(BenchmarkBase):
         self.figures[fig_name] = fig
         return num_nodes, approximation_ratios, list_of_cut_sizes
 
+    def get_max_num_nodes(self) -> int:
+        """Return the largest number of nodes to execute, by default the number of qubits (plus a virtual node).
+
+        Returns:
+            int: the largest number of nodes.
+        """
+        if self.max_num_nodes is not None:
+            return self.max_num_nodes
+        if self.use_virtual_node:
+            return self.backend.num_qubits + 1
+        return self.backend.num_qubits
+
+    def execute_bisection_search(self) -> tuple[int, list[float], list[list[float]]]:
+        """Execute the benchmark on a few numbers of nodes, locating the Q-score by bracketing and bisection.
+
+        Assuming that success is monotonic in the number of nodes, the numbers of nodes min_num_nodes,
+        min_num_nodes + 1, min_num_nodes + 3, min_num_nodes + 7, ... are executed until the first failure, and the
+        boundary between success and failure is then bisected. If `num_confirmation_instances` is positive, the two
+        numbers of nodes around the boundary are executed with as many additional instances, and the search resumes
+        if the boundary moves.
+
+        Returns:
+            int: the Q-score of the device.
+            list[float]: the list of approximation ratios over problem graph instances for each executed problem size.
+            list[list[float]]: the list of lists of maximum average cut sizes of problem graph instances for each
+            executed problem size.
+        """
+        max_num_nodes = self.get_max_num_nodes()
+        executed: Dict[int, tuple[bool, float, list[float]]] = {}
+        confirmed: set[int] = set()
+
+        def execute(num_nodes: int, confirm: bool = False):
+            if confirm:
+                qcvv_logger.debug(
+                    f"Confirming on {self.num_confirmation_instances} more random graphs with {num_nodes} nodes."
+                )
+                executed[num_nodes] = self.execute_single_benchmark(
+                    num_nodes,
+                    num_instances=self.num_confirmation_instances,
+                    seed=self.seed + self.num_instances,
+                    previous_cut_sizes=executed[num_nodes][2],
+                )[0:3]
+                confirmed.add(num_nodes)
+            else:
+                qcvv_logger.debug(f"Executing on {self.num_instances} random graphs with {num_nodes} nodes.")
+                executed[num_nodes] = self.execute_single_benchmark(num_nodes)[0:3]
+            passed = "passed" if executed[num_nodes][0] else "failed"
+            qcvv_logger.info(
+                f"Q-Score = {num_nodes} {passed} with approximation ratio (Beta): {executed[num_nodes][1]:.4f}"
+            )
+
+        while True:
+            # The smallest failing and the largest succeeding number of nodes below it
+            failed = [n for n, (is_successful, _, _) in executed.items() if not is_successful]
+            upper = min(failed, default=max_num_nodes + 1)
+            lower = max((n for n in executed if n < upper), default=self.min_num_nodes - 1)
+            if not executed:
+                execute(self.min_num_nodes)
+            elif not failed and lower < max_num_nodes:
+                # Exponential bracketing
+                execute(min(max_num_nodes, 2 * lower - self.min_num_nodes + 1))
+            elif upper - lower > 1:
+                execute((lower + upper) // 2)
+            else:
+                unconfirmed = [n for n in (lower, upper) if n in executed and n not in confirmed]
+                if self.num_confirmation_instances == 0 or not unconfirmed:
+                    break
+                for num_nodes in unconfirmed:
+                    execute(num_nodes, confirm=True)
+
+        qscore = lower if lower >= self.min_num_nodes else 0
+        self.results["qscore"] = qscore
+        qcvv_logger.info(f"Q-Score = {qscore}, located by executing {len(executed)} numbers of nodes.")
+
+        list_of_num_nodes = sorted(executed)
+        approximation_ratios = [executed[n][1] for n in list_of_num_nodes]
+        list_of_cut_sizes = [executed[n][2] for n in list_of_num_nodes]
+        fig_name, fig = self.plot_approximation_ratios(list_of_num_nodes, list_of_cut_sizes)
+        self.figures[fig_name] = fig
+        return qscore, approximation_ratios, list_of_cut_sizes
+
 
 class QScoreConfiguration(BenchmarkConfigurationBase):
     """Q-score configuration."""
@@ -719,4 +1199,10 @@ class QScoreConfiguration(BenchmarkConfigurationBase):
     custom_qubits_array: Optional[list[list[int]]] = None
     qiskit_optim_level: int = 3
     optimize_sqg: bool = True
+    optimizer: Literal["COBYLA", "SPSA"] = "COBYLA"
+    spsa_maxiter: int = 30
+    spsa_num_perturbations: int = 4
+    concurrent_instances: bool = False
+    search_mode: Literal["scan", "bisection"] = "scan"
+    num_confirmation_instances: int = 0  # If search_mode is "bisection"
     seed: int = 1
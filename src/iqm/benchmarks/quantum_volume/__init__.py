@@ -18,4 +18,4 @@ Circuit Layer Operations per Second (CLOPS) reflects the speed at which parametr
  (CLOPS_v corresponding to QV circuits, CLOPS_h to square, parallel-gate layered, circuits)
 """
 
-from . import clops, quantum_volume
+from . import clops, native_circuits, parameter_binding, quantum_volume
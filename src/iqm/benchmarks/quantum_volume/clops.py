@@ -16,10 +16,15 @@
 CLOPS benchmark
 """
 
-from datetime import datetime
+# pylint: disable=too-many-lines
+
+from datetime import datetime, timezone
+from functools import partial
 from math import floor, pi
+from queue import Queue
+from threading import Thread
 from time import perf_counter, strftime
-from typing import Any, Dict, List, Sequence, Tuple, Type
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Type
 
 import matplotlib as mpl
 from matplotlib.figure import Figure
@@ -32,7 +37,9 @@ from iqm.benchmarks import Benchmark
 from iqm.benchmarks.benchmark import BenchmarkConfigurationBase
 from iqm.benchmarks.benchmark_definition import BenchmarkAnalysisResult, BenchmarkRunResult
 from iqm.benchmarks.circuit_containers import BenchmarkCircuit, CircuitGroup, Circuits
+from iqm.benchmarks.local_backend import IQMLocalBackend
 from iqm.benchmarks.logging_config import qcvv_logger
+from iqm.benchmarks.quantum_volume.parameter_binding import NativeTemplates, lower_native_templates
 from iqm.benchmarks.utils import (
     count_2q_layers,
     count_native_gates,
@@ -46,6 +53,8 @@ from iqm.benchmarks.utils import (
 )
 from iqm.qiskit_iqm import IQMCircuit as QuantumCircuit
 from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
+from iqm.qiskit_iqm.iqm_job import IQMJob
+from iqm.qiskit_iqm.iqm_provider import IQMBackend
 from iqm.qiskit_iqm.iqm_transpilation import optimize_single_qubit_gates
 
 
@@ -163,6 +172,177 @@ def plot_times(clops_data: xr.Dataset, observations: Dict[int, Dict[str, Dict[st
     return fig_name, fig
 
 
+def intervals_overlap(intervals_a: List[List[float]], intervals_b: List[List[float]]) -> float:
+    """Compute the total time during which intervals of two (internally non-overlapping) lists overlap.
+
+    Args:
+        intervals_a (List[List[float]]): the first list of [start, end] intervals.
+        intervals_b (List[List[float]]): the second list of [start, end] intervals.
+    Returns:
+        float: the total overlap time.
+    """
+    return sum(
+        max(0.0, min(a_end, b_end) - max(a_start, b_start))
+        for a_start, a_end in intervals_a
+        for b_start, b_end in intervals_b
+    )
+
+
+def merged_intervals_length(intervals: List[List[float]]) -> float:
+    """Compute the total length of the union of a list of [start, end] intervals.
+
+    Args:
+        intervals (List[List[float]]): the list of [start, end] intervals.
+    Returns:
+        float: the total length covered by the intervals.
+    """
+    total = 0.0
+    if not intervals:
+        return total
+    sorted_intervals = sorted(intervals)
+    current_start, current_end = sorted_intervals[0]
+    for start, end in sorted_intervals[1:]:
+        if start > current_end:
+            total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    total += current_end - current_start
+    return total
+
+
+def retrieve_clops_timeline(
+    job_meta: Dict[str, Dict[str, Any]], clops_start_utc: str
+) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Align the client and server timestamps of instrumented CLOPS jobs on a common timeline.
+
+    Client timestamps are measured in seconds since the start of the CLOPS timer, and server timestamps are referred to
+    the wall-clock time at which the timer started. Any offset between the client and server clocks is not corrected.
+
+    Args:
+        job_meta (Dict[str, Dict[str, Any]]): the CLOPS jobs metadata, including "client_timestamps".
+        clops_start_utc (str): the wall-clock time at which the CLOPS timer started.
+    Returns:
+        Dict[str, Dict[str, Dict[str, Any]]]: for each update and job, the [start, end] intervals of
+            the client stages "bind", "serialize", "submit" and "wait" (from the first poll until the result is
+            received), and of the server stages "job", "compile" and "execution". Intervals are None if not available.
+    """
+    job_time_format = "%Y-%m-%dT%H:%M:%S.%f%z"
+    reference = datetime.strptime(clops_start_utc, job_time_format)
+
+    def server_time(timestamp: str) -> float:
+        return (datetime.strptime(timestamp, job_time_format) - reference).total_seconds()
+
+    timeline: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for update, batches in job_meta.items():
+        timeline[update] = {}
+        for batch, meta in batches.items():
+            client = meta["client_timestamps"]
+            server = meta["timestamps"]
+            timeline[update][batch] = {
+                "bind": [client["bind_start"], client["bind_end"]],
+                "serialize": (
+                    [client["serialize_start"], client["serialize_end"]]
+                    if client["serialize_end"] is not None
+                    else None
+                ),
+                "submit": [client["submit_start"], client["submit_end"]],
+                "wait": [client["first_poll"], client["result_received"]],
+            }
+            for stage in ("job", "compile", "execution"):
+                timeline[update][batch][stage] = (
+                    [server_time(server[f"{stage}_start"]), server_time(server[f"{stage}_end"])]
+                    if server is not None
+                    else None
+                )
+
+    return timeline
+
+
+def estimate_clops_ceilings(
+    timeline: Dict[str, Dict[str, Dict[str, Any]]], clops_operations: float
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Split the CLOPS time into client and server time, and estimate the CLOPS each side alone would allow.
+
+    The client time adds up parameter binding (once per update), serialization, submission, and the latency between
+    the end of each job on the server and the reception of its result (e.g., due to the polling interval).
+    The server time is the time during which at least one job was being compiled or executed.
+
+    Args:
+        timeline (Dict[str, Dict[str, Dict[str, Any]]]): the timeline of instrumented CLOPS jobs,
+            as returned by `retrieve_clops_timeline`.
+        clops_operations (float): the number of operations counted by CLOPS, i.e., its value times the CLOPS time.
+    Returns:
+        Tuple[Dict[str, float], Dict[str, float]]: the client time breakdown, and the client-limited and (if server
+            timestamps are available) server-limited CLOPS ceilings.
+    """
+    client_overhead = {"bind": 0.0, "serialize": 0.0, "submit": 0.0, "result_latency": 0.0}
+    server_intervals = []
+    for jobs in timeline.values():
+        client_overhead["bind"] += np.diff(next(iter(jobs.values()))["bind"])[0]
+        for job in jobs.values():
+            for stage in ("serialize", "submit"):
+                if job[stage] is not None:
+                    client_overhead[stage] += np.diff(job[stage])[0]
+            if job["execution"] is not None:
+                client_overhead["result_latency"] += max(0.0, job["wait"][1] - max(job["wait"][0], job["execution"][1]))
+                server_intervals.append([job["compile"][0], job["execution"][1]])
+    client_overhead = {k: float(v) for k, v in client_overhead.items()}
+    client_overhead["total"] = sum(client_overhead.values())
+
+    ceilings = {"client_limited_clops_v": clops_operations / client_overhead["total"]}
+    if server_intervals:
+        ceilings["server_limited_clops_v"] = clops_operations / merged_intervals_length(server_intervals)
+
+    return client_overhead, ceilings
+
+
+def plot_clops_timeline(clops_data: xr.Dataset, timeline: Dict[str, Dict[str, Dict[str, Any]]]) -> Tuple[str, Figure]:
+    """Generate a timeline figure of the client and server stages of all instrumented CLOPS jobs.
+
+    Args:
+        clops_data (xr.Dataset): The dataset of the CLOPS experiment
+        timeline (Dict[str, Dict[str, Dict[str, Any]]]): the timeline of instrumented CLOPS jobs,
+            as returned by `retrieve_clops_timeline`.
+    Returns:
+        str: the name of the figure.
+        Figure: the figure.
+    """
+    client_stages = ["bind", "serialize", "submit", "wait"]
+    server_stages = ["compile", "execution"]
+    cmap = mpl.pyplot.get_cmap("tab10")
+    colors = {stage: cmap(i) for i, stage in enumerate(client_stages + server_stages)}
+
+    fig, ax = plt.subplots()
+    labels = []
+    for row, (update, batch, job) in enumerate(
+        (update, batch, job) for update, jobs in timeline.items() for batch, job in jobs.items()
+    ):
+        labels.append(f"{update.replace('_', ' ')}, {batch.replace('_', ' ')}")
+        for stages, offset in ((client_stages, 0.2), (server_stages, -0.2)):
+            for stage in stages:
+                if job[stage] is not None:
+                    start, end = job[stage]
+                    ax.broken_barh([(start, end - start)], (row + offset - 0.18, 0.36), color=colors[stage], alpha=0.7)
+
+    handles = [mpl.patches.Patch(color=colors[stage], alpha=0.7, label=stage) for stage in colors]
+    ax.legend(handles=handles, fontsize=6, loc="upper right")
+    ax.set_yticks(range(len(labels)), labels, fontsize=6)
+    ax.invert_yaxis()
+    ax.set_xlabel("Time since start of CLOPS timer (seconds)")
+    plt.title(
+        f"Client (upper) and server (lower) stages of CLOPS jobs\n"
+        f"{clops_data.attrs['backend_name']}, {clops_data.attrs['execution_timestamp']}"
+    )
+
+    fig_name = f"{clops_data.attrs['num_qubits']}_qubits_{tuple(clops_data.attrs['qubits'])}_timeline"
+    fig.tight_layout()
+    plt.gcf().set_dpi(250)
+    plt.close()
+
+    return fig_name, fig
+
+
 def retrieve_clops_elapsed_times(job_meta: Dict[str, Dict[str, Any]]) -> Dict[str, float]:
     """Retrieve the elapsed times from the CLOPS job metadata
 
@@ -310,6 +490,19 @@ def clops_analysis(run: BenchmarkRunResult) -> BenchmarkAnalysisResult:
     else:
         qcvv_logger.info("There is no elapsed-time data associated to jobs (e.g., execution on simulator)")
 
+    if dataset.attrs.get("instrumented"):
+        timeline = retrieve_clops_timeline(all_job_meta, dataset.attrs["clops_start_utc"])
+        client_overhead, ceilings = estimate_clops_ceilings(timeline, clops_v * clops_time)
+        dataset.attrs.update({"clops_timeline": timeline, "client_overhead": client_overhead})
+        processed_results.update({k: {"value": int(v), "uncertainty": np.NaN} for k, v in ceilings.items()})
+        qcvv_logger.info(
+            f"Client time {client_overhead['total']:.2f} sec of CLOPS time {clops_time:.2f} sec"
+            f" -> client-limited CLOPS_v ceiling {int(ceilings['client_limited_clops_v'])}"
+        )
+
+        fig_name, fig = plot_clops_timeline(dataset, timeline)
+        plots[fig_name] = fig
+
     # Sort the final dataset
     dataset.attrs = dict(sorted(dataset.attrs.items()))
 
@@ -350,17 +543,35 @@ class CLOPSBenchmark(Benchmark):
 
         self.qiskit_optim_level = configuration.qiskit_optim_level
         self.optimize_sqg = configuration.optimize_sqg
+        self.parameter_binding = configuration.parameter_binding
+        self.pipelined = configuration.pipelined
+        self.pipeline_depth = configuration.pipeline_depth
+        self.instrumented = configuration.instrumented
+        if self.parameter_binding == "native" and self.backend.name == "IQMNdonisBackend":
+            qcvv_logger.warning(
+                'The "native" parameter binding is not supported for star architectures, using "qiskit"'
+            )
+            self.parameter_binding = "qiskit"
+        if self.parameter_binding == "native" and not self.optimize_sqg:
+            qcvv_logger.warning(
+                'The "native" parameter binding merges single-qubit gates, which optimize_sqg=False disables, '
+                'using "qiskit"'
+            )
+            self.parameter_binding = "qiskit"
+        self.native_templates: Dict[Tuple, NativeTemplates] = {}
 
         # POST-EXPERIMENT AND VARIABLES TO STORE
         self.clops_h_bool = configuration.clops_h_bool
 
-        self.parameters_per_update: Dict[str, List[float]] = {}
+        self.parameters_per_update: Dict[str, List[List[float]]] = {}
         self.counts_per_update: Dict[str, Dict[str, int]] = {}
         self.job_meta_per_update: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
         self.time_circuit_generate: float = 0.0
         self.time_transpile: float = 0.0
         self.time_sort_batches: float = 0.0
+        self.time_lower_templates: float = 0.0
+        self.start_clops_timer: float = 0.0
 
         self.session_timestamp = strftime("%Y-%m-%d_%H:%M:%S")
         self.execution_timestamp: str = ""
@@ -494,6 +705,9 @@ class CLOPSBenchmark(Benchmark):
             - lists of list of float parameter values corresponding to param updates
             - dictionary with lists of int (qubits) as keys and lists of quantum circuits as values
         """
+        if self.parameter_binding == "native":
+            return self.bind_random_parameters_to_native_templates(dict_parametrized_circs)
+
         # Store parametrized circuits in a separate dictionary
         sorted_dict_parametrized: Dict[Tuple, List[QuantumCircuit]] = {k: [] for k in dict_parametrized_circs.keys()}
         param_values: List[List[float]] = []
@@ -524,6 +738,30 @@ class CLOPSBenchmark(Benchmark):
 
         return param_values, sorted_dict_parametrized
 
+    def bind_random_parameters_to_native_templates(
+        self,
+        dict_parametrized_circs: Dict[Tuple, List[QuantumCircuit]],
+    ) -> Tuple[List[List[float]], Dict[Tuple, List[QuantumCircuit]]]:
+        """Bind random parameters to the native templates lowered from the given parametrized circuits.
+
+        Args:
+            dict_parametrized_circs (Dict[Tuple, List[QuantumCircuit]]): Dictionary with list of int (qubits) as keys and lists of parametrized quantum circuits as values
+        Returns:
+            A tuple of dictionaries:
+            - lists of list of float parameter values corresponding to param updates
+            - dictionary with lists of int (qubits) as keys and lists of quantum circuits as values
+        """
+        sorted_dict_parametrized: Dict[Tuple, List[QuantumCircuit]] = {}
+        param_values: List[List[float]] = []
+        for k in dict_parametrized_circs.keys():
+            parameters = np.random.uniform(
+                low=-pi, high=pi, size=(len(dict_parametrized_circs[k]), self.num_parameters)
+            )
+            sorted_dict_parametrized[k] = self.native_templates[k].bind(parameters)
+            param_values.extend(parameters.tolist())
+
+        return param_values, sorted_dict_parametrized
+
     def clops_cycle(
         self,
         backend: IQMBackendBase,
@@ -542,31 +780,227 @@ class CLOPSBenchmark(Benchmark):
         qcvv_logger.info(
             f"Update {(update + 1)}/{self.num_updates}\nAssigning random parameters to all {self.num_circuits} circuits"
         )
+        start_assign = perf_counter()
         (all_param_updates, sorted_transpiled_qc_list_parametrized), time_parameter_assign = (
             self.assign_random_parameters_to_all(sorted_transpiled_qc_list, self.optimize_sqg)
         )
+        bind_interval = [
+            start_assign - self.start_clops_timer,
+            start_assign + time_parameter_assign - self.start_clops_timer,
+        ]
+
+        time_submit, time_retrieve = self.execute_update(
+            backend, all_param_updates, sorted_transpiled_qc_list_parametrized, update, bind_interval
+        )
+
+        return time_parameter_assign, time_submit, time_retrieve
 
+    def execute_update(
+        self,
+        backend: IQMBackendBase,
+        all_param_updates: List[List[float]],
+        sorted_transpiled_qc_list_parametrized: Dict[Tuple, List[QuantumCircuit]],
+        update: int,
+        bind_interval: List[float],
+    ) -> Tuple[float, float]:
+        """Submits the circuits of a CLOPS update with assigned parameters and retrieves their counts
+        Args:
+            backend (IQMBackendBase): the backend to execute the jobs with
+            all_param_updates (List[List[float]]): The parameter values assigned to each circuit
+            sorted_transpiled_qc_list_parametrized (Dict[Tuple, List[QuantumCircuit]]): A dictionary of lists of quantum circuits with assigned parameters
+            update (int): The current cycle update
+            bind_interval (List[float]): The start and end of the parameter assignment of the update, since the start of the CLOPS timer
+        Returns:
+            Tuple[float, float]: The elapsed times for submission and retrieval of jobs
+        """
         qcvv_logger.info(f"Executing the corresponding circuit batch")
         # Submit all circuits to execute
+        client_timestamps: List[Dict[str, Optional[float]]] = []
         all_jobs, time_submit = submit_execute(
             sorted_transpiled_qc_list_parametrized,
             backend,
             self.num_shots,
             self.calset_id,
             max_gates_per_batch=self.max_gates_per_batch,
+            run_batch=partial(self.run_instrumented, backend, client_timestamps) if self.instrumented else None,
         )
 
         qcvv_logger.info(f"Retrieving counts")
         # Retrieve counts - the precise outputs do not matter
-        all_counts, time_retrieve = retrieve_all_counts(all_jobs)
+        if self.instrumented:
+            all_counts, time_retrieve = self.retrieve_all_counts_instrumented(all_jobs, client_timestamps)
+        else:
+            all_counts, time_retrieve = retrieve_all_counts(all_jobs)
         # Save counts - ensures counts were received and can be inspected
         self.parameters_per_update["parameters_update_" + str(update + 1)] = all_param_updates
         self.counts_per_update["counts_update_" + str(update + 1)] = all_counts
         # Retrieve and save all job metadata
         all_job_metadata = retrieve_all_job_metadata(all_jobs)
+        if self.instrumented:
+            for job_metadata, job_timestamps in zip(all_job_metadata.values(), client_timestamps):
+                job_metadata["client_timestamps"] = {
+                    "bind_start": bind_interval[0],
+                    "bind_end": bind_interval[1],
+                    **job_timestamps,
+                }
         self.job_meta_per_update["update_" + str(update + 1)] = all_job_metadata
 
-        return time_parameter_assign, time_submit, time_retrieve
+        return time_submit, time_retrieve
+
+    def run_instrumented(
+        self,
+        backend: IQMBackendBase,
+        client_timestamps: List[Dict[str, Optional[float]]],
+        run_input: List[QuantumCircuit],
+        **options,
+    ) -> IQMJob:
+        """Submits a batch of circuits as `backend.run`, recording when serialization and submission start and end.
+
+        Serialization can only be told apart from submission for IQM backends and `IQMLocalBackend`; for other backends
+        the "serialize_start" and "serialize_end" timestamps are None.
+
+        Args:
+            backend (IQMBackendBase): the backend to execute the jobs with
+            client_timestamps (List[Dict[str, Optional[float]]]): The list to append the timestamps of the job to, in
+                seconds since the start of the CLOPS timer
+            run_input (List[QuantumCircuit]): The circuits of the batch
+            options: The options passed to `backend.run`
+        Returns:
+            IQMJob: the submitted job
+        """
+        serialize_start = perf_counter()
+        serialize_end: Optional[float] = None
+        if isinstance(backend, (IQMBackend, IQMLocalBackend)):
+            # Popped before serializing, as in `IQMBackend.run`, since it is an option of the job and not the request
+            timeout_seconds = options.pop("timeout_seconds", None)
+            run_request = backend.create_run_request(run_input, **options)
+            serialize_end = perf_counter()
+            if isinstance(backend, IQMBackend):
+                # IQMBackend has no public method submitting a prepared run request, so the job is created as in
+                # `IQMBackend.run`, rather than calling it and serializing the circuits twice
+                job = IQMJob(
+                    backend,
+                    str(backend.client.submit_run_request(run_request)),
+                    shots=run_request.shots,
+                    timeout_seconds=timeout_seconds,
+                )
+                job.circuit_metadata = [c.metadata for c in run_request.circuits]
+            else:
+                job = backend.submit_run_request(run_request)
+        else:
+            job = backend.run(run_input, **options)
+        submit_end = perf_counter()
+
+        client_timestamps.append(
+            {
+                "serialize_start": serialize_start - self.start_clops_timer if serialize_end is not None else None,
+                "serialize_end": serialize_end - self.start_clops_timer if serialize_end is not None else None,
+                "submit_start": (serialize_end or serialize_start) - self.start_clops_timer,
+                "submit_end": submit_end - self.start_clops_timer,
+            }
+        )
+        return job
+
+    @timeit
+    def retrieve_all_counts_instrumented(
+        self, all_jobs: List[IQMJob], client_timestamps: List[Dict[str, Optional[float]]]
+    ) -> List[Dict[str, int]]:
+        """Retrieves the counts of all jobs as `retrieve_all_counts`, recording when each job is first polled and when
+        its result is received.
+
+        Args:
+            all_jobs (List[IQMJob]): the jobs to retrieve the counts of
+            client_timestamps (List[Dict[str, Optional[float]]]): The timestamps of each job, to which "first_poll" and
+                "result_received" are added, in seconds since the start of the CLOPS timer
+        Returns:
+            List[Dict[str, int]]: The counts of all the jobs
+        """
+        all_counts = []
+        for job, job_timestamps in zip(all_jobs, client_timestamps):
+            job.status()
+            job_timestamps["first_poll"] = perf_counter() - self.start_clops_timer
+            counts = job.result().get_counts()
+            job_timestamps["result_received"] = perf_counter() - self.start_clops_timer
+            if isinstance(counts, list):
+                all_counts.extend(counts)
+            elif isinstance(counts, dict):
+                all_counts.append(counts)
+
+        return all_counts
+
+    def clops_pipeline(
+        self,
+        backend: IQMBackendBase,
+        sorted_transpiled_qc_list: Dict[Tuple, List[QuantumCircuit]],
+        start_clops_timer: float,
+    ) -> Tuple[Dict[str, float], Dict[str, float], Dict[str, float], Dict[str, Dict[str, Any]]]:
+        """Executes all CLOPS updates, assigning the parameters of the next updates in a producer thread while the
+        current update is submitted and executed.
+
+        Assigned updates are passed to the submitter through a queue holding at most `pipeline_depth` updates.
+
+        Args:
+            backend (IQMBackendBase): the backend to execute the jobs with
+            sorted_transpiled_qc_list (Dict[str, List[QuantumCircuit]]): A dictionary of lists of transpiled quantum circuits
+            start_clops_timer (float): The start time of the CLOPS timer, to which stage times are referred
+        Returns:
+            Tuple[Dict[str, float], Dict[str, float], Dict[str, float], Dict[str, Dict[str, Any]]]: The elapsed times
+                for parameter assignment, submission and retrieval of jobs, and the stage intervals of each update
+        """
+        assigned_updates: Queue = Queue(maxsize=self.pipeline_depth)
+        stage_times: Dict[str, Dict[str, Any]] = {"update_" + str(n + 1): {} for n in range(self.num_updates)}
+
+        def produce_updates():
+            try:
+                for n in range(self.num_updates):
+                    start_assign = perf_counter()
+                    assigned_update, time_parameter_assign = self.assign_random_parameters_to_all(
+                        sorted_transpiled_qc_list, self.optimize_sqg
+                    )
+                    stage_times["update_" + str(n + 1)]["assign"] = [
+                        start_assign - start_clops_timer,
+                        perf_counter() - start_clops_timer,
+                    ]
+                    assigned_updates.put((assigned_update, time_parameter_assign))
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                assigned_updates.put(exc)
+
+        producer = Thread(target=produce_updates, daemon=True)
+        producer.start()
+
+        all_times_parameter_assign = {}
+        all_times_submit = {}
+        all_times_retrieve = {}
+        for n in range(self.num_updates):
+            start_wait = perf_counter()
+            item = assigned_updates.get()
+            if isinstance(item, Exception):
+                raise item
+            (all_param_updates, sorted_transpiled_qc_list_parametrized), time_parameter_assign = item
+            start_submit = perf_counter()
+            qcvv_logger.info(f"Update {(n + 1)}/{self.num_updates}")
+            time_submit, time_retrieve = self.execute_update(
+                backend,
+                all_param_updates,
+                sorted_transpiled_qc_list_parametrized,
+                n,
+                stage_times["update_" + str(n + 1)]["assign"],
+            )
+            end_retrieve = perf_counter()
+
+            stage_times["update_" + str(n + 1)].update(
+                {
+                    "queue_wait": start_submit - start_wait,
+                    "submit": [start_submit - start_clops_timer, start_submit + time_submit - start_clops_timer],
+                    "retrieve": [end_retrieve - time_retrieve - start_clops_timer, end_retrieve - start_clops_timer],
+                }
+            )
+            all_times_parameter_assign["update_" + str(n + 1)] = time_parameter_assign
+            all_times_submit["update_" + str(n + 1)] = time_submit
+            all_times_retrieve["update_" + str(n + 1)] = time_retrieve
+        producer.join()
+
+        return all_times_parameter_assign, all_times_submit, all_times_retrieve, stage_times
 
     def generate_transpiled_clops_templates(self) -> Dict[Tuple, List[QuantumCircuit]]:
         """Generates CLOPS circuit templates transpiled to the backend's physical layout
@@ -602,6 +1036,12 @@ class CLOPSBenchmark(Benchmark):
             # Sort circuits according to their final measurement mappings
             (sorted_transpiled_qc_list, _), self.time_sort_batches = sort_batches_by_final_layout(transpiled_qc_list)
 
+        if self.parameter_binding == "native":
+            qcvv_logger.info("Lowering the transpiled templates for native parameter binding")
+            start_lower_templates = perf_counter()
+            self.native_templates = {k: lower_native_templates(v) for k, v in sorted_transpiled_qc_list.items()}
+            self.time_lower_templates = perf_counter() - start_lower_templates
+
         self.untranspiled_circuits.circuit_groups.append(CircuitGroup(name=self.qubits, circuits=qc_list))
         for key in sorted_transpiled_qc_list.keys():
             self.transpiled_circuits.circuit_groups.append(CircuitGroup(name=f"{self.qubits}_{key}", circuits=qc_list))
@@ -639,20 +1079,47 @@ class CLOPSBenchmark(Benchmark):
         # Start CLOPS timer
         # *********************************************
         start_clops_timer = perf_counter()
+        self.start_clops_timer = start_clops_timer
+        if self.instrumented:
+            dataset.attrs["clops_start_utc"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f%z")
         qcvv_logger.info(f"CLOPS time started")
-        all_times_parameter_assign = {}
-        all_times_submit = {}
-        all_times_retrieve = {}
-        for n in range(self.num_updates):
-            time_parameter_assign, time_submit, time_retrieve = self.clops_cycle(backend, sorted_transpiled_qc_list, n)
-            all_times_parameter_assign["update_" + str(n + 1)] = time_parameter_assign
-            all_times_submit["update_" + str(n + 1)] = time_submit
-            all_times_retrieve["update_" + str(n + 1)] = time_retrieve
+        all_times_parameter_assign: Dict[str, float] = {}
+        all_times_submit: Dict[str, float] = {}
+        all_times_retrieve: Dict[str, float] = {}
+        if self.pipelined:
+            all_times_parameter_assign, all_times_submit, all_times_retrieve, stage_times = self.clops_pipeline(
+                backend, sorted_transpiled_qc_list, start_clops_timer
+            )
+        else:
+            for n in range(self.num_updates):
+                time_parameter_assign, time_submit, time_retrieve = self.clops_cycle(
+                    backend, sorted_transpiled_qc_list, n
+                )
+                all_times_parameter_assign["update_" + str(n + 1)] = time_parameter_assign
+                all_times_submit["update_" + str(n + 1)] = time_submit
+                all_times_retrieve["update_" + str(n + 1)] = time_retrieve
         # *********************************************
         # End CLOPS timer
         # *********************************************
         end_clops_timer = perf_counter()
 
+        if self.pipelined:
+            assign_intervals = [times["assign"] for times in stage_times.values()]
+            dataset.attrs.update(
+                {
+                    "pipeline_stage_times": stage_times,
+                    "pipeline_overlap": {
+                        "assign_with_submit": intervals_overlap(
+                            assign_intervals, [times["submit"] for times in stage_times.values()]
+                        ),
+                        "assign_with_retrieve": intervals_overlap(
+                            assign_intervals, [times["retrieve"] for times in stage_times.values()]
+                        ),
+                        "queue_wait_total": sum(times["queue_wait"] for times in stage_times.values()),
+                    },
+                }
+            )
+
         # COUNT OPERATIONS
         all_op_counts = count_native_gates(backend, [x for y in list(sorted_transpiled_qc_list.values()) for x in y])
 
@@ -665,6 +1132,7 @@ class CLOPSBenchmark(Benchmark):
                 "time_circuit_generate": self.time_circuit_generate,
                 "time_transpile": self.time_transpile,
                 "time_sort_batches": self.time_sort_batches,
+                "time_lower_templates": self.time_lower_templates,
                 "parameters_per_update": self.parameters_per_update,
                 "job_meta_per_update": self.job_meta_per_update,
                 "counts_per_update": self.counts_per_update,
@@ -699,6 +1167,21 @@ class CLOPSConfiguration(BenchmarkConfigurationBase):
         optimize_sqg (bool): Whether Single Qubit Gate Optimization is performed upon transpilation.
                             * The optimize_sqg value should correspond to the one used to establish QV.
                             * Default is True
+        parameter_binding (Literal["qiskit", "native"]): How random parameters are bound to the templates in every update.
+                            - "qiskit": Assigns parameters with Qiskit and optimizes single-qubit gates of every bound circuit.
+                            - "native": Lowers the transpiled templates once, merging single-qubit gates with precomputed
+                                parameter slots, so every update is a vectorized computation of the native "r" gate angles.
+                                Requires optimize_sqg, and falls back to "qiskit" otherwise.
+                            * Default is "qiskit".
+        pipelined (bool): Whether the parameters of the next updates are assigned in a separate thread while the current
+                            update is submitted and executed, instead of running updates strictly in sequence.
+                            * Default is False.
+        pipeline_depth (int): The maximum number of updates with assigned parameters waiting to be submitted when pipelined.
+                            * Default is 2.
+        instrumented (bool): Whether client-side timestamps (parameter binding, serialization, submission, first poll and
+                            result reception) are recorded for every job and aligned with the server-side job timestamps.
+                            The analysis then adds a timeline plot and estimates of the client-limited and server-limited CLOPS.
+                            * Default is False.
         routing_method (Literal["basic", "lookahead", "stochastic", "sabre", "none"]): The Qiskit transpilation routing method to use.
                             * The routing_method value should correspond to the one used to establish QV.
                             * Default is "sabre".
@@ -716,3 +1199,7 @@ class CLOPSConfiguration(BenchmarkConfigurationBase):
     clops_h_bool: bool = False
     qiskit_optim_level: int = 3
     optimize_sqg: bool = True
+    parameter_binding: Literal["qiskit", "native"] = "qiskit"
+    pipelined: bool = False
+    pipeline_depth: int = 2
+    instrumented: bool = False
@@ -0,0 +1,268 @@
+# Copyright 2024 IQM Benchmarks developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Generation of Quantum Volume circuits directly in the IQM native gate set
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from networkx import Graph, all_pairs_shortest_path, is_connected
+import numpy as np
+
+from iqm.benchmarks.utils import zxz_euler_angles
+from iqm.qiskit_iqm import IQMCircuit as QuantumCircuit
+from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
+
+
+# Magic basis, in which the canonical two-qubit gate exp(i(a XX + b YY + c ZZ)) is diagonal
+MAGIC_BASIS = np.array([[1, 0, 0, 1j], [0, 1j, 1, 0], [0, 1j, -1, 0], [1, 0, 0, -1j]]) / np.sqrt(2)
+HADAMARD = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+
+
+def canonical_gate_locals(coordinates: np.ndarray) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Single-qubit layers of a 3-CZ implementation of the canonical gate exp(i(a XX + b YY + c ZZ)).
+
+    The canonical gate equals, up to a global phase, L3 CZ L2 CZ L1 CZ L0, where each Lk is a tensor product of
+    single-qubit unitaries. This is the Vatan-Williams construction with CNOT gates expressed through CZ gates.
+
+    Args:
+        coordinates (np.ndarray): the canonical coordinates (a, b, c).
+    Returns:
+        List[Tuple[np.ndarray, np.ndarray]]: the layers [L0, L1, L2, L3], each as (unitary on q0, unitary on q1).
+    """
+    a, b, c = coordinates
+
+    def rz(angle: float) -> np.ndarray:
+        return np.diag([np.exp(-0.5j * angle), np.exp(0.5j * angle)])
+
+    def ry(angle: float) -> np.ndarray:
+        return np.array(
+            [[np.cos(angle / 2), -np.sin(angle / 2)], [np.sin(angle / 2), np.cos(angle / 2)]], dtype=complex
+        )
+
+    return [
+        (HADAMARD, rz(np.pi / 2)),
+        (rz(np.pi / 2 - 2 * c) @ HADAMARD, HADAMARD @ ry(np.pi / 2 - 2 * a)),
+        (HADAMARD, ry(2 * b - np.pi / 2) @ HADAMARD),
+        (rz(-np.pi / 2) @ HADAMARD, np.eye(2, dtype=complex)),
+    ]
+
+
+def generate_native_qv_circuits(  # pylint: disable=too-many-branches,too-many-statements
+    num_circuits: int,
+    qubits: Sequence[int],
+    backend: IQMBackendBase,
+    depth: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[List[QuantumCircuit], List[QuantumCircuit]]:
+    """Generate QV circuits directly in the IQM native gate set, without calling the Qiskit transpiler.
+
+    Every SU(4) block is sampled from the Haar measure and KAK-decomposed into a canonical gate, implemented with
+    3 CZ gates, and single-qubit unitaries. Consecutive single-qubit unitaries are merged and emitted as a single "r"
+    gate per qubit, with Z rotations tracked virtually and dropped before the final measurements.
+    Blocks acting on qubits that are not adjacent in the coupling map of the layout are routed with SWAP gates along
+    a shortest path, and the final measurements are remapped accordingly.
+
+    Args:
+        num_circuits (int): the number of QV circuits to generate.
+        qubits (Sequence[int]): the physical qubits of the layout.
+        backend (IQMBackendBase): the backend whose coupling map the native circuits must respect.
+        depth (Optional[int]): the depth of the QV circuits. Defaults to None, which makes it equal to the number of
+            qubits.
+        rng (Optional[np.random.Generator]): the random number generator to sample unitaries and permutations with.
+    Returns:
+        Tuple[List[QuantumCircuit], List[QuantumCircuit]]:
+            - the untranspiled QV circuits, with SU(4) blocks given as unitary gates, to be simulated.
+            - the corresponding native circuits on the backend's qubits, to be executed.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    num_qubits = len(qubits)
+    if depth is None:
+        depth = num_qubits
+    num_pairs = num_qubits // 2
+
+    layout_graph = Graph()
+    layout_graph.add_nodes_from(qubits)
+    layout_graph.add_edges_from(edge for edge in backend.coupling_map.get_edges() if set(edge) <= set(qubits))
+    if not is_connected(layout_graph):
+        raise ValueError(f"The coupling map restricted to qubits {list(qubits)} is not connected.")
+    shortest_paths = dict(all_pairs_shortest_path(layout_graph))
+
+    # Sample and decompose all SU(4) blocks at once
+    blocks = haar_random_unitaries(num_circuits * depth * num_pairs, 4, rng)
+    post_q0, post_q1, coordinates, pre_q0, pre_q1 = kak_decompose(blocks, rng)
+    swap_locals = canonical_gate_locals(np.array([np.pi / 4] * 3))
+    identity = np.eye(2, dtype=complex)
+
+    def append_core(ops, pending, p0, p1, layers, pre=(identity, identity), post=(identity, identity)):
+        """Append a 3-CZ core, flushing the pending single-qubit unitaries of both qubits before each CZ."""
+        pending[p0] = layers[0][0] @ pre[0] @ pending[p0]
+        pending[p1] = layers[0][1] @ pre[1] @ pending[p1]
+        for layer in layers[1:]:
+            for p in (p0, p1):
+                ops.append(("r", p, len(all_unitaries)))
+                all_unitaries.append(pending[p])
+            ops.append(("cz", p0, p1))
+            pending[p0], pending[p1] = layer
+        pending[p0] = post[0] @ pending[p0]
+        pending[p1] = post[1] @ pending[p1]
+
+    # Build each circuit as a list of single-qubit unitaries and CZs, before converting unitaries to "r" gates
+    untranspiled_circuits = []
+    all_ops = []
+    all_unitaries: List[np.ndarray] = []
+    all_final_mappings = []
+    block_index = 0
+    for _ in range(num_circuits):
+        qc = QuantumCircuit(num_qubits, name="quantum_volume_native")
+        ops: List[Tuple[str, int, int]] = []
+        pending = {q: identity for q in qubits}
+        logical_to_physical = dict(enumerate(qubits))
+        physical_to_logical = {p: l for l, p in logical_to_physical.items()}
+
+        for _ in range(depth):
+            permutation = rng.permutation(num_qubits)
+            for pair in range(num_pairs):
+                l0, l1 = permutation[2 * pair], permutation[2 * pair + 1]
+                qc.unitary(blocks[block_index], [l0, l1])
+                # Route logical qubit l0 next to l1 if they are not adjacent
+                path = shortest_paths[logical_to_physical[l0]][logical_to_physical[l1]]
+                for p_from, p_to in zip(path[:-2], path[1:-1]):
+                    append_core(ops, pending, p_from, p_to, swap_locals)
+                    l_from, l_to = physical_to_logical[p_from], physical_to_logical[p_to]
+                    logical_to_physical[l_from], logical_to_physical[l_to] = p_to, p_from
+                    physical_to_logical[p_from], physical_to_logical[p_to] = l_to, l_from
+                append_core(
+                    ops,
+                    pending,
+                    logical_to_physical[l0],
+                    logical_to_physical[l1],
+                    canonical_gate_locals(coordinates[block_index]),
+                    pre=(pre_q0[block_index], pre_q1[block_index]),
+                    post=(post_q0[block_index], post_q1[block_index]),
+                )
+                block_index += 1
+        for q in qubits:
+            ops.append(("r", q, len(all_unitaries)))
+            all_unitaries.append(pending[q])
+
+        qc.measure_all()
+        untranspiled_circuits.append(qc)
+        all_ops.append(ops)
+        all_final_mappings.append(logical_to_physical)
+
+    # Convert all single-qubit unitaries to "r" gates with virtual Z rotations
+    thetas, alphas, betas = zxz_euler_angles(np.array(all_unitaries))
+    is_identity = np.isclose(thetas, 0.0).tolist()
+    thetas, alphas, betas = thetas.tolist(), alphas.tolist(), betas.tolist()
+    native_circuits = []
+    for ops, final_mapping in zip(all_ops, all_final_mappings):
+        native_qc = QuantumCircuit(backend.num_qubits, num_qubits, name="quantum_volume_native")
+        virtual_z = {q: 0.0 for q in qubits}
+        for gate, q, target in ops:
+            if gate == "cz":
+                native_qc.cz(q, target)
+                continue
+            # U RZ(z) = RZ(alpha) RX(theta) RZ(beta + z) = RZ(alpha + beta + z) R(theta, -beta - z)
+            if not is_identity[target]:
+                native_qc.r(thetas[target], -betas[target] - virtual_z[q], q)
+            virtual_z[q] += alphas[target] + betas[target]
+        native_qc.barrier(list(qubits))
+        for logical, physical in final_mapping.items():
+            native_qc.measure(physical, logical)
+        native_circuits.append(native_qc)
+
+    return untranspiled_circuits, native_circuits
+
+
+def haar_random_unitaries(num_unitaries: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """Sample special unitary matrices from the Haar measure, through the QR decomposition of Ginibre matrices.
+
+    Args:
+        num_unitaries (int): the number of unitaries to sample.
+        dim (int): the dimension of the unitaries.
+        rng (np.random.Generator): the random number generator.
+    Returns:
+        np.ndarray: array of shape (num_unitaries, dim, dim) of Haar-random special unitaries.
+    """
+    ginibre = (rng.standard_normal((num_unitaries, dim, dim)) + 1j * rng.standard_normal((num_unitaries, dim, dim))) / (
+        np.sqrt(2)
+    )
+    q, r = np.linalg.qr(ginibre)
+    r_diagonal = np.diagonal(r, axis1=1, axis2=2)
+    unitaries = q * (r_diagonal / np.abs(r_diagonal))[:, None, :]
+    return unitaries / (np.linalg.det(unitaries) ** (1 / dim))[:, None, None]
+
+
+def kak_decompose(
+    unitaries: np.ndarray, rng: Optional[np.random.Generator] = None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """KAK-decompose an array of two-qubit special unitaries.
+
+    Each unitary is written as U = (A1 ⊗ A0) exp(i(a XX + b YY + c ZZ)) (B1 ⊗ B0), where A0, B0 act on the first
+    (least significant, in Qiskit ordering) qubit. The decomposition diagonalizes U^T U in the magic basis; its real and
+    imaginary parts commute, so they are diagonalized simultaneously through a random linear combination.
+
+    Args:
+        unitaries (np.ndarray): array of shape (N, 4, 4) of two-qubit special unitaries.
+        rng (Optional[np.random.Generator]): the random number generator for the linear combination.
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]: the arrays A0, A1, (a, b, c), B0 and B1.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    unitaries_magic = MAGIC_BASIS.conj().T @ unitaries @ MAGIC_BASIS
+    symmetric = np.swapaxes(unitaries_magic, 1, 2) @ unitaries_magic
+    _, orthogonal = np.linalg.eigh(symmetric.real + rng.uniform(0.1, 1.0) * symmetric.imag)
+    orthogonal[:, :, 0] *= np.sign(np.linalg.det(orthogonal))[:, None]
+    eigenvalues = np.diagonal(np.swapaxes(orthogonal, 1, 2) @ symmetric @ orthogonal, axis1=1, axis2=2)
+    # The phases of the diagonal canonical gate must add up to zero
+    phases = np.angle(eigenvalues) / 2
+    phases[:, 0] -= np.pi * np.round(phases.sum(axis=1) / np.pi)
+
+    left = MAGIC_BASIS @ (unitaries_magic @ orthogonal * np.exp(-1j * phases)[:, None, :]) @ MAGIC_BASIS.conj().T
+    right = MAGIC_BASIS @ np.swapaxes(orthogonal, 1, 2) @ MAGIC_BASIS.conj().T
+    coordinates = np.stack(
+        [
+            (phases[:, 0] + phases[:, 1]) / 2,
+            (phases[:, 1] + phases[:, 3]) / 2,
+            (phases[:, 0] + phases[:, 3]) / 2,
+        ],
+        axis=1,
+    )
+    left_q1, left_q0 = split_tensor_product(left)
+    right_q1, right_q0 = split_tensor_product(right)
+    return left_q0, left_q1, coordinates, right_q0, right_q1
+
+
+def split_tensor_product(unitaries: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Factor an array of two-qubit unitaries of the form A ⊗ B into their single-qubit factors.
+
+    Args:
+        unitaries (np.ndarray): array of shape (N, 4, 4) of tensor products of single-qubit unitaries.
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the arrays of special unitaries A and B, with A ⊗ B equal to the input up to a
+            global phase.
+    """
+    # Reshuffling the indices of A ⊗ B gives the rank-one matrix vec(A) vec(B)^T
+    reshuffled = unitaries.reshape(-1, 2, 2, 2, 2).transpose(0, 1, 3, 2, 4).reshape(-1, 4, 4)
+    row, column = np.divmod(np.argmax(np.abs(reshuffled).reshape(len(reshuffled), -1), axis=1), 4)
+    indices = np.arange(len(reshuffled))
+    factor_a = reshuffled[indices, :, column].reshape(-1, 2, 2)
+    factor_b = reshuffled[indices, row, :].reshape(-1, 2, 2)
+    factor_a = factor_a / np.sqrt(np.linalg.det(factor_a))[:, None, None]
+    factor_b = factor_b / np.sqrt(np.linalg.det(factor_b))[:, None, None]
+    return factor_a, factor_b
@@ -0,0 +1,216 @@
+# Copyright 2024 IQM Benchmarks developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fast parameter binding of parametrized circuit templates transpiled to the IQM native gate set
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from qiskit.circuit import Parameter, ParameterExpression
+
+from iqm.benchmarks.utils import zxz_euler_angles
+from iqm.qiskit_iqm import IQMCircuit as QuantumCircuit
+
+
+@dataclass
+class NativeTemplates:
+    """Parametrized circuit templates lowered to native "r" and "cz" gates with precomputed parameter slots.
+
+    Every run of consecutive "r" gates acting on a qubit (a segment) is merged into a single "r" gate, with Z rotations
+    tracked virtually through "cz" gates and dropped before measurements. The angles of all "r" gates of the
+    templates are affine functions of a single parameter, stored as index, coefficient and offset arrays into the
+    flattened table of parameter values of all templates, so binding new values only involves vectorized operations.
+
+    Attributes:
+        circuits (List[QuantumCircuit]): the lowered circuits, with a placeholder "r" gate per segment.
+        r_positions (List[List[int]]): for each circuit, the instruction indices of its placeholder "r" gates.
+        segment_indices (List[List[int]]): for each circuit, the segments corresponding to its placeholder "r" gates.
+        num_parameters (List[int]): the number of parameters of each template.
+        angle_slots (np.ndarray): array of shape (3, 2, num_gates) with the index, coefficient and offset of the theta
+            and phi angles of all original "r" gates.
+        segment_gates (np.ndarray): array of shape (num_segments, max_segment_length) with the original "r" gates
+            of each segment in time order, padded with num_gates (the identity).
+        segment_levels (List[np.ndarray]): the segments grouped by their position along the wire of their qubit.
+        previous_segment (np.ndarray): for each segment, the previous segment on the same qubit, or -1 if none.
+    """
+
+    circuits: List[QuantumCircuit]
+    r_positions: List[List[int]]
+    segment_indices: List[List[int]]
+    num_parameters: List[int]
+    angle_slots: np.ndarray
+    segment_gates: np.ndarray
+    segment_levels: List[np.ndarray]
+    previous_segment: np.ndarray
+
+    def bind(self, parameters: Sequence[Sequence[float]]) -> List[QuantumCircuit]:
+        """Bind parameter values to all templates.
+
+        Args:
+            parameters (Sequence[Sequence[float]]): for each template, the values of its parameters, in the order of
+                the template's `parameters` attribute.
+        Returns:
+            List[QuantumCircuit]: the bound native circuits.
+        """
+        if [len(p) for p in parameters] != self.num_parameters:
+            raise ValueError("The number of parameter values does not match the parameters of the templates.")
+        # Append a zero so that constant angles read a valid entry
+        values = np.concatenate([np.asarray(p, dtype=float) for p in parameters] + [np.zeros(1)])
+        indices, coefficients, offsets = self.angle_slots
+        theta, phi = coefficients * values[indices.astype(int)] + offsets
+
+        # Merge the gates of each segment into a single unitary
+        cos, sin = np.cos(theta / 2), np.sin(theta / 2)
+        gates = np.empty((len(theta) + 1, 2, 2), dtype=complex)
+        gates[:-1, 0, 0] = cos
+        gates[:-1, 0, 1] = -1j * np.exp(-1j * phi) * sin
+        gates[:-1, 1, 0] = -1j * np.exp(1j * phi) * sin
+        gates[:-1, 1, 1] = cos
+        gates[-1] = np.eye(2)
+        unitaries = np.broadcast_to(np.eye(2, dtype=complex), (len(self.previous_segment), 2, 2))
+        for gate_indices in self.segment_gates.T:
+            unitaries = gates[gate_indices] @ unitaries
+        segment_theta, alpha, beta = zxz_euler_angles(unitaries)
+
+        # Push the Z rotations of each segment forward to the next segment on the same qubit
+        z_in = np.zeros(len(self.previous_segment))
+        z_out = np.zeros(len(self.previous_segment))
+        for level in self.segment_levels:
+            previous = self.previous_segment[level]
+            z_in[level] = np.where(previous >= 0, z_out[previous], 0.0)
+            z_out[level] = alpha[level] + beta[level] + z_in[level]
+        segment_phi = -beta - z_in
+
+        segment_theta_list, segment_phi_list = segment_theta.tolist(), segment_phi.tolist()
+        bound_circuits = []
+        for template, positions, segments in zip(self.circuits, self.r_positions, self.segment_indices):
+            qc = template.copy()
+            data = qc.data
+            for position, segment in zip(positions, segments):
+                data[position].operation.params = [segment_theta_list[segment], segment_phi_list[segment]]
+            bound_circuits.append(qc)
+
+        return bound_circuits
+
+
+def angle_slot(angle: float | ParameterExpression, parameter_offsets: Dict[Parameter, int]) -> Tuple[int, float, float]:
+    """Express a gate angle as an affine function of a single entry of a flattened table of parameter values.
+
+    Args:
+        angle (float | ParameterExpression): the angle, either numeric or depending on a single parameter.
+        parameter_offsets (Dict[Parameter, int]): the index of each parameter in the flattened table.
+    Returns:
+        Tuple[int, float, float]: the index (-1 if the angle is constant), coefficient and offset of the angle.
+    """
+    if not isinstance(angle, ParameterExpression):
+        return -1, 0.0, float(angle)
+    if not angle.parameters:
+        return -1, 0.0, float(angle)
+    if len(angle.parameters) > 1:
+        raise ValueError(f"Angle {angle} depends on more than one parameter.")
+    (parameter,) = angle.parameters
+    coefficient = angle.gradient(parameter)
+    if isinstance(coefficient, ParameterExpression) and coefficient.parameters:
+        raise ValueError(f"Angle {angle} is not an affine function of {parameter}.")
+    return parameter_offsets[parameter], float(coefficient), float(angle.bind({parameter: 0}))
+
+
+def lower_native_templates(templates: Sequence[QuantumCircuit]) -> NativeTemplates:  # pylint: disable=too-many-locals
+    """Lower parametrized circuit templates transpiled to "r" and "cz" gates, for fast parameter binding.
+
+    Args:
+        templates (Sequence[QuantumCircuit]): the parametrized templates, containing only "r", "cz", "barrier" and
+            "measure" instructions.
+    Returns:
+        NativeTemplates: the lowered templates.
+    """
+    circuits: List[QuantumCircuit] = []
+    all_r_positions: List[List[int]] = []
+    all_segment_indices: List[List[int]] = []
+    num_parameters: List[int] = []
+    angle_slots: List[Tuple[Tuple[int, float, float], Tuple[int, float, float]]] = []
+    segments: List[List[int]] = []
+    previous_segment: List[int] = []
+    segment_level: List[int] = []
+
+    def flush(qubit, qc, pending, last_segment, r_positions, segment_indices):
+        """Emit a placeholder "r" gate for the pending gates of a qubit, closing its segment."""
+        if not pending[qubit]:
+            return
+        previous = last_segment.get(qubit, -1)
+        previous_segment.append(previous)
+        segment_level.append(0 if previous < 0 else segment_level[previous] + 1)
+        last_segment[qubit] = len(segments)
+        segment_indices.append(len(segments))
+        segments.append(pending[qubit])
+        pending[qubit] = []
+        r_positions.append(len(qc.data))
+        qc.r(0.0, 0.0, qubit)
+
+    total_parameters = sum(len(template.parameters) for template in templates)
+    for template in templates:
+        parameter_offsets = {p: sum(num_parameters) + i for i, p in enumerate(template.parameters)}
+        num_parameters.append(len(template.parameters))
+        qc = template.copy_empty_like()
+        # Merging gates does not preserve the global phase, which may also depend on the parameters
+        qc.global_phase = 0
+        r_positions: List[int] = []
+        segment_indices: List[int] = []
+        pending: Dict[int, List[int]] = {q: [] for q in range(template.num_qubits)}
+        last_segment: Dict[int, int] = {}
+
+        for instruction in template.data:
+            qubits = [template.find_bit(q).index for q in instruction.qubits]
+            if instruction.operation.name == "r":
+                theta, phi = instruction.operation.params
+                pending[qubits[0]].append(len(angle_slots))
+                angle_slots.append(
+                    (angle_slot(theta, parameter_offsets), angle_slot(phi, parameter_offsets)),
+                )
+                continue
+            if instruction.operation.name not in ("cz", "barrier", "measure"):
+                raise ValueError(f'Instruction "{instruction.operation.name}" cannot be lowered to a native template.')
+            for qubit in qubits:
+                flush(qubit, qc, pending, last_segment, r_positions, segment_indices)
+            qc.append(instruction)
+        for qubit in range(template.num_qubits):
+            flush(qubit, qc, pending, last_segment, r_positions, segment_indices)
+
+        circuits.append(qc)
+        all_r_positions.append(r_positions)
+        all_segment_indices.append(segment_indices)
+
+    num_gates = len(angle_slots)
+    max_segment_length = max((len(s) for s in segments), default=0)
+    segment_gates = np.full((len(segments), max_segment_length), num_gates, dtype=int)
+    for index, gates in enumerate(segments):
+        segment_gates[index, : len(gates)] = gates
+    # The constant angles point to the zero appended to the parameter values when binding
+    slots = np.array(angle_slots, dtype=float).reshape((num_gates, 2, 3)).transpose((2, 1, 0))
+    slots[0][slots[0] < 0] = total_parameters
+    levels = np.array(segment_level, dtype=int)
+
+    return NativeTemplates(
+        circuits=circuits,
+        r_positions=all_r_positions,
+        segment_indices=all_segment_indices,
+        num_parameters=num_parameters,
+        angle_slots=slots,
+        segment_gates=segment_gates,
+        segment_levels=[np.flatnonzero(levels == level) for level in range(max(segment_level, default=-1) + 1)],
+        previous_segment=np.array(previous_segment, dtype=int),
+    )
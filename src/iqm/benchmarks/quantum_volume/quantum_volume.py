@@ -16,6 +16,8 @@
 Quantum Volume benchmark
 """
 
+# pylint: disable=too-many-lines
+
 from copy import deepcopy
 from time import strftime
 from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Type
@@ -23,7 +25,7 @@ from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Type
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 from mthree.classes import QuasiCollection
-from mthree.utils import expval
+from mthree.utils import expval, final_measurement_mapping
 import numpy as np
 from qiskit.circuit.library import QuantumVolume
 from qiskit_aer import Aer
@@ -44,7 +46,13 @@ from iqm.benchmarks.benchmark_definition import (
 # from iqm.diqe.mapomatic import evaluate_costs, get_calibration_fidelities, get_circuit, matching_layouts
 from iqm.benchmarks.circuit_containers import BenchmarkCircuit, CircuitGroup, Circuits
 from iqm.benchmarks.logging_config import qcvv_logger
-from iqm.benchmarks.readout_mitigation import apply_readout_error_mitigation
+from iqm.benchmarks.quantum_volume.native_circuits import generate_native_qv_circuits
+from iqm.benchmarks.readout_mitigation import (
+    M3IQM,
+    apply_readout_error_mitigation,
+    calibrate_readout_error_mitigation,
+    submit_readout_error_mitigation_calibration,
+)
 from iqm.benchmarks.utils import (  # execute_with_dd,
     count_native_gates,
     perform_backend_transpilation,
@@ -143,6 +151,21 @@ def get_ideal_heavy_outputs(
     return ideal_heavy_outputs
 
 
+def get_batch_ordered_indices(sorted_qc_list_indices: Dict[Tuple[int, ...], List[int]]) -> List[int]:
+    """Get the circuit indices in the order their results are returned when submitting batches with submit_execute.
+
+    Args:
+        sorted_qc_list_indices (Dict[Tuple, List[int]]): dictionary of indices (integers) corresponding to those in the original (untranspiled) list of circuits, with keys being final physical qubit measurements
+    Returns:
+        List[int]: the circuit indices, looping batches from larger to smaller.
+    """
+    return [
+        i
+        for k in sorted(sorted_qc_list_indices.keys(), key=lambda x: len(sorted_qc_list_indices[x]), reverse=True)
+        for i in sorted_qc_list_indices[k]
+    ]
+
+
 def get_rem_hops(
     all_rem_quasidistro: List[List[QuasiCollection]], ideal_heavy_outputs: List[Dict[str, float]]
 ) -> List[float]:
@@ -197,6 +220,107 @@ def is_successful(
     return bool((avg - std * num_sigmas) > 2.0 / 3.0)
 
 
+def early_stopping_decision(
+    heavy_output_probabilities: List[float],
+    num_sigmas: int = 2,
+) -> Optional[bool]:
+    """Decide whether the outcome of a QV experiment is already settled by the HOP of the circuits executed so far.
+
+    The experiment is settled as successful when the average HOP minus num_sigmas standard deviations lies above the
+    2/3 threshold, and as unsuccessful when the average HOP plus num_sigmas standard deviations lies below it.
+
+    Args:
+        heavy_output_probabilities (List[float]): the HOP of the quantum circuits executed so far.
+        num_sigmas (int): the number of sigmas to check
+    Returns:
+        Optional[bool]: True if passed, False if failed, None if more circuits are needed to decide.
+    """
+    if is_successful(heavy_output_probabilities, num_sigmas):
+        return True
+    avg = np.mean(heavy_output_probabilities)
+    std = (avg * (1 - avg) / len(heavy_output_probabilities)) ** 0.5
+    if (avg + std * num_sigmas) < 2.0 / 3.0:
+        return False
+    return None
+
+
+def is_crosstalk_detected(
+    simultaneous_heavy_output_probabilities: List[float],
+    isolated_heavy_output_probabilities: List[float],
+    num_sigmas: int = 2,
+) -> bool:
+    """Check whether the average HOP of a layout drops when executed simultaneously with other layouts.
+
+    Crosstalk is flagged when the isolated average HOP exceeds the simultaneous one by more than num_sigmas times the
+    standard deviation of their difference.
+
+    Args:
+        simultaneous_heavy_output_probabilities (List[float]): the HOP of the circuits executed simultaneously.
+        isolated_heavy_output_probabilities (List[float]): the HOP of the same circuits executed in isolation.
+        num_sigmas (int): the number of sigmas to check
+    Returns:
+        bool: whether crosstalk between simultaneously executed layouts was detected.
+    """
+    avg_simultaneous = np.mean(simultaneous_heavy_output_probabilities)
+    avg_isolated = np.mean(isolated_heavy_output_probabilities)
+    var_simultaneous = avg_simultaneous * (1 - avg_simultaneous) / len(simultaneous_heavy_output_probabilities)
+    var_isolated = avg_isolated * (1 - avg_isolated) / len(isolated_heavy_output_probabilities)
+
+    return bool((avg_isolated - avg_simultaneous) > num_sigmas * (var_simultaneous + var_isolated) ** 0.5)
+
+
+def marginalize_layout_counts(counts: List[Dict[str, int]], widths: Sequence[int]) -> List[List[Dict[str, int]]]:
+    """Recover the counts of each qubit layout from the counts of circuits tensored with `tensor_layout_circuits`.
+
+    Args:
+        counts (List[Dict[str, int]]): the counts of the tensored circuits.
+        widths (Sequence[int]): the number of classical bits of each layout, in the order the layouts were tensored.
+    Returns:
+        List[List[Dict[str, int]]]: for each layout, the marginal counts of all circuits.
+    """
+    offsets = np.cumsum([0] + list(widths))
+    all_marginal_counts: List[List[Dict[str, int]]] = [[] for _ in widths]
+    for circuit_counts in counts:
+        marginal_counts: List[Dict[str, int]] = [{} for _ in widths]
+        for bitstring, count in circuit_counts.items():
+            bits = bitstring.replace(" ", "")
+            # Bitstrings are little-endian: the first classical bit is the rightmost character
+            for idx, width in enumerate(widths):
+                key = bits[len(bits) - offsets[idx] - width : len(bits) - offsets[idx]]
+                marginal_counts[idx][key] = marginal_counts[idx].get(key, 0) + count
+        for idx, layout_counts in enumerate(marginal_counts):
+            all_marginal_counts[idx].append(layout_counts)
+
+    return all_marginal_counts
+
+
+def tensor_layout_circuits(
+    layout_circuits: Sequence[Sequence[QuantumCircuit]], num_qubits: int
+) -> List[QuantumCircuit]:
+    """Tensor the circuits of disjoint qubit layouts into single circuits acting on all layouts simultaneously.
+
+    The i-th output circuit contains the i-th circuit of every layout, with the classical bits of each layout placed
+    one after the other, in the order of the layouts.
+
+    Args:
+        layout_circuits (Sequence[Sequence[QuantumCircuit]]): for each layout, the circuits transpiled to the backend.
+        num_qubits (int): the number of qubits of the backend.
+    Returns:
+        List[QuantumCircuit]: the tensored circuits.
+    """
+    widths = [circuits[0].num_clbits for circuits in layout_circuits]
+    tensored_circuits = []
+    for circuits in zip(*layout_circuits):
+        tensored_qc = QuantumCircuit(num_qubits, sum(widths), name="quantum_volume_simultaneous")
+        offset = 0
+        for qc, width in zip(circuits, widths):
+            tensored_qc.compose(qc, clbits=list(range(offset, offset + width)), inplace=True)
+            offset += width
+        tensored_circuits.append(tensored_qc)
+
+    return tensored_circuits
+
+
 def plot_hop_threshold(
     qubits: List[int],
     depth: int,
@@ -318,8 +442,9 @@ def qv_analysis(run: BenchmarkRunResult) -> BenchmarkAnalysisResult:
 
     for qubits_idx, qubits in enumerate(qubit_layouts):
         qcvv_logger.info(f"Noiseless simulation and post-processing for layout {qubits}")
-        # Retrieve counts
-        execution_results[str(qubits)] = xrvariable_to_counts(dataset, str(qubits), num_circuits)
+        # Retrieve counts (fewer than num_circuits may have been executed in early stopping mode)
+        num_executed_circuits = dataset.attrs[qubits_idx].get("num_executed_circuits", num_circuits)
+        execution_results[str(qubits)] = xrvariable_to_counts(dataset, str(qubits), num_executed_circuits)
 
         # Retrieve other dataset values
         sorted_qc_list_indices = dataset.attrs[qubits_idx]["sorted_qc_list_indices"]
@@ -355,6 +480,28 @@ def qv_analysis(run: BenchmarkRunResult) -> BenchmarkAnalysisResult:
             ]
         )
 
+        if dataset.attrs.get("crosstalk_check", False):
+            isolated_execution_results = xrvariable_to_counts(dataset, f"{str(qubits)}_isolated", num_executed_circuits)
+            qv_result_isolated = compute_heavy_output_probabilities(
+                isolated_execution_results, ideal_heavy_outputs[str(qubits)]
+            )
+            observations.extend(
+                [
+                    BenchmarkObservation(
+                        name="isolated_average_heavy_output_probability",
+                        value=cumulative_hop(qv_result_isolated)[-1],
+                        uncertainty=cumulative_std(qv_result_isolated)[-1],
+                        identifier=BenchmarkObservationIdentifier(qubits),
+                    ),
+                    BenchmarkObservation(
+                        name="crosstalk_detected",
+                        value=is_crosstalk_detected(qv_result, qv_result_isolated, num_sigmas),
+                        identifier=BenchmarkObservationIdentifier(qubits),
+                    ),
+                ]
+            )
+            dataset.attrs[qubits_idx]["isolated_heavy_output_probabilities"] = qv_result_isolated
+
         dataset.attrs[qubits_idx].update(
             {
                 "cumulative_average_heavy_output_probability": cumulative_hop(qv_result),
@@ -474,9 +621,32 @@ class QuantumVolumeBenchmark(Benchmark):
 
         self.qiskit_optim_level = configuration.qiskit_optim_level
         self.optimize_sqg = configuration.optimize_sqg
+        self.circuit_generation = configuration.circuit_generation
+        if self.circuit_generation == "native" and self.backend.name == "IQMNdonisBackend":
+            raise ValueError('The "native" circuit generation is not supported for star architectures.')
+
+        self.early_stopping = configuration.early_stopping
+        self.early_stopping_chunk_size = configuration.early_stopping_chunk_size
+        self.early_stopping_min_circuits = configuration.early_stopping_min_circuits
+
+        self.simultaneous_layouts = configuration.simultaneous_layouts
+        self.crosstalk_check = configuration.crosstalk_check
+        self.simultaneous_circuits: BenchmarkCircuit
+        if self.simultaneous_layouts:
+            if self.physical_layout != "fixed":
+                raise ValueError('Simultaneous execution of layouts requires the "fixed" physical layout.')
+            if self.early_stopping:
+                raise ValueError("Simultaneous execution of layouts is not compatible with early stopping.")
+            all_qubits = [q for qubits in configuration.custom_qubits_array for q in qubits]
+            if len(all_qubits) != len(set(all_qubits)):
+                raise ValueError("Qubit layouts must be disjoint to be executed simultaneously.")
+        elif self.crosstalk_check:
+            raise ValueError("The crosstalk check requires simultaneous execution of layouts.")
 
         self.rem = configuration.rem
         self.mit_shots = configuration.mit_shots
+        self.rem_cache_dir = configuration.rem_cache_dir
+        self.async_rem_calibration = configuration.async_rem_calibration
 
         self.session_timestamp = strftime("%Y%m%d-%H%M%S")
         self.execution_timestamp = ""
@@ -639,34 +809,47 @@ class QuantumVolumeBenchmark(Benchmark):
 
         return qc_list
 
+    @timeit
+    def generate_native_circuit_list(
+        self,
+        qubits: Sequence[int],
+        depth: Optional[int] = None,
+    ) -> Tuple[List[QuantumCircuit], List[QuantumCircuit]]:
+        """Generate a list of QV quantum circuits directly in the native gate set of the backend.
+
+        Args:
+            qubits (Sequence[int]): the physical qubits to generate the circuits for.
+            depth (Optional[int]): The depth of the QV circuit. Defaults to None, which makes it equal to the number of qubits.
+
+        Returns:
+            Tuple[List[QuantumCircuit], List[QuantumCircuit]]: the lists of untranspiled and native QV quantum circuits.
+        """
+        return generate_native_qv_circuits(self.num_circuits, qubits, self.backend, depth=depth)
+
     def get_rem_quasidistro(
         self,
-        sorted_transpiled_qc_list: Dict[Tuple, List[QuantumCircuit]],
+        transpiled_qc_list: List[QuantumCircuit],
         sorted_qc_list_indices: Dict[Tuple, List[int]],
         execution_results: List[Dict[str, int]],
         mit_shots: int,
+        mit: Optional[M3IQM] = None,
     ) -> List[List[QuasiCollection]]:
         """Computes readout-error-mitigated quasiprobabilities.
 
         Args:
-            sorted_transpiled_qc_list (Dict[Tuple, List[QuantumCircuit]]): A dictionary of lists of quantum circuits, indexed by qubiy layouts.
+            transpiled_qc_list (List[QuantumCircuit]): The list of transpiled quantum circuits, in the original (untranspiled) order.
             sorted_qc_list_indices (Dict[Tuple, List[int]]): dictionary of indices (integers) corresponding to those in the original (untranspiled) list of circuits, with keys being final physical qubit measurements.
-            execution_results (List[Dict[str, int]]): counts from execution of all quantum circuits.
+            execution_results (List[Dict[str, int]]): counts from execution of all quantum circuits, ordered as the batches were submitted.
             mit_shots (int): The number of measurement shots to estimate the readout calibration errors.
+            mit (Optional[M3IQM]): A mitigator calibrated for all measured qubits, shared across batches and layouts.
+                * Default is None, which calibrates once for all qubits measured in any of the batches.
         Returns:
             A list of lists of quasiprobabilities.
         """
-        all_rem_quasidistro = []
-        for k in sorted(
-            sorted_transpiled_qc_list.keys(),
-            key=lambda x: len(sorted_transpiled_qc_list[x]),
-            reverse=True,
-        ):
-            counts_corresp_to_circs_k = [execution_results[i] for i in sorted_qc_list_indices[k]]
-            all_rem_quasidistro_batch_k, _ = apply_readout_error_mitigation(
-                self.backend, sorted_transpiled_qc_list[k], counts_corresp_to_circs_k, mit_shots
-            )
-            all_rem_quasidistro += all_rem_quasidistro_batch_k
+        batch_ordered_circuits = [transpiled_qc_list[i] for i in get_batch_ordered_indices(sorted_qc_list_indices)]
+        all_rem_quasidistro, _ = apply_readout_error_mitigation(
+            self.backend, batch_ordered_circuits, execution_results, mit_shots, mit=mit
+        )
 
         return all_rem_quasidistro
 
@@ -717,7 +900,170 @@ class QuantumVolumeBenchmark(Benchmark):
         }
         return qv_results
 
-    def execute(self, backend: IQMBackendBase) -> xr.Dataset:
+    def execute_with_early_stopping(
+        self,
+        backend: IQMBackendBase,
+        all_layout_circuits: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Execute the circuits of all qubit layouts in chunks, stopping each layout once its outcome is settled.
+
+        The next chunk of every undecided layout is submitted before any counts are retrieved, so that the backend is
+        kept busy while the heavy output probabilities of the previous chunks are being computed.
+
+        Args:
+            backend (IQMBackendBase): the IQM backend to submit the jobs.
+            all_layout_circuits (List[Dict[str, Any]]): for each qubit layout, a dictionary with the "qubits", the
+                untranspiled "qc_list", the "transpiled_qc_list" and the "sorted_qc_list_indices" of the circuits.
+        Returns:
+            List[Dict[str, Any]]: for each qubit layout, a dictionary with the submitted jobs, the execution results
+                (ordered as the batches of the executed circuits) and the early stopping outcome.
+        """
+        states: List[Dict[str, Any]] = [
+            {
+                "jobs": [],
+                "counts": {},
+                "hops": [],
+                "num_executed_circuits": 0,
+                "early_stopping_decision": None,
+                "time_submit": 0.0,
+                "time_retrieve": 0.0,
+                "done": False,
+            }
+            for _ in all_layout_circuits
+        ]
+
+        while not all(state["done"] for state in states):
+            # Submit the next chunk of every undecided layout first
+            submitted = []
+            for layout, state in zip(all_layout_circuits, states):
+                if state["done"]:
+                    continue
+                start = state["num_executed_circuits"]
+                stop = min(start + self.early_stopping_chunk_size, self.num_circuits)
+                chunk_indices = {
+                    k: [i for i in v if start <= i < stop] for k, v in layout["sorted_qc_list_indices"].items()
+                }
+                chunk_indices = {k: v for k, v in chunk_indices.items() if v}
+                chunk_circuits = {k: [layout["transpiled_qc_list"][i] for i in v] for k, v in chunk_indices.items()}
+                jobs, time_submit = submit_execute(
+                    chunk_circuits,
+                    backend,
+                    self.shots,
+                    self.calset_id,
+                    max_gates_per_batch=self.max_gates_per_batch,
+                )
+                state["jobs"].extend(jobs)
+                state["time_submit"] += time_submit
+                submitted.append((layout, state, chunk_indices, jobs, start, stop))
+
+            # Retrieve counts and update the cumulative HOP of each layout
+            for layout, state, chunk_indices, jobs, start, stop in submitted:
+                qubits = layout["qubits"]
+                chunk_results, time_retrieve = retrieve_all_counts(jobs, str(qubits))
+                state["time_retrieve"] += time_retrieve
+                # Counts are returned in the order the batches were submitted (larger to smaller)
+                state["counts"].update(dict(zip(get_batch_ordered_indices(chunk_indices), chunk_results)))
+
+                chunk_ideal_heavy_outputs = get_ideal_heavy_outputs(
+                    layout["qc_list"][start:stop], {tuple(qubits): list(range(stop - start))}
+                )
+                state["hops"] += compute_heavy_output_probabilities(
+                    [state["counts"][i] for i in range(start, stop)], chunk_ideal_heavy_outputs
+                )
+                state["num_executed_circuits"] = stop
+
+                if stop >= self.early_stopping_min_circuits:
+                    state["early_stopping_decision"] = early_stopping_decision(state["hops"], self.num_sigmas)
+                state["done"] = state["early_stopping_decision"] is not None or stop == self.num_circuits
+                qcvv_logger.info(
+                    f"Layout {qubits}: average HOP {np.mean(state['hops']):.4f} after {stop} circuits"
+                    + (" - stopping early" if state["done"] and stop < self.num_circuits else "")
+                )
+
+        all_qv_results = []
+        for layout, state in zip(all_layout_circuits, states):
+            num_executed_circuits = state["num_executed_circuits"]
+            executed_indices = {
+                k: [i for i in v if i < num_executed_circuits] for k, v in layout["sorted_qc_list_indices"].items()
+            }
+            executed_indices = {k: v for k, v in executed_indices.items() if v}
+            execution_results = [state["counts"][i] for i in get_batch_ordered_indices(executed_indices)]
+            all_qv_results.append(
+                {
+                    "qubits": layout["qubits"],
+                    "jobs": state["jobs"],
+                    "qv_results_type": "vanilla",
+                    "time_submit": state["time_submit"],
+                    "time_retrieve": state["time_retrieve"],
+                    "execution_results": execution_results,
+                    "sorted_qc_list_indices": executed_indices,
+                    "num_executed_circuits": num_executed_circuits,
+                    "early_stopping_decision": state["early_stopping_decision"],
+                }
+            )
+        return all_qv_results
+
+    def execute_simultaneous(
+        self,
+        backend: IQMBackendBase,
+        all_layout_circuits: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Execute the circuits of all (disjoint) qubit layouts simultaneously, tensored into single circuits.
+
+        If the crosstalk check is enabled, the circuits of every layout are also executed in isolation.
+
+        Args:
+            backend (IQMBackendBase): the IQM backend to submit the jobs.
+            all_layout_circuits (List[Dict[str, Any]]): for each qubit layout, a dictionary with the "qubits" and the
+                "transpiled_qc_list" of the circuits.
+        Returns:
+            List[Dict[str, Any]]: for each qubit layout, a dictionary with the submitted jobs and the execution results
+                recovered by marginalization.
+        """
+        tensored_qc_list = tensor_layout_circuits(
+            [layout["transpiled_qc_list"] for layout in all_layout_circuits], backend.num_qubits
+        )
+        all_qubits = tuple(q for layout in all_layout_circuits for q in layout["qubits"])
+        self.simultaneous_circuits = BenchmarkCircuit(
+            name="simultaneous_circuits",
+            circuit_groups=[CircuitGroup(name=str(list(all_qubits)), circuits=tensored_qc_list)],
+        )
+
+        simultaneous_job = self.submit_single_qv_job(backend, list(all_qubits), {all_qubits: tensored_qc_list})
+        qcvv_logger.info(f"Job for simultaneous layouts {list(all_qubits)} submitted successfully!")
+        isolated_jobs = []
+        if self.crosstalk_check:
+            for layout in all_layout_circuits:
+                isolated_jobs.append(
+                    self.submit_single_qv_job(
+                        backend, layout["qubits"], {tuple(layout["qubits"]): layout["transpiled_qc_list"]}
+                    )
+                )
+                qcvv_logger.info(f"Isolated job for layout {layout['qubits']} submitted successfully!")
+
+        tensored_results, time_retrieve = retrieve_all_counts(simultaneous_job["jobs"], str(list(all_qubits)))
+        all_execution_results = marginalize_layout_counts(
+            tensored_results, [layout["transpiled_qc_list"][0].num_clbits for layout in all_layout_circuits]
+        )
+
+        all_qv_results = []
+        for layout_idx, (layout, execution_results) in enumerate(zip(all_layout_circuits, all_execution_results)):
+            qv_results = {
+                "qubits": layout["qubits"],
+                "jobs": simultaneous_job["jobs"],
+                "qv_results_type": "simultaneous",
+                "time_submit": simultaneous_job["time_submit"],
+                "time_retrieve": time_retrieve,
+                "execution_results": execution_results,
+            }
+            if self.crosstalk_check:
+                qv_results["isolated_execution_results"], qv_results["time_retrieve_isolated"] = retrieve_all_counts(
+                    isolated_jobs[layout_idx]["jobs"], str(layout["qubits"])
+                )
+            all_qv_results.append(qv_results)
+        return all_qv_results
+
+    def execute(self, backend: IQMBackendBase) -> xr.Dataset:  # pylint: disable=too-many-statements,too-many-branches
         """Executes the benchmark."""
 
         self.execution_timestamp = strftime("%Y%m%d-%H%M%S")
@@ -737,6 +1083,8 @@ class QuantumVolumeBenchmark(Benchmark):
         self.untranspiled_circuits = BenchmarkCircuit(name="untranspiled_circuits")
         self.transpiled_circuits = BenchmarkCircuit(name="transpiled_circuits")
         all_op_counts = {}
+        all_layout_circuits: List[Dict[str, Any]] = []
+        all_transpiled_qc_lists = {}
 
         for qubits in self.custom_qubits_array:  # NB: jobs will be submitted for qubit layouts in the specified order
 
@@ -744,21 +1092,28 @@ class QuantumVolumeBenchmark(Benchmark):
             depth = num_qubits
             qcvv_logger.info(f"Executing QV on qubits {qubits}")
 
-            qc_list, time_circuit_generation[str(qubits)] = self.generate_circuit_list(num_qubits, depth=depth)
-            qcvv_logger.info(f"Successfully generated all {self.num_circuits} circuits to be executed")
-            # Set the coupling map
-            coupling_map = set_coupling_map(qubits, backend, self.physical_layout)
-            # Perform transpilation to backend
-            qcvv_logger.info(f'Will transpile according to "{self.physical_layout}" physical layout')
-            transpiled_qc_list, time_transpilation[str(qubits)] = perform_backend_transpilation(
-                qc_list,
-                backend=backend,
-                qubits=qubits,
-                coupling_map=coupling_map,
-                qiskit_optim_level=self.qiskit_optim_level,
-                optimize_sqg=self.optimize_sqg,
-                routing_method=self.routing_method,
-            )
+            if self.circuit_generation == "native":
+                (qc_list, transpiled_qc_list), time_circuit_generation[str(qubits)] = self.generate_native_circuit_list(
+                    qubits, depth=depth
+                )
+                time_transpilation[str(qubits)] = 0.0
+                qcvv_logger.info(f"Successfully generated all {self.num_circuits} native circuits to be executed")
+            else:
+                qc_list, time_circuit_generation[str(qubits)] = self.generate_circuit_list(num_qubits, depth=depth)
+                qcvv_logger.info(f"Successfully generated all {self.num_circuits} circuits to be executed")
+                # Set the coupling map
+                coupling_map = set_coupling_map(qubits, backend, self.physical_layout)
+                # Perform transpilation to backend
+                qcvv_logger.info(f'Will transpile according to "{self.physical_layout}" physical layout')
+                transpiled_qc_list, time_transpilation[str(qubits)] = perform_backend_transpilation(
+                    qc_list,
+                    backend=backend,
+                    qubits=qubits,
+                    coupling_map=coupling_map,
+                    qiskit_optim_level=self.qiskit_optim_level,
+                    optimize_sqg=self.optimize_sqg,
+                    routing_method=self.routing_method,
+                )
             # Batching
             sorted_transpiled_qc_list: Dict[Tuple[int, ...], List[QuantumCircuit]] = {}
             time_batching[str(qubits)] = 0
@@ -781,19 +1136,61 @@ class QuantumVolumeBenchmark(Benchmark):
                 CircuitGroup(name=str(qubits), circuits=sorted_transpiled_qc_list[tuple(qubits)])
             )
 
+            all_transpiled_qc_lists[str(qubits)] = transpiled_qc_list
+            if self.rem and self.async_rem_calibration:
+                # The calibration is executed alongside the QV circuits, and waited for once their counts are retrieved
+                submit_readout_error_mitigation_calibration(
+                    backend,
+                    {q for qc in transpiled_qc_list for q in final_measurement_mapping(qc).values()},
+                    self.mit_shots,
+                    self.calset_id,
+                    self.rem_cache_dir,
+                )
+
             # Count operations
             all_op_counts[str(qubits)] = count_native_gates(backend, transpiled_qc_list)
 
+            if self.early_stopping or self.simultaneous_layouts:
+                # Circuits are submitted in chunks or tensored once all layouts are ready
+                all_layout_circuits.append(
+                    {
+                        "qubits": qubits,
+                        "qc_list": qc_list,
+                        "transpiled_qc_list": transpiled_qc_list,
+                        "sorted_qc_list_indices": sorted_qc_list_indices[str(qubits)],
+                    }
+                )
+                continue
+
             # Submit
             all_qv_jobs.append(self.submit_single_qv_job(backend, qubits, sorted_transpiled_qc_list))
             qcvv_logger.info(f"Job for layout {qubits} submitted successfully!")
 
+        if self.early_stopping:
+            qcvv_logger.info(f"Executing in chunks of {self.early_stopping_chunk_size} circuits with early stopping")
+            all_qv_jobs = self.execute_with_early_stopping(backend, all_layout_circuits)
+            for layout, job_dict in zip(all_layout_circuits, all_qv_jobs):
+                qubits = job_dict["qubits"]
+                num_executed_circuits = job_dict["num_executed_circuits"]
+                sorted_qc_list_indices[str(qubits)] = job_dict["sorted_qc_list_indices"]
+                self.untranspiled_circuits[str(qubits)].circuits = layout["qc_list"][:num_executed_circuits]
+                self.transpiled_circuits[str(qubits)].circuits = [
+                    layout["transpiled_qc_list"][i] for i in sorted_qc_list_indices[str(qubits)].get(tuple(qubits), [])
+                ]
+
+        if self.simultaneous_layouts:
+            qcvv_logger.info(f"Executing all {len(all_layout_circuits)} layouts simultaneously")
+            all_qv_jobs = self.execute_simultaneous(backend, all_layout_circuits)
+
         # Retrieve counts of jobs for all qubit layouts
         all_job_metadata = {}
         for job_idx, job_dict in enumerate(all_qv_jobs):
             qubits = job_dict["qubits"]
             # Retrieve counts
-            execution_results, time_retrieve = retrieve_all_counts(job_dict["jobs"], str(qubits))
+            if "execution_results" in job_dict:
+                execution_results, time_retrieve = job_dict["execution_results"], job_dict["time_retrieve"]
+            else:
+                execution_results, time_retrieve = retrieve_all_counts(job_dict["jobs"], str(qubits))
             # Retrieve all job meta data
             all_job_metadata = retrieve_all_job_metadata(job_dict["jobs"])
 
@@ -813,27 +1210,52 @@ class QuantumVolumeBenchmark(Benchmark):
                             str(key): value for key, value in sorted_qc_list_indices[str(qubits)].items()
                         },
                         "operation_counts": all_op_counts[str(qubits)],
+                        "num_executed_circuits": job_dict.get("num_executed_circuits", self.num_circuits),
+                        "early_stopping_decision": job_dict.get("early_stopping_decision"),
                     }
                 }
             )
 
             qcvv_logger.info(f"Adding counts of {qubits} run to the dataset")
             dataset, _ = add_counts_to_dataset(execution_results, str(qubits), dataset)
+            if "isolated_execution_results" in job_dict:
+                dataset.attrs[job_idx]["time_retrieve_isolated"] = job_dict["time_retrieve_isolated"]
+                dataset, _ = add_counts_to_dataset(
+                    job_dict["isolated_execution_results"], f"{str(qubits)}_isolated", dataset
+                )
 
         self.circuits = Circuits([self.transpiled_circuits, self.untranspiled_circuits])
+        if self.simultaneous_layouts:
+            self.circuits.benchmark_circuits.append(self.simultaneous_circuits)
 
         if self.rem:
+            # Calibrate once for the union of qubits measured by all batches and layouts of the run
+            rem_qubits = {
+                q
+                for qubits in self.custom_qubits_array
+                for i in get_batch_ordered_indices(sorted_qc_list_indices[str(qubits)])
+                for q in final_measurement_mapping(all_transpiled_qc_lists[str(qubits)][i]).values()
+            }
+            qcvv_logger.info(f"Calibrating readout error mitigation on qubits {sorted(rem_qubits)}")
+            mit, time_rem_calibration = calibrate_readout_error_mitigation(
+                backend, rem_qubits, self.mit_shots, self.calset_id, self.rem_cache_dir
+            )
+
             rem_quasidistros = {}
             for qubits in self.custom_qubits_array:
-                exec_counts = xrvariable_to_counts(dataset, str(qubits), self.num_circuits)
+                exec_counts = xrvariable_to_counts(
+                    dataset, str(qubits), len(self.untranspiled_circuits[str(qubits)].circuits)
+                )
                 rem_quasidistros[f"REM_quasidist_{str(qubits)}"] = self.get_rem_quasidistro(
-                    {tuple(qubits): self.transpiled_circuits[str(qubits)].circuits},
-                    # self.transpiled_circuits[str(qubits)],
+                    all_transpiled_qc_lists[str(qubits)],
                     sorted_qc_list_indices[str(qubits)],
                     exec_counts,
                     self.mit_shots,
+                    mit=mit,
                 )
-            dataset.attrs.update({"REM_quasidistributions": rem_quasidistros})
+            dataset.attrs.update(
+                {"REM_quasidistributions": rem_quasidistros, "time_rem_calibration": time_rem_calibration}
+            )
 
         qcvv_logger.info(f"QV experiment execution concluded !")
         return dataset
@@ -862,11 +1284,37 @@ class QuantumVolumeConfiguration(BenchmarkConfigurationBase):
                             - "fixed": Restricts the coupling map to only the specified qubits.
                             - "batching": Considers the full coupling map of the backend and circuit execution is batched per final layout.
                             * Default is "fixed"
+        circuit_generation (Literal["qiskit", "native"]): How QV circuits are generated and brought to the native gate set.
+                            - "qiskit": Decomposes Qiskit's QuantumVolume library circuits and transpiles them to the backend.
+                            - "native": Samples Haar-random SU(4) blocks and KAK-decomposes them directly into "r" and "cz" gates,
+                                respecting the coupling map of each layout (SWAPs are only added for non-adjacent pairs).
+                                No transpilation is performed, so qiskit_optim_level, optimize_sqg and routing_method are ignored.
+                            * Default is "qiskit".
         rem (bool): Whether Readout Error Mitigation is applied in post-processing.
                     When set to True, both results (readout-unmitigated and -mitigated) are produced.
                             - Default is True.
         mit_shots (int): The measurement shots to use for readout calibration.
                             * Default is 1_000.
+        rem_cache_dir (Optional[str]): The directory where readout calibrations are cached on disk, in addition to the
+                    in-memory cache shared by all benchmarks of the process.
+                            * Default is None.
+        async_rem_calibration (bool): Whether the readout calibration of the measured qubits of each layout is submitted
+                    before its QV circuits and executed alongside them, instead of after all counts are retrieved.
+                            * Default is False.
+        simultaneous_layouts (bool): Whether the circuits of all layouts are tensored into single circuits and executed
+                    simultaneously, recovering the counts of each layout by marginalization.
+                    Requires disjoint layouts and the "fixed" physical layout.
+                            * Default is False.
+        crosstalk_check (bool): Whether the circuits of every layout are also executed in isolation when executing layouts
+                    simultaneously, flagging crosstalk when the simultaneous average HOP is significantly lower.
+                            * Default is False.
+        early_stopping (bool): Whether circuits are executed in chunks, stopping each layout as soon as its average HOP
+                    is above or below the 2/3 threshold by num_sigmas standard deviations.
+                            * Default is False.
+        early_stopping_chunk_size (int): The number of circuits per layout submitted in each chunk when early stopping.
+                            * Default is 50.
+        early_stopping_min_circuits (int): The minimum number of circuits per layout executed before stopping early.
+                            * Default is 100.
     """
 
     benchmark: Type[Benchmark] = QuantumVolumeBenchmark
@@ -876,5 +1324,13 @@ class QuantumVolumeConfiguration(BenchmarkConfigurationBase):
     custom_qubits_array: Sequence[Sequence[int]]
     qiskit_optim_level: int = 3
     optimize_sqg: bool = True
+    circuit_generation: Literal["qiskit", "native"] = "qiskit"
     rem: bool = True
     mit_shots: int = 1_000
+    rem_cache_dir: Optional[str] = None
+    async_rem_calibration: bool = False
+    simultaneous_layouts: bool = False
+    crosstalk_check: bool = False
+    early_stopping: bool = False
+    early_stopping_chunk_size: int = 50
+    early_stopping_min_circuits: int = 100
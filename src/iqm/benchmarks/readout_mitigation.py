@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """M3 modification for readout mitigation at IQM QPU's."""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import hashlib
+import json
 import logging
 from math import ceil
+import os
 import threading
-from typing import Any, Dict, Iterable, List
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import warnings
 
 import mthree
@@ -24,6 +30,7 @@ from mthree.classes import QuasiCollection
 from mthree.exceptions import M3Error
 from mthree.mitigation import _job_thread
 from mthree.utils import final_measurement_mapping
+import numpy as np
 from qiskit import transpile  # pylint: disable = no-name-in-module
 from qiskit.providers import Backend, BackendV1, BackendV2
 
@@ -249,12 +256,313 @@ def readout_error_m3(counts: Dict[str, float], mit: M3IQM, qubits: Iterable) ->
     return mit.apply_correction(counts, qubits)
 
 
+@dataclass
+class ReadoutCalibration:
+    """Single-qubit readout calibration of an M3 mitigator.
+
+    Attributes:
+        matrix (np.ndarray): the 2x2 assignment matrix, with columns indexed by the prepared state.
+        shots (int): the number of shots the matrix was estimated with.
+        calibrated_at (float): the time (in seconds since the epoch) the calibration was taken.
+    """
+
+    matrix: np.ndarray
+    shots: int
+    calibrated_at: float
+
+
+class ReadoutCalibrationCache:
+    """Cache of single-qubit M3 readout calibrations, keyed by device, calibration set ID and qubit.
+
+    Mitigators are assembled from the cached calibrations, and only the qubits missing from the cache (or whose
+    calibration has expired or used fewer shots than requested) are calibrated on the backend. Calibrations are
+    optionally persisted on disk as M3 calibration files, one per device and calibration set ID.
+
+    Args:
+        ttl (float): The time (in seconds) after which cached calibrations are taken again.
+        cache_dir (Optional[str]): The default directory of the on-disk cache, if any.
+    """
+
+    def __init__(self, ttl: float = 3600.0, cache_dir: Optional[str] = None):
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._calibrations: Dict[Tuple[str, str], Dict[int, ReadoutCalibration]] = {}
+        self._pending: Dict[Tuple[str, str], List[Tuple[M3IQM, List[int], int]]] = {}
+        self._lock = threading.Lock()
+
+    def get_mitigator(
+        self,
+        backend: IQMBackendBase,
+        qubits: Iterable[int],
+        mit_shots: int = 1000,
+        calset_id: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ) -> M3IQM:
+        """Return an M3 mitigator calibrated for the given qubits, calibrating only those missing from the cache.
+
+        Calibrations submitted with `submit_calibration` are waited for rather than taken again.
+
+        Args:
+            backend (IQMBackendBase): the backend to calibrate the mitigator against.
+            qubits (Iterable[int]): the physical qubits to calibrate.
+            mit_shots (int): the number of shots per calibration circuit.
+            calset_id (Optional[str]): the calibration set ID of the backend the calibrations belong to; defaults to
+                that of the backend architecture.
+            cache_dir (Optional[str]): the directory of the on-disk cache, if other than that of the cache.
+        Returns:
+            M3IQM: a mitigator calibrated for (at least) the given qubits.
+        """
+        key = self.calibration_key(backend, calset_id)
+        with self._lock:
+            self._resolve_pending(key, backend, cache_dir)
+            missing = self._load_missing(key, backend, qubits, mit_shots, cache_dir)
+            if missing:
+                qcvv_logger.info(f"Calibrating readout error mitigation on qubits {missing}")
+                mit = M3IQM(backend)
+                mit.cals_from_system(missing, shots=mit_shots, cal_id=calset_id)
+                self._store(key, mit, missing, mit_shots)
+                self._save_to_disk(key, backend, self._calibrations[key], cache_dir)
+            return self._mitigator(backend, self._calibrations[key])
+
+    def submit_calibration(
+        self,
+        backend: IQMBackendBase,
+        qubits: Iterable[int],
+        mit_shots: int = 1000,
+        calset_id: Optional[str] = None,
+        cache_dir: Optional[str] = None,
+    ):
+        """Submit the calibration jobs of the qubits missing from the cache, without waiting for their results.
+
+        The calibrations run in the background, alongside jobs submitted afterwards, and are added to the cache by the
+        first call to `get_mitigator` for the same device and calibration set ID.
+
+        Args:
+            backend (IQMBackendBase): the backend to calibrate against.
+            qubits (Iterable[int]): the physical qubits to calibrate.
+            mit_shots (int): the number of shots per calibration circuit.
+            calset_id (Optional[str]): the calibration set ID of the backend the calibrations belong to; defaults to
+                that of the backend architecture.
+            cache_dir (Optional[str]): the directory of the on-disk cache, if other than that of the cache.
+        """
+        key = self.calibration_key(backend, calset_id)
+        with self._lock:
+            pending_qubits = {
+                q for _, qubits_, shots in self._pending.get(key, []) if shots >= mit_shots for q in qubits_
+            }
+            missing = [
+                q for q in self._load_missing(key, backend, qubits, mit_shots, cache_dir) if q not in pending_qubits
+            ]
+            if missing:
+                qcvv_logger.info(f"Submitting readout error mitigation calibration on qubits {missing}")
+                mit = M3IQM(backend)
+                mit.cals_from_system(missing, shots=mit_shots, cal_id=calset_id, async_cal=True)
+                self._pending.setdefault(key, []).append((mit, missing, mit_shots))
+
+    def clear(self):
+        """Clear the in-memory cache."""
+        with self._lock:
+            self._calibrations.clear()
+            self._pending.clear()
+
+    @staticmethod
+    def calibration_key(backend: IQMBackendBase, calset_id: Optional[str] = None) -> Tuple[str, str]:
+        """Return the key the calibrations of a backend are cached under.
+
+        Backends of IQM servers are identified by the server URL, since they all share the same name, and other
+        backends by their name. The calibration set ID defaults to that of the backend architecture.
+
+        Args:
+            backend (IQMBackendBase): the backend the calibrations are taken on.
+            calset_id (Optional[str]): the calibration set ID of the backend, if other than that of its architecture.
+        Returns:
+            Tuple[str, str]: the device identifier and the resolved calibration set ID.
+        """
+        api = getattr(getattr(backend, "client", None), "_api", None)
+        device = getattr(api, "iqm_server_url", None) or backend.name
+        return device, str(calset_id if calset_id is not None else backend.architecture.calibration_set_id)
+
+    def _load_missing(
+        self,
+        key: Tuple[str, str],
+        backend: IQMBackendBase,
+        qubits: Iterable[int],
+        mit_shots: int,
+        cache_dir: Optional[str],
+    ) -> List[int]:
+        calibrations = self._calibrations.setdefault(key, {})
+        qubits = list(qubits)
+        missing = self._missing_qubits(calibrations, qubits, mit_shots)
+        if missing:
+            stored = self._load_from_disk(key, backend, cache_dir)
+            calibrations.update({qubit: stored[qubit] for qubit in missing if qubit in stored})
+            missing = self._missing_qubits(calibrations, qubits, mit_shots)
+        return missing
+
+    def _resolve_pending(self, key: Tuple[str, str], backend: IQMBackendBase, cache_dir: Optional[str]):
+        pending = self._pending.pop(key, [])
+        for mit, qubits, mit_shots in pending:
+            self._store(key, mit, qubits, mit_shots)
+        if pending:
+            self._save_to_disk(key, backend, self._calibrations[key], cache_dir)
+
+    def _store(self, key: Tuple[str, str], mit: M3IQM, qubits: List[int], mit_shots: int):
+        # Reading the calibrations of an asynchronous M3 mitigator waits for its calibration thread
+        single_qubit_cals = mit.single_qubit_cals
+        calibrated_at = time.time()
+        calibrations = self._calibrations.setdefault(key, {})
+        for qubit in qubits:
+            calibrations[qubit] = ReadoutCalibration(single_qubit_cals[qubit], mit_shots, calibrated_at)
+
+    def _missing_qubits(
+        self, calibrations: Dict[int, ReadoutCalibration], qubits: Iterable[int], mit_shots: int
+    ) -> List[int]:
+        now = time.time()
+        return sorted(
+            {
+                qubit
+                for qubit in qubits
+                if qubit not in calibrations
+                or calibrations[qubit].shots < mit_shots
+                or now - calibrations[qubit].calibrated_at > self.ttl
+            }
+        )
+
+    @staticmethod
+    def _mitigator(backend: IQMBackendBase, calibrations: Dict[int, ReadoutCalibration]) -> M3IQM:
+        mit = M3IQM(backend)
+        mit.cals_from_matrices(
+            [calibrations[q].matrix if q in calibrations else None for q in range(backend.num_qubits)]
+        )
+        mit.cal_shots = min(calibration.shots for calibration in calibrations.values())
+        return mit
+
+    def _cache_path(self, key: Tuple[str, str], cache_dir: Optional[str]) -> Optional[str]:
+        cache_dir = cache_dir if cache_dir is not None else self.cache_dir
+        if cache_dir is None:
+            return None
+        digest = hashlib.sha256(json.dumps(list(key)).encode()).hexdigest()
+        return os.path.join(cache_dir, f"readout_calibration_{digest}.json")
+
+    def _load_from_disk(
+        self, key: Tuple[str, str], backend: IQMBackendBase, cache_dir: Optional[str]
+    ) -> Dict[int, ReadoutCalibration]:
+        path = self._cache_path(key, cache_dir)
+        if path is None or not os.path.isfile(path):
+            return {}
+        mit = M3IQM(backend)
+        mit.cals_from_file(path)
+        # The file holds a single timestamp and number of shots, those of the oldest and least precise calibration
+        calibrated_at = datetime.fromisoformat(mit.cal_timestamp).timestamp()
+        return {
+            qubit: ReadoutCalibration(matrix, mit.cal_shots, calibrated_at)
+            for qubit, matrix in enumerate(mit.single_qubit_cals)
+            if matrix is not None
+        }
+
+    def _save_to_disk(
+        self,
+        key: Tuple[str, str],
+        backend: IQMBackendBase,
+        calibrations: Dict[int, ReadoutCalibration],
+        cache_dir: Optional[str],
+    ):
+        path = self._cache_path(key, cache_dir)
+        if path is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Keep the unexpired calibrations of the file that are not in memory, e.g. those written by another cache
+        now = time.time()
+        stored = self._load_from_disk(key, backend, cache_dir)
+        calibrations = {
+            **{qubit: cal for qubit, cal in stored.items() if now - cal.calibrated_at <= self.ttl},
+            **calibrations,
+        }
+        mit = self._mitigator(backend, calibrations)
+        oldest = min(calibration.calibrated_at for calibration in calibrations.values())
+        mit.cal_timestamp = datetime.fromtimestamp(oldest, timezone.utc).isoformat()
+        mit.cals_to_file(path)
+
+
+# Cache shared by all benchmarks of a process, so that qubits are calibrated once per calibration set
+READOUT_CALIBRATION_CACHE = ReadoutCalibrationCache()
+
+
+@timeit
+def calibrate_readout_error_mitigation(
+    backend_arg: str | IQMBackendBase,
+    qubits: Iterable[int],
+    mit_shots: int = 1000,
+    calset_id: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+) -> M3IQM:
+    """Calibrate an M3 mitigator once for a set of physical qubits.
+
+    The returned mitigator can be passed to `apply_readout_error_mitigation` for every batch of circuits measuring
+    (a subset of) these qubits, so that a single calibration job is needed. Calibrations are taken from the shared
+    `READOUT_CALIBRATION_CACHE`, so that only the qubits not calibrated yet under the calibration set are calibrated.
+
+    Args:
+        backend_arg (str | IQMBackendBase): the backend to calibrate an M3 mitigator against.
+        qubits (Iterable[int]): the physical qubits to calibrate.
+        mit_shots (int): number of shots per circuit.
+        calset_id (Optional[str]): the calibration set ID of the backend.
+        cache_dir (Optional[str]): the directory of the on-disk cache, if other than that of the shared cache.
+    Returns:
+        M3IQM: the calibrated mitigator.
+    """
+    # M3IQM uses mthree.mitigation, which for some reason displays way too many INFO messages
+    logging.getLogger().setLevel(logging.WARN)
+    if isinstance(backend_arg, str):
+        backend = get_iqm_backend(backend_arg)
+    else:
+        backend = backend_arg
+
+    mit = READOUT_CALIBRATION_CACHE.get_mitigator(backend, qubits, mit_shots, calset_id, cache_dir)
+    logging.getLogger().setLevel(logging.INFO)
+
+    return mit
+
+
+def submit_readout_error_mitigation_calibration(
+    backend_arg: str | IQMBackendBase,
+    qubits: Iterable[int],
+    mit_shots: int = 1000,
+    calset_id: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+):
+    """Submit the calibration of an M3 mitigator for a set of physical qubits, without waiting for its results.
+
+    The calibration jobs run alongside the jobs submitted afterwards, e.g. those of a benchmark measuring the qubits,
+    and `calibrate_readout_error_mitigation` (or `apply_readout_error_mitigation`) waits for them in the shared cache
+    instead of calibrating again.
+
+    Args:
+        backend_arg (str | IQMBackendBase): the backend to calibrate an M3 mitigator against.
+        qubits (Iterable[int]): the physical qubits to calibrate.
+        mit_shots (int): number of shots per circuit.
+        calset_id (Optional[str]): the calibration set ID of the backend.
+        cache_dir (Optional[str]): the directory of the on-disk cache, if other than that of the shared cache.
+    """
+    logging.getLogger().setLevel(logging.WARN)
+    if isinstance(backend_arg, str):
+        backend = get_iqm_backend(backend_arg)
+    else:
+        backend = backend_arg
+
+    READOUT_CALIBRATION_CACHE.submit_calibration(backend, qubits, mit_shots, calset_id, cache_dir)
+    logging.getLogger().setLevel(logging.INFO)
+
+
 @timeit
 def apply_readout_error_mitigation(
     backend_arg: str | IQMBackendBase,
     transpiled_circuits: List[QuantumCircuit],
     counts: List[Dict[str, int]],
     mit_shots: int = 1000,
+    mit: Optional[M3IQM] = None,
+    calset_id: Optional[str] = None,
+    cache_dir: Optional[str] = None,
 ) -> List[tuple[Any, Any]] | List[tuple[QuasiCollection, list]] | List[QuasiCollection]:
     """
     Args:
@@ -262,23 +570,25 @@ def apply_readout_error_mitigation(
         transpiled_circuits (List[QuantumCircuit]): the list of transpiled quantum circuits.
         counts (List[Dict[str, int]]): the measurement counts corresponding to the circuits.
         mit_shots (int): number of shots per circuit.
+        mit (Optional[M3IQM]): a mitigator already calibrated for all qubits measured by the circuits.
+            * Default is None, which calibrates a mitigator for the measured qubits, reusing cached calibrations.
+        calset_id (Optional[str]): the calibration set ID of the backend, used when calibrating a mitigator.
+        cache_dir (Optional[str]): the directory of the on-disk cache of readout calibrations, if any.
     Returns:
         tuple[Any, Any] | tuple[QuasiCollection, list] | QuasiCollection: a list of dictionaries with REM-corrected quasiprobabilities for each outcome.
     """
-    # M3IQM uses mthree.mitigation, which for some reason displays way too many INFO messages
-    logging.getLogger().setLevel(logging.WARN)
-    if isinstance(backend_arg, str):
-        backend = get_iqm_backend(backend_arg)
-    else:
-        backend = backend_arg
-
-    # Initialize with the given system and get calibration data
     qubits_rem = [final_measurement_mapping(c) for c in transpiled_circuits]
+    measured_qubits = {q for mapping in qubits_rem for q in mapping.values()}
 
-    mit = M3IQM(backend)
-    mit.cals_from_system(qubits_rem, shots=mit_shots)
-    # Apply the REM correction to the given measured counts
-    rem_quasidistro = [mit.apply_correction(c, q) for c, q in zip(counts, qubits_rem)]
+    if mit is None:
+        # Initialize with the given system and get calibration data
+        mit, _ = calibrate_readout_error_mitigation(backend_arg, measured_qubits, mit_shots, calset_id, cache_dir)
+    elif any(mit.single_qubit_cals is None or mit.single_qubit_cals[q] is None for q in measured_qubits):
+        raise ValueError("The given mitigator is not calibrated for all the qubits measured by the circuits.")
+
+    # Apply the REM correction to all the given measured counts at once
+    logging.getLogger().setLevel(logging.WARN)
+    rem_quasidistro = list(mit.apply_correction(counts, qubits_rem)) if counts else []
     logging.getLogger().setLevel(logging.INFO)
 
     return rem_quasidistro
@@ -0,0 +1,478 @@
+# Copyright 2024 IQM Benchmarks developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Fast noisy simulation of Clifford circuits on IQM fake backends, with a stabilizer and Pauli frame sampler.
+
+Circuits of native "r" and "cz" gates are lowered to Clifford circuits: every run of "r" gates acting on a qubit is
+merged into a single-qubit Clifford, up to a Z rotation which commutes with "cz" gates and is carried to the next run
+(as a virtual Z) or dropped before the measurement. A single noiseless reference sample is drawn from the stabilizer
+tableau of the circuit, and the shots are obtained by propagating random Pauli frames through the circuit, vectorized
+over shots. The errors of the fake backend's noise model are replaced by their Pauli twirls: depolarizing errors are
+kept, thermal relaxation becomes a Pauli channel, and readout errors flip the measured bits.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple, Union, cast
+import uuid
+
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.providers import JobStatus, JobV1, Options
+from qiskit.quantum_info import Clifford, StabilizerState
+from qiskit.result import Counts, Result
+
+from iqm.benchmarks.logging_config import qcvv_logger
+from iqm.qiskit_iqm.fake_backends.iqm_fake_backend import IQMFakeBackend
+from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
+
+
+PAULI_MATRICES = np.array([[[0, 1], [1, 0]], [[0, -1j], [1j, 0]], [[1, 0], [0, -1]]])
+
+
+@lru_cache(maxsize=1)
+def single_qubit_cliffords() -> Tuple[np.ndarray, List[List[str]], np.ndarray]:
+    """Enumerate the 24 single-qubit Cliffords, generated by the "h" and "s" gates.
+
+    Returns:
+        Tuple[np.ndarray, List[List[str]], np.ndarray]: the unitaries of shape (24, 2, 2), their decompositions into
+        "h" and "s" gates in time order, and their action on Pauli frames as an array of shape (24, 2, 2) of bits,
+        mapping the (x, z) bits of a Pauli to those of its conjugate.
+    """
+    generators = {"h": np.array([[1, 1], [1, -1]]) / np.sqrt(2), "s": np.diag([1, 1j])}
+    unitaries = [np.eye(2, dtype=complex)]
+    decompositions: List[List[str]] = [[]]
+    for unitary, decomposition in zip(unitaries, decompositions):
+        for name, generator in generators.items():
+            candidate = generator @ unitary
+            if all(abs(abs(np.trace(u.conj().T @ candidate)) - 2) > 1e-9 for u in unitaries):
+                unitaries.append(candidate)
+                decompositions.append(decomposition + [name])
+
+    frame_maps = np.zeros((len(unitaries), 2, 2), dtype=np.uint8)
+    for index, unitary in enumerate(unitaries):
+        # Rows: images of X (x=1, z=0) and Z (x=0, z=1); columns: x and z bits of the image
+        for row, pauli in enumerate((PAULI_MATRICES[0], PAULI_MATRICES[2])):
+            image = unitary @ pauli @ unitary.conj().T
+            overlaps = np.abs(np.einsum("pij,ji->p", PAULI_MATRICES, image))
+            image_x, image_y, image_z = np.isclose(overlaps, 2)
+            frame_maps[index, row] = [image_x or image_y, image_y or image_z]
+    return np.array(unitaries), decompositions, frame_maps
+
+
+def r_gate_unitaries(theta: np.ndarray, phi: np.ndarray) -> np.ndarray:
+    """Compute the unitaries of native "r" gates.
+
+    Args:
+        theta (np.ndarray): the rotation angles.
+        phi (np.ndarray): the phases of the rotation axes.
+    Returns:
+        np.ndarray: the unitaries, of shape (len(theta), 2, 2).
+    """
+    cos, sin = np.cos(theta / 2), np.sin(theta / 2)
+    unitaries = np.empty((len(theta), 2, 2), dtype=complex)
+    unitaries[:, 0, 0] = cos
+    unitaries[:, 0, 1] = -1j * np.exp(-1j * phi) * sin
+    unitaries[:, 1, 0] = -1j * np.exp(1j * phi) * sin
+    unitaries[:, 1, 1] = cos
+    return unitaries
+
+
+def clifford_up_to_z(unitary: np.ndarray, tolerance: float = 1e-6) -> Optional[Tuple[int, float]]:
+    """Decompose a single-qubit unitary as RZ(angle) C, with C a single-qubit Clifford.
+
+    Args:
+        unitary (np.ndarray): the single-qubit unitary.
+        tolerance (float): the tolerance of the decomposition.
+    Returns:
+        Optional[Tuple[int, float]]: the index of C in `single_qubit_cliffords` and the angle of the Z rotation, or None
+        if the unitary is not a Clifford up to a Z rotation.
+    """
+    cliffords = single_qubit_cliffords()[0]
+    # RZ(angle) = unitary C^dagger must be diagonal
+    candidates = unitary @ cliffords.conj().transpose((0, 2, 1))
+    diagonal = np.flatnonzero((np.abs(candidates[:, 0, 1]) < tolerance) & (np.abs(candidates[:, 1, 0]) < tolerance))
+    if len(diagonal) == 0:
+        return None
+    z_rotation = candidates[diagonal[0]]
+    return int(diagonal[0]), float(np.angle(z_rotation[1, 1] / z_rotation[0, 0]))
+
+
+@dataclass
+class CliffordProgram:
+    """Clifford circuit lowered from a circuit of native gates, ready for Pauli frame sampling.
+
+    Attributes:
+        num_qubits (int): the number of qubits.
+        operations (List[Tuple[str, Tuple[int, ...], int]]): the "clifford" (with the index of a single-qubit Clifford),
+            "cz" and "noise" operations, in time order, where a "noise" operation stands for the errors of an "r" gate
+            merged into the preceding single-qubit Clifford.
+        measurements (List[Tuple[int, int]]): the measured qubit and classical bit of every measurement.
+        clbit_registers (List[Tuple[int, int]]): the classical register and index in the register of every classical
+            bit.
+        register_sizes (List[int]): the sizes of the classical registers.
+    """
+
+    num_qubits: int
+    operations: List[Tuple[str, Tuple[int, ...], int]]
+    measurements: List[Tuple[int, int]]
+    clbit_registers: List[Tuple[int, int]]
+    register_sizes: List[int]
+
+    def reference_sample(self) -> np.ndarray:
+        """Draw a noiseless sample of the measured bits from the stabilizer tableau of the circuit.
+
+        Returns:
+            np.ndarray: the outcome of each measurement.
+        """
+        measured_qubits = [qubit for qubit, _ in self.measurements]
+        if not measured_qubits:
+            return np.zeros(0, dtype=np.uint8)
+        # The tableau is restricted to the active qubits, which makes the measurement much cheaper on large backends
+        active_qubits = sorted(set(measured_qubits).union(*(qubits for _, qubits, _ in self.operations)))
+        compact = {qubit: index for index, qubit in enumerate(active_qubits)}
+        decompositions = single_qubit_cliffords()[1]
+        qc = QuantumCircuit(len(active_qubits))
+        for name, qubits, index in self.operations:
+            if name == "cz":
+                qc.cz(compact[qubits[0]], compact[qubits[1]])
+            elif name == "clifford":
+                for gate in decompositions[index]:
+                    getattr(qc, gate)(compact[qubits[0]])
+        distinct_qubits = sorted(set(measured_qubits))
+        outcome, _ = StabilizerState(Clifford(qc)).measure([compact[qubit] for qubit in distinct_qubits])
+        bits = {qubit: int(bit) for qubit, bit in zip(distinct_qubits, outcome[::-1])}
+        return np.array([bits[qubit] for qubit in measured_qubits], dtype=np.uint8)
+
+
+def lower_to_clifford_program(circuit: QuantumCircuit) -> Optional[CliffordProgram]:
+    """Lower a circuit of native "r", "cz", "id", "barrier" and final "measure" instructions to a Clifford program.
+
+    Args:
+        circuit (QuantumCircuit): the circuit.
+    Returns:
+        Optional[CliffordProgram]: the Clifford program, or None if the circuit is not a Clifford circuit with final
+        measurements only.
+    """
+    operations: List[Tuple[str, Tuple[int, ...], int]] = []
+    measurements: List[Tuple[int, int]] = []
+    pending: Dict[int, List[Tuple[float, float]]] = {q: [] for q in range(circuit.num_qubits)}
+    z_angles = np.zeros(circuit.num_qubits)
+    measured: Set[int] = set()
+
+    def flush(qubit: int) -> bool:
+        if not pending[qubit]:
+            return True
+        theta, phi = np.array(pending[qubit], dtype=float).T
+        unitary = np.eye(2, dtype=complex)
+        for gate in r_gate_unitaries(theta, phi):
+            unitary = gate @ unitary
+        # The Z rotation left by the previous segment of the qubit commutes with "cz" gates
+        rz = np.diag([np.exp(-0.5j * z_angles[qubit]), np.exp(0.5j * z_angles[qubit])])
+        decomposition = clifford_up_to_z(unitary @ rz)
+        if decomposition is None:
+            return False
+        index, z_angles[qubit] = decomposition
+        operations.append(("clifford", (qubit,), index))
+        operations.extend(("noise", (qubit,), 0) for _ in range(len(pending[qubit]) - 1))
+        pending[qubit] = []
+        return True
+
+    for instruction in circuit.data:
+        name = instruction.operation.name
+        qubits = [circuit.find_bit(q).index for q in instruction.qubits]
+        if name in ("barrier", "id"):
+            continue
+        if measured.intersection(qubits):
+            return None  # only final measurements are supported
+        if name == "r":
+            theta, phi = instruction.operation.params
+            pending[qubits[0]].append((float(theta), float(phi)))
+        elif name == "cz":
+            if not all(flush(qubit) for qubit in qubits):
+                return None
+            operations.append(("cz", tuple(qubits), 0))
+        elif name == "measure":
+            # Z rotations before a measurement do not change its outcome
+            if not flush(qubits[0]):
+                return None
+            measured.add(qubits[0])
+            measurements.append((qubits[0], circuit.find_bit(instruction.clbits[0]).index))
+        else:
+            return None
+    if not all(flush(qubit) for qubit in range(circuit.num_qubits)):
+        return None
+
+    register_index = {register.name: index for index, register in enumerate(circuit.cregs)}
+    clbit_registers = []
+    for clbit in circuit.clbits:
+        register, index = circuit.find_bit(clbit).registers[0]
+        clbit_registers.append((register_index[register.name], index))
+    return CliffordProgram(
+        circuit.num_qubits, operations, measurements, clbit_registers, [register.size for register in circuit.cregs]
+    )
+
+
+class PauliNoise:
+    """Pauli-twirled noise of an IQM fake backend.
+
+    Each native gate is followed by the Pauli twirl of the thermal relaxation of its qubits during the gate, and by a
+    depolarizing error. Since the depolarizing errors commute with any gate and the twirled relaxation with Z rotations,
+    the errors of a merged run of "r" gates are all applied after the corresponding single-qubit Clifford.
+
+    Args:
+        backend (IQMBackendBase): the fake backend, or a backend with the same qubit names.
+        error_profile (Any): the error profile of the fake backend.
+    """
+
+    def __init__(self, backend: IQMBackendBase, error_profile: Any):
+        num_qubits = backend.num_qubits
+        self.single_qubit_depolarizing = np.zeros(num_qubits)
+        self.single_qubit_relaxation = np.zeros((num_qubits, 3))
+        self.two_qubit_relaxation = np.zeros((num_qubits, 3))
+        self.readout_errors = np.zeros((num_qubits, 2))
+        self.two_qubit_depolarizing: Dict[Tuple[int, int], float] = {}
+
+        qubit_indices = {name: cast(int, backend.qubit_name_to_index(name)) for name in error_profile.t1s}
+        single_qubit_duration = next(iter(error_profile.single_qubit_gate_durations.values()))
+        two_qubit_duration = next(iter(error_profile.two_qubit_gate_durations.values()))
+        for name, parameter in next(
+            iter(error_profile.single_qubit_gate_depolarizing_error_parameters.values())
+        ).items():
+            qubit = qubit_indices[name]
+            self.single_qubit_depolarizing[qubit] = parameter
+            t1, t2 = error_profile.t1s[name], error_profile.t2s[name]
+            self.single_qubit_relaxation[qubit] = self.twirled_relaxation(t1, t2, single_qubit_duration)
+            self.two_qubit_relaxation[qubit] = self.twirled_relaxation(t1, t2, two_qubit_duration)
+        for (name_1, name_2), parameter in next(
+            iter(error_profile.two_qubit_gate_depolarizing_error_parameters.values())
+        ).items():
+            qubit_1, qubit_2 = qubit_indices[name_1], qubit_indices[name_2]
+            self.two_qubit_depolarizing[(qubit_1, qubit_2)] = self.two_qubit_depolarizing[(qubit_2, qubit_1)] = (
+                parameter
+            )
+        for name, errors in error_profile.readout_errors.items():
+            self.readout_errors[qubit_indices[name]] = [errors["0"], errors["1"]]
+
+    @staticmethod
+    def twirled_relaxation(t1: float, t2: float, duration: float) -> np.ndarray:
+        """Compute the Pauli twirl of thermal relaxation.
+
+        Args:
+            t1 (float): the relaxation time.
+            t2 (float): the dephasing time.
+            duration (float): the duration of the relaxation, in the same units.
+        Returns:
+            np.ndarray: the probabilities of X, Y and Z errors.
+        """
+        p_amplitude = 1 - np.exp(-duration / t1)
+        p_phase = 1 - np.exp(-duration / t2)
+        return np.array([p_amplitude / 4, p_amplitude / 4, p_phase / 2 - p_amplitude / 4])
+
+    @staticmethod
+    def apply_pauli_channel(frames: np.ndarray, qubit: int, probabilities: np.ndarray, rng: np.random.Generator):
+        """Apply a single-qubit Pauli channel to the frames of all shots.
+
+        Args:
+            frames (np.ndarray): the x and z bits of the frames, of shape (2, shots, num_qubits), updated in place.
+            qubit (int): the qubit.
+            probabilities (np.ndarray): the probabilities of X, Y and Z errors.
+            rng (np.random.Generator): the random number generator.
+        """
+        uniform = rng.random(frames.shape[1])
+        cumulative = np.cumsum(probabilities)
+        frames[0, :, qubit] ^= uniform < cumulative[1]
+        frames[1, :, qubit] ^= (uniform >= cumulative[0]) & (uniform < cumulative[2])
+
+    @staticmethod
+    def apply_depolarizing(frames: np.ndarray, qubits: Tuple[int, ...], parameter: float, rng: np.random.Generator):
+        """Apply a depolarizing channel, replacing the state by the maximally mixed state with the given probability.
+
+        Args:
+            frames (np.ndarray): the x and z bits of the frames, of shape (2, shots, num_qubits), updated in place.
+            qubits (Tuple[int, ...]): the qubits.
+            parameter (float): the depolarizing parameter.
+            rng (np.random.Generator): the random number generator.
+        """
+        shots = frames.shape[1]
+        # A uniformly random Pauli (including the identity) fully depolarizes the qubits
+        mask = rng.random(shots) < parameter
+        paulis = rng.integers(0, 2, size=(2, shots, len(qubits)), dtype=np.uint8)
+        frames[:, :, list(qubits)] ^= paulis & mask[None, :, None].astype(np.uint8)
+
+
+def sample_clifford_program(program: CliffordProgram, shots: int, noise: PauliNoise, rng: np.random.Generator):
+    """Sample the measured bits of a Clifford program with Pauli frames, vectorized over shots.
+
+    Args:
+        program (CliffordProgram): the Clifford program.
+        shots (int): the number of shots.
+        noise (PauliNoise): the noise of the gates and measurements.
+        rng (np.random.Generator): the random number generator.
+    Returns:
+        np.ndarray: the measured bits, of shape (shots, num_clbits).
+    """
+    frame_maps = single_qubit_cliffords()[2]
+    frames = np.zeros((2, shots, program.num_qubits), dtype=np.uint8)
+    # Random Z frames leave the initial state unchanged, and randomize the outcomes of non-deterministic measurements
+    frames[1] = rng.integers(0, 2, size=(shots, program.num_qubits), dtype=np.uint8)
+
+    for name, qubits, index in program.operations:
+        if name == "cz":
+            control, target = qubits
+            frames[1, :, control] ^= frames[0, :, target]
+            frames[1, :, target] ^= frames[0, :, control]
+            noise.apply_depolarizing(frames, qubits, noise.two_qubit_depolarizing.get((control, target), 0.0), rng)
+            for qubit in qubits:
+                noise.apply_pauli_channel(frames, qubit, noise.two_qubit_relaxation[qubit], rng)
+            continue
+        (qubit,) = qubits
+        if name == "clifford":
+            x, z = frames[0, :, qubit].copy(), frames[1, :, qubit].copy()
+            frame_map = frame_maps[index]
+            frames[0, :, qubit] = (x & frame_map[0, 0]) ^ (z & frame_map[1, 0])
+            frames[1, :, qubit] = (x & frame_map[0, 1]) ^ (z & frame_map[1, 1])
+        noise.apply_depolarizing(frames, qubits, noise.single_qubit_depolarizing[qubit], rng)
+        noise.apply_pauli_channel(frames, qubit, noise.single_qubit_relaxation[qubit], rng)
+
+    bits = np.zeros((shots, len(program.clbit_registers)), dtype=np.uint8)
+    reference = program.reference_sample()
+    for (qubit, clbit), reference_bit in zip(program.measurements, reference):
+        ideal = frames[0, :, qubit] ^ reference_bit
+        flip_probabilities = noise.readout_errors[qubit][ideal]
+        bits[:, clbit] = ideal ^ (rng.random(shots) < flip_probabilities)
+    return bits
+
+
+def bits_to_counts(bits: np.ndarray, program: CliffordProgram) -> Dict[str, int]:
+    """Format measured bits as counts, with classical registers separated by spaces, in little-endian order.
+
+    Args:
+        bits (np.ndarray): the measured bits, of shape (shots, num_clbits).
+        program (CliffordProgram): the Clifford program the bits were sampled from.
+    Returns:
+        Dict[str, int]: the counts.
+    """
+    if not program.register_sizes:
+        return {"": len(bits)}
+    outcomes, counts = np.unique(bits, axis=0, return_counts=True)
+    formatted = {}
+    for outcome, count in zip(outcomes.tolist(), counts.tolist()):
+        registers = [["0"] * size for size in program.register_sizes]
+        for bit, (register, index) in zip(outcome, program.clbit_registers):
+            registers[register][index] = str(bit)
+        formatted[" ".join("".join(register[::-1]) for register in registers[::-1])] = count
+    return formatted
+
+
+class IQMStabilizerJob(JobV1):
+    """Job of an `IQMStabilizerBackend`, whose counts are sampled at submission.
+
+    Args:
+        backend (IQMStabilizerBackend): the backend the job was submitted to.
+        circuit_names (List[str]): the names of the circuits of the job.
+        counts (List[Dict[str, int]]): the counts of the circuits.
+        shots (int): the number of shots per circuit.
+    """
+
+    def __init__(
+        self, backend: "IQMStabilizerBackend", circuit_names: List[str], counts: List[Dict[str, int]], shots: int
+    ):
+        super().__init__(backend, job_id=str(uuid.uuid4()), shots=shots)
+        self.circuit_metadata: List[Dict[str, Any]] = [{} for _ in circuit_names]
+        self._circuit_names = circuit_names
+        self._counts = counts
+
+    def submit(self):
+        raise NotImplementedError("Jobs are submitted by IQMStabilizerBackend.run.")
+
+    def result(self) -> Result:
+        return Result.from_dict(
+            {
+                "backend_name": self.backend().name,
+                "backend_version": None,
+                "qobj_id": None,
+                "job_id": self.job_id(),
+                "success": True,
+                "results": [
+                    {
+                        "shots": self.metadata["shots"],
+                        "success": True,
+                        "data": {"counts": Counts(counts), "metadata": {}},
+                        "header": {"name": name},
+                    }
+                    for name, counts in zip(self._circuit_names, self._counts)
+                ],
+                "date": date.today().isoformat(),
+            }
+        )
+
+    def status(self) -> JobStatus:
+        return JobStatus.DONE
+
+
+class IQMStabilizerBackend(IQMBackendBase):
+    """Fast noisy simulator of Clifford circuits with the architecture and Pauli-twirled noise of an IQM fake backend.
+
+    Jobs whose circuits are not all Clifford circuits of native gates with final measurements are simulated by the
+    fake backend instead.
+
+    Args:
+        fake_backend (IQMFakeBackend): the fake backend providing the architecture and the error rates.
+        seed (Optional[int]): the seed of the sampler.
+        name (str): the name of the backend.
+    """
+
+    def __init__(self, fake_backend: IQMFakeBackend, seed: Optional[int] = None, name: str = "IQMStabilizerBackend"):
+        super().__init__(fake_backend.architecture)
+        self.name = name
+        self.fake_backend = fake_backend
+        self.noise = PauliNoise(self, fake_backend.error_profile)
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def _default_options(cls) -> Options:
+        return Options(shots=1024, calibration_set_id=None)
+
+    @property
+    def max_circuits(self) -> Optional[int]:
+        return None
+
+    def run(self, run_input: Union[QuantumCircuit, List[QuantumCircuit]], **options) -> JobV1:
+        """Sample the counts of circuits.
+
+        Args:
+            run_input (Union[QuantumCircuit, List[QuantumCircuit]]): the circuits to execute.
+            options: the run options, e.g. "shots". "calibration_set_id" is accepted and ignored.
+        Returns:
+            JobV1: the job, with counts already sampled.
+        """
+        circuits = [run_input] if isinstance(run_input, QuantumCircuit) else run_input
+        if not circuits:
+            raise ValueError("Empty list of circuits submitted for execution.")
+        shots = options.get("shots", self.options.shots)
+
+        programs = [lower_to_clifford_program(circuit) for circuit in circuits]
+        if any(program is None for program in programs):
+            qcvv_logger.debug("Non-Clifford circuits are simulated by the fake backend")
+            return self.fake_backend.run(circuits, shots=shots)
+
+        counts = [
+            bits_to_counts(sample_clifford_program(program, shots, self.noise, self._rng), program)
+            for program in programs
+            if program is not None
+        ]
+        return IQMStabilizerJob(self, [circuit.name for circuit in circuits], counts, shots)
@@ -0,0 +1,281 @@
+# Copyright 2024 IQM Benchmarks developers
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Matrix-free tensored readout error mitigation on integer-encoded counts.
+
+The assignment matrix of the measured register is the Kronecker product of the assignment matrices of groups of bits
+(single bits, or pairs of bits with correlated readout errors). Narrow registers are corrected in bulk as dense arrays
+of probabilities, applying the inverse of each group's matrix along its axes of the probability tensor. Wide registers
+are corrected on the support of the observed outcomes, as in M3: the reduced assignment matrix is never stored, its
+entries being exponentials of a bilinear form in the one-hot encodings of the groups, evaluated in row chunks within
+the matrix-vector products of an iterative solver.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from mthree.utils import final_measurement_mapping
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, gmres
+
+from iqm.benchmarks.readout_mitigation import M3IQM, calibrate_readout_error_mitigation
+from iqm.benchmarks.utils import timeit
+from iqm.qiskit_iqm import IQMCircuit as QuantumCircuit
+from iqm.qiskit_iqm.iqm_backend import IQMBackendBase
+
+
+def counts_to_arrays(counts: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode counts as arrays of integer outcomes and their numbers of occurrences.
+
+    Args:
+        counts (Dict[str, int]): the counts, with bitstrings in little-endian order (classical bit 0 rightmost).
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: the outcomes, with classical bit k as bit k of the integer, and their counts.
+    """
+    outcomes = np.fromiter((int(bitstring.replace(" ", ""), 2) for bitstring in counts), dtype=np.int64)
+    return outcomes, np.fromiter(counts.values(), dtype=float, count=len(counts))
+
+
+def counts_to_dense(counts: Sequence[Dict[str, int]], num_bits: int) -> np.ndarray:
+    """Encode a batch of counts as a dense array.
+
+    Args:
+        counts (Sequence[Dict[str, int]]): the counts of each circuit, with bitstrings of length `num_bits`.
+        num_bits (int): the number of measured bits.
+    Returns:
+        np.ndarray: array of shape (len(counts), 2**num_bits) with the counts of each integer outcome.
+    """
+    dense = np.zeros((len(counts), 2**num_bits))
+    for row, circuit_counts in zip(dense, counts):
+        outcomes, occurrences = counts_to_arrays(circuit_counts)
+        row[outcomes] = occurrences
+    return dense
+
+
+def nearest_probability_distributions(quasi_probabilities: np.ndarray) -> np.ndarray:
+    """Find the probability distributions closest (in Euclidean distance) to quasi-probability distributions.
+
+    This is the projection onto the probability simplex, equivalent to `nearest_probability_distribution` of M3
+    quasi-distributions, vectorized over distributions.
+
+    Args:
+        quasi_probabilities (np.ndarray): the quasi-probabilities, of shape (num_distributions, num_outcomes).
+    Returns:
+        np.ndarray: the probability distributions, of the same shape.
+    """
+    descending = -np.sort(-quasi_probabilities, axis=1)
+    thresholds = (np.cumsum(descending, axis=1) - 1) / np.arange(1, quasi_probabilities.shape[1] + 1)
+    # The number of nonzero probabilities is the last position where the sorted value exceeds the threshold
+    num_nonzero = np.sum(descending > thresholds, axis=1)
+    threshold = thresholds[np.arange(len(quasi_probabilities)), num_nonzero - 1]
+    return np.maximum(quasi_probabilities - threshold[:, None], 0.0)
+
+
+class TensoredMitigator:
+    """Tensored readout error mitigation with the assignment matrices of groups of measured bits.
+
+    Args:
+        groups (Sequence[Sequence[int]]): the classical bits of each group, partitioning the measured bits.
+        assignment_matrices (Sequence[np.ndarray]): the assignment matrix of each group, of shape (2**k, 2**k) for k
+            bits, with entry [i, j] the probability of reading i when preparing j, and bit t of i and j the value of
+            the t-th bit of the group.
+        dense_max_bits (int): the largest number of measured bits corrected as dense arrays; wider registers are
+            corrected on the support of the observed outcomes.
+    """
+
+    def __init__(
+        self,
+        groups: Sequence[Sequence[int]],
+        assignment_matrices: Sequence[np.ndarray],
+        dense_max_bits: int = 12,
+    ):
+        self.groups = [list(group) for group in groups]
+        self.assignment_matrices = [np.asarray(matrix, dtype=float) for matrix in assignment_matrices]
+        self.num_bits = sum(len(group) for group in self.groups)
+        if sorted(bit for group in self.groups for bit in group) != list(range(self.num_bits)):
+            raise ValueError("The groups must partition the measured bits.")
+        if any(matrix.shape != (2 ** len(group),) * 2 for group, matrix in zip(self.groups, self.assignment_matrices)):
+            raise ValueError("The assignment matrix of a group of k bits must be of shape (2**k, 2**k).")
+        self.dense_max_bits = dense_max_bits
+        self.inverse_matrices = [np.linalg.inv(matrix) for matrix in self.assignment_matrices]
+        # Block-diagonal logarithms of the matrices, so that the log of an entry of the full assignment matrix is a
+        # bilinear form in the one-hot encodings of the groups of its row and column outcomes
+        self._one_hot_offsets = np.cumsum([0] + [len(matrix) for matrix in self.assignment_matrices])
+        self._log_blocks = np.zeros((self._one_hot_offsets[-1],) * 2)
+        for offset, matrix in zip(self._one_hot_offsets, self.assignment_matrices):
+            self._log_blocks[offset : offset + len(matrix), offset : offset + len(matrix)] = np.log(
+                np.maximum(matrix, np.finfo(float).tiny)
+            )
+
+    @classmethod
+    def from_m3(cls, mit: M3IQM, qubits: Sequence[int], dense_max_bits: int = 12) -> "TensoredMitigator":
+        """Build a mitigator from the single-qubit calibrations of an M3 mitigator.
+
+        Args:
+            mit (M3IQM): the calibrated M3 mitigator.
+            qubits (Sequence[int]): the physical qubit measured into each classical bit.
+            dense_max_bits (int): the largest number of measured bits corrected as dense arrays.
+        Returns:
+            TensoredMitigator: the mitigator, with a group per bit.
+        """
+        return cls([[bit] for bit in range(len(qubits))], [mit.single_qubit_cals[q] for q in qubits], dense_max_bits)
+
+    def correct_dense(self, counts: np.ndarray) -> np.ndarray:
+        """Correct a batch of dense counts or probabilities, applying the inverse assignment matrix of each group.
+
+        Unlike the correction on the observed support, this is the full tensored inverse, which can assign
+        quasi-probabilities to outcomes that were not observed.
+
+        Args:
+            counts (np.ndarray): array of shape (num_circuits, 2**num_bits) with the counts of each integer outcome.
+        Returns:
+            np.ndarray: the quasi-probabilities, of the same shape.
+        """
+        num_circuits = len(counts)
+        tensor = (counts / counts.sum(axis=1, keepdims=True)).reshape((num_circuits,) + (2,) * self.num_bits)
+        for group, inverse in zip(self.groups, self.inverse_matrices):
+            size = len(group)
+            # Axis 1 of the tensor is the highest bit, and the first index of the reshaped inverse its highest bit
+            axes = [self.num_bits - bit for bit in reversed(group)]
+            inverse_tensor = inverse.reshape((2,) * (2 * size))
+            tensor = np.tensordot(tensor, inverse_tensor, axes=(axes, list(range(size, 2 * size))))
+            tensor = np.moveaxis(tensor, list(range(tensor.ndim - size, tensor.ndim)), axes)
+        return tensor.reshape(num_circuits, 2**self.num_bits)
+
+    def correct_support(
+        self, outcomes: np.ndarray, counts: np.ndarray, tol: float = 1e-5, max_iter: int = 25, chunk_size: int = 1024
+    ) -> np.ndarray:
+        """Correct the counts of a circuit on the support of its observed outcomes.
+
+        The reduced assignment matrix, restricted to the observed outcomes and with columns renormalized over them, is
+        inverted with GMRES and a Jacobi preconditioner. Its entries are computed in chunks of rows at every
+        matrix-vector product.
+
+        Args:
+            outcomes (np.ndarray): the distinct integer outcomes.
+            counts (np.ndarray): the counts of each outcome.
+            tol (float): the relative tolerance of the solver.
+            max_iter (int): the maximum number of iterations of the solver.
+            chunk_size (int): the number of rows of the reduced assignment matrix computed at once.
+        Returns:
+            np.ndarray: the quasi-probabilities of the observed outcomes.
+        """
+        one_hot = self._one_hot(outcomes)
+        weighted = one_hot @ self._log_blocks
+        num_outcomes = len(outcomes)
+
+        def matvec(vector: np.ndarray, transpose: bool = False) -> np.ndarray:
+            result = np.zeros(num_outcomes)
+            for start in range(0, num_outcomes, chunk_size):
+                rows = np.exp(weighted[start : start + chunk_size] @ one_hot.T)
+                if transpose:
+                    result += vector[start : start + chunk_size] @ rows
+                else:
+                    result[start : start + chunk_size] = rows @ vector
+            return result
+
+        column_sums = matvec(np.ones(num_outcomes), transpose=True)
+        diagonal = np.exp(np.einsum("ij,ij->i", weighted, one_hot)) / column_sums
+        reduced = LinearOperator((num_outcomes, num_outcomes), matvec=lambda x: matvec(np.ravel(x) / column_sums))
+        preconditioner = LinearOperator((num_outcomes, num_outcomes), matvec=lambda x: np.ravel(x) / diagonal)
+        probabilities = counts / counts.sum()
+        solution, _ = gmres(reduced, probabilities, rtol=tol, maxiter=max_iter, M=preconditioner)
+        return solution / solution.sum()
+
+    def mitigated_distributions(
+        self, counts: Sequence[Dict[str, int]], nearest_probability: bool = True
+    ) -> List[Dict[str, float]]:
+        """Correct a batch of counts, in bulk as dense arrays for narrow registers.
+
+        Args:
+            counts (Sequence[Dict[str, int]]): the counts of each circuit.
+            nearest_probability (bool): whether the quasi-probabilities are replaced by the nearest probabilities.
+        Returns:
+            List[Dict[str, float]]: the (quasi-)probabilities of each circuit, with the bitstrings of nonzero entries.
+        """
+        if self.num_bits <= self.dense_max_bits:
+            quasi_probabilities = self.correct_dense(counts_to_dense(counts, self.num_bits))
+            if nearest_probability:
+                quasi_probabilities = nearest_probability_distributions(quasi_probabilities)
+            distributions = []
+            for row in quasi_probabilities:
+                nonzero = np.flatnonzero(row)
+                distributions.append(self._to_dict(nonzero, row[nonzero]))
+            return distributions
+
+        distributions = []
+        for circuit_counts in counts:
+            outcomes, occurrences = counts_to_arrays(circuit_counts)
+            quasi = self.correct_support(outcomes, occurrences)
+            if nearest_probability:
+                quasi = nearest_probability_distributions(quasi[None, :])[0]
+                outcomes, quasi = outcomes[quasi > 0], quasi[quasi > 0]
+            distributions.append(self._to_dict(outcomes, quasi))
+        return distributions
+
+    def _one_hot(self, outcomes: np.ndarray) -> np.ndarray:
+        one_hot = np.zeros((len(outcomes), self._one_hot_offsets[-1]))
+        for offset, group in zip(self._one_hot_offsets, self.groups):
+            group_outcomes = sum(((outcomes >> bit) & 1) << t for t, bit in enumerate(group))
+            one_hot[np.arange(len(outcomes)), offset + group_outcomes] = 1.0
+        return one_hot
+
+    def _to_dict(self, outcomes: np.ndarray, values: np.ndarray) -> Dict[str, float]:
+        return {
+            format(outcome, f"0{self.num_bits}b"): value for outcome, value in zip(outcomes.tolist(), values.tolist())
+        }
+
+
+@timeit
+def apply_tensored_readout_error_mitigation(
+    backend_arg: str | IQMBackendBase,
+    transpiled_circuits: List[QuantumCircuit],
+    counts: List[Dict[str, int]],
+    mit_shots: int = 1000,
+    calset_id: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    nearest_probability: bool = True,
+) -> List[Dict[str, float]]:
+    """Apply tensored readout error mitigation to the counts of circuits, with single-qubit calibrations of M3.
+
+    The calibrations are taken from the shared readout calibration cache, and circuits measuring the same qubits into
+    the same classical bits are corrected together in bulk.
+
+    Args:
+        backend_arg (str | IQMBackendBase): the backend to calibrate against.
+        transpiled_circuits (List[QuantumCircuit]): the transpiled circuits, measuring into all of their classical bits.
+        counts (List[Dict[str, int]]): the counts of each circuit.
+        mit_shots (int): number of shots per calibration circuit.
+        calset_id (Optional[str]): the calibration set ID of the backend.
+        cache_dir (Optional[str]): the directory of the on-disk cache of readout calibrations, if any.
+        nearest_probability (bool): whether the quasi-probabilities are replaced by the nearest probabilities.
+    Returns:
+        List[Dict[str, float]]: the mitigated (quasi-)probabilities of each circuit.
+    """
+    measured_qubits: Dict[Tuple[int, ...], List[int]] = {}
+    for index, qc in enumerate(transpiled_circuits):
+        mapping = final_measurement_mapping(qc)
+        measured_qubits.setdefault(tuple(mapping[clbit] for clbit in sorted(mapping)), []).append(index)
+    mit, _ = calibrate_readout_error_mitigation(
+        backend_arg, {q for qubits in measured_qubits for q in qubits}, mit_shots, calset_id, cache_dir
+    )
+
+    distributions: List[Dict[str, float]] = [{} for _ in counts]
+    for qubits, indices in measured_qubits.items():
+        mitigator = TensoredMitigator.from_m3(mit, qubits)
+        for index, distribution in zip(
+            indices, mitigator.mitigated_distributions([counts[i] for i in indices], nearest_probability)
+        ):
+            distributions[index] = distribution
+    return distributions
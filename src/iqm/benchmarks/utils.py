@@ -20,7 +20,7 @@ from collections import defaultdict
 from functools import wraps
 from math import floor
 from time import time
-from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union, cast
+from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union, cast
 
 from more_itertools import chunked
 from mthree.utils import final_measurement_mapping
@@ -30,7 +30,9 @@ from qiskit.converters import circuit_to_dag
 from qiskit.transpiler import CouplingMap
 import xarray as xr
 
+from iqm.benchmarks.local_backend import IQMLocalBackend
 from iqm.benchmarks.logging_config import qcvv_logger
+from iqm.benchmarks.stabilizer_backend import IQMStabilizerBackend
 from iqm.qiskit_iqm import IQMCircuit as QuantumCircuit
 from iqm.qiskit_iqm import transpile_to_IQM
 from iqm.qiskit_iqm.fake_backends.fake_adonis import IQMFakeAdonis
@@ -152,6 +154,12 @@ def get_iqm_backend(backend_label: str) -> IQMBackendBase:
     # FakeAdonis
     if backend_label.lower() in ("iqmfakeadonis", "fakeadonis"):
         backend_object = IQMFakeAdonis()
+    # LocalAdonis
+    elif backend_label.lower() in ("iqmlocaladonis", "localadonis"):
+        backend_object = IQMLocalBackend(IQMFakeAdonis().architecture, name="IQMLocalAdonisBackend")
+    # StabilizerAdonis
+    elif backend_label.lower() in ("iqmstabilizeradonis", "stabilizeradonis"):
+        backend_object = IQMStabilizerBackend(IQMFakeAdonis(), name="IQMStabilizerAdonisBackend")
 
     # ****** 20Q grid ******
     # Garnet
@@ -162,6 +170,12 @@ def get_iqm_backend(backend_label: str) -> IQMBackendBase:
     # FakeApollo
     elif backend_label.lower() in ("iqmfakeapollo", "fakeapollo"):
         backend_object = IQMFakeApollo()
+    # LocalApollo
+    elif backend_label.lower() in ("iqmlocalapollo", "localapollo"):
+        backend_object = IQMLocalBackend(IQMFakeApollo().architecture, name="IQMLocalApolloBackend")
+    # StabilizerApollo
+    elif backend_label.lower() in ("iqmstabilizerapollo", "stabilizerapollo"):
+        backend_object = IQMStabilizerBackend(IQMFakeApollo(), name="IQMStabilizerApolloBackend")
 
     # ****** 6Q Resonator Star ******
     # Deneb
@@ -171,7 +185,10 @@ def get_iqm_backend(backend_label: str) -> IQMBackendBase:
         backend_object = provider.get_backend()
 
     else:
-        raise ValueError(f"Backend {backend_label} not supported. Try 'garnet', 'deneb', 'fakeadonis' or 'fakeapollo'.")
+        raise ValueError(
+            f"Backend {backend_label} not supported. Try 'garnet', 'deneb', 'fakeadonis', 'fakeapollo', "
+            "'localadonis', 'localapollo', 'stabilizeradonis' or 'stabilizerapollo'."
+        )
 
     return backend_object
 
@@ -288,8 +305,7 @@ def reduce_to_active_qubits(circuit: QuantumCircuit, backend_name: Optional[str]
         active_qubits.add(0)
 
     # Create a mapping from old qubits to new qubits
-    active_qubits = set(sorted(active_qubits))
-    qubit_map = {old_idx: new_idx for new_idx, old_idx in enumerate(active_qubits)}
+    qubit_map = {old_idx: new_idx for new_idx, old_idx in enumerate(sorted(active_qubits))}
 
     # Create a new quantum circuit with the reduced number of qubits
     reduced_circuit = QuantumCircuit(len(active_qubits))
@@ -427,6 +443,7 @@ def submit_execute(
     shots: int,
     calset_id: Optional[str],
     max_gates_per_batch: Optional[int],
+    run_batch: Optional[Callable[..., IQMJob]] = None,
 ) -> List[IQMJob]:
     """Submit for execute a list of quantum circuits on the specified Backend.
 
@@ -436,9 +453,13 @@ def submit_execute(
         shots (int): the number of shots per circuit.
         calset_id (Optional[str]): the calibration set ID, uses the latest one if None.
         max_gates_per_batch (int): the maximum number of gates per batch sent to the backend, used to make manageable batches.
+        run_batch (Optional[Callable[..., IQMJob]]): the function submitting each batch, with the same signature as
+            `backend.run`, e.g. to instrument submissions. Defaults to `backend.run`.
     Returns:
         List[IQMJob]: the IQMJob objects of the executed circuits.
     """
+    if run_batch is None:
+        run_batch = backend.run
     final_jobs = []
     for k in sorted(
         sorted_transpiled_qc_list.keys(),
@@ -451,7 +472,7 @@ def submit_execute(
         )
         # Divide into batches according to maximum gate count per batch
         if max_gates_per_batch is None:
-            jobs = backend.run(sorted_transpiled_qc_list[k], shots=shots, calibration_set_id=calset_id)
+            jobs = run_batch(sorted_transpiled_qc_list[k], shots=shots, calibration_set_id=calset_id)
             final_jobs.append(jobs)
         else:
             # Calculate average gate count per quantum circuit
@@ -468,7 +489,7 @@ def submit_execute(
                 qcvv_logger.info(
                     f"max_gates_per_batch restriction: submitting subbatch #{index+1} with {len(qc_batch)} circuits corresponding to qubits {list(k)}"
                 )
-                batch_jobs = backend.run(qc_batch, shots=shots, calibration_set_id=calset_id)
+                batch_jobs = run_batch(qc_batch, shots=shots, calibration_set_id=calset_id)
                 final_batch_jobs.append(batch_jobs)
             final_jobs.extend(final_batch_jobs)
 
@@ -489,3 +510,24 @@ def xrvariable_to_counts(dataset: xr.Dataset, identifier: str, counts_range: int
         dict(zip(list(dataset[f"{identifier}_state_{u}"].data), dataset[f"{identifier}_counts_{u}"].data))
         for u in range(counts_range)
     ]
+
+
+def zxz_euler_angles(unitaries: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the ZXZ Euler angles of an array of single-qubit unitaries.
+
+    Each unitary is decomposed, up to a global phase, as U = RZ(alpha) RX(theta) RZ(beta).
+    Since RZ(alpha) RX(theta) RZ(beta) = RZ(alpha + beta) R(theta, -beta), the angles map directly to a native "r"
+    gate followed by a virtual Z rotation.
+
+    Args:
+        unitaries (np.ndarray): array of shape (..., 2, 2) of single-qubit unitaries.
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: the arrays of angles theta, alpha and beta.
+    """
+    su2 = unitaries / np.sqrt(np.linalg.det(unitaries))[..., None, None]
+    theta = 2 * np.arctan2(np.abs(su2[..., 1, 0]), np.abs(su2[..., 0, 0]))
+    alpha_plus_beta = -2 * np.angle(su2[..., 0, 0])
+    alpha_minus_beta = 2 * np.angle(su2[..., 1, 0]) + np.pi
+    alpha = (alpha_plus_beta + alpha_minus_beta) / 2
+    beta = (alpha_plus_beta - alpha_minus_beta) / 2
+    return theta, alpha, beta
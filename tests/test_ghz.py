@@ -1,8 +1,25 @@
 """Tests for GHZ fidelity estimation using the new base class"""
 
+import json
+
 import numpy as np
+from qiskit import QuantumCircuit, transpile
+from qiskit.quantum_info import Statevector, random_clifford
 
-from iqm.benchmarks.entanglement.ghz import GHZBenchmark, GHZConfiguration
+from iqm.benchmarks.calibration_metrics import CalibrationMetricsClient, get_calibration_snapshot
+from iqm.benchmarks.circuit_containers import BenchmarkCircuit, Circuits
+from iqm.benchmarks.entanglement.ghz import (
+    GHZBenchmark,
+    GHZConfiguration,
+    GHZPlanner,
+    append_rms,
+    get_edges,
+    rm_cross_correlations,
+    rm_cross_correlations_stabilizer,
+    rm_measurement_subspaces,
+    stabilizer_measurement_subspace,
+)
+from iqm.benchmarks.utils import reduce_to_active_qubits
 from iqm.qiskit_iqm.fake_backends.fake_apollo import IQMFakeApollo
 
 
@@ -50,8 +67,104 @@ class TestGHZ:
             benchmark.run()
             benchmark.analyze()
 
+    def test_calibration_metrics(self, tmp_path):
+        cal_file = tmp_path / "metrics.json"
+        metrics = {
+            "metrics.irb.cz.QB1__QB2.fidelity": {"value": "0.99"},
+            "metrics.irb.cz.QB1__QB4.fidelity": {"value": 0.95},
+            "metrics.irb.cz.QB3__QB4.fidelity": {"value": 0.97},
+            "metrics.ssro.QB1.fidelity": {"value": 0.9},
+        }
+        cal_file.write_text(json.dumps({"metrics": metrics}))
+        snapshot = get_calibration_snapshot(str(cal_file))
+        assert get_calibration_snapshot(str(cal_file)) is snapshot
+        assert snapshot.layout_cz_fidelities([3, 0, 1]) == ([[1, 2], [1, 0]], [0.99, 0.95])
+
+        client = CalibrationMetricsClient(cache_dir=str(tmp_path / "cache"))
+        fetched_at = client.get(f"file://{cal_file}", "calset").fetched_at
+        cal_file.unlink()
+        assert CalibrationMetricsClient().get(
+            f"file://{cal_file}", "calset", cache_dir=str(tmp_path / "cache")
+        ).cz_fidelities == {(0, 1): 0.99, (0, 3): 0.95, (2, 3): 0.97}
+        assert client.get(f"file://{cal_file}", "calset").fetched_at == fetched_at
+
+        snapshot.to_file(str(cal_file))
+        MINIMAL_GHZ = GHZConfiguration(
+            state_generation_routine="tree",
+            custom_qubits_array=[[0, 1, 3, 4], [0, 1, 3]],
+            shots=3,
+            rem=False,
+            cal_url=str(cal_file),
+        )
+        benchmark = GHZBenchmark(backend, MINIMAL_GHZ)
+        benchmark.run()
+        benchmark.analyze()
+
+    def test_ghz_planner(self):
+        cz_fidelities = {(0, 1): 0.99, (1, 4): 0.9, (0, 3): 0.97, (3, 4): 0.98, (3, 8): 0.96}
+        planner = GHZPlanner(backend.coupling_map, cz_fidelities)
+        layout = [0, 1, 3, 4, 8]
+        # The worst coupling (1, 4) is left out of the spanning tree, whose first central qubit in the layout is 0
+        assert planner.cx_schedule(layout) == [[0, 3], [0, 1], [3, 4], [3, 8]]
+        edges = get_edges(backend.coupling_map, layout, [[0, 1], [1, 3]], [0.99, 0.9])
+        assert edges[1][4]["weight"] == -np.log(0.9)
+        for n_state in range(2, 6):
+            qc, qubits = planner.ghz_circuit(layout, n_state)
+            assert qubits == [q for q in layout if q in [0, 3, 1, 4, 8][:n_state]]
+            probabilities = Statevector(qc.remove_final_measurements(inplace=False)).probabilities_dict()
+            assert set(probabilities) == {"0" * n_state, "1" * n_state}
+
+    def test_size_sweep(self):
+        layout = [0, 1, 3, 4, 8]
+        planner = GHZPlanner(backend.coupling_map)
+        full = planner.native_ghz_circuit(layout, 5, backend.num_qubits)
+        for n_state in range(2, 5):
+            qc = planner.native_ghz_circuit(layout, n_state, backend.num_qubits)
+            assert qc.data[: 1 + 3 * (n_state - 1)] == full.data[: 1 + 3 * (n_state - 1)]
+        for fidelity_threshold, executed_sizes in [(0.0, [2, 3, 4, 5]), (1.1, [2, 3])]:
+            MINIMAL_GHZ = GHZConfiguration(
+                custom_qubits_array=[layout],
+                shots=100,
+                fidelity_routine="coherences",
+                rem=False,
+                size_sweep=True,
+                sweep_batch_size=2,
+                fidelity_threshold=fidelity_threshold,
+            )
+            benchmark = GHZBenchmark(backend, MINIMAL_GHZ)
+            run = benchmark.run()
+            assert [len(qubits) for qubits in run.dataset.attrs["custom_qubits_array"]] == executed_sizes
+            result = benchmark.analyze()
+            largest_size = [o.value for o in result.observations if o.name == "largest_ghz_size"]
+            assert largest_size == [5 if fidelity_threshold == 0.0 else 1]
+
+    def test_coherence_circuits(self):
+        layout = [0, 1, 3, 4, 8]
+        for routine in ["tree", "log"]:
+            benchmark = GHZBenchmark(
+                backend, GHZConfiguration(custom_qubits_array=[layout], state_generation_routine=routine)
+            )
+            benchmark.circuits = Circuits()
+            benchmark.circuits.benchmark_circuits.append(BenchmarkCircuit(name="transpiled_circuits"))
+            benchmark.circuits.benchmark_circuits.append(BenchmarkCircuit(name="untranspiled_circuits"))
+            transpiled = benchmark.generate_readout_circuit(layout, len(layout)).circuits
+            untranspiled = benchmark.circuits["untranspiled_circuits"][f"{layout}_native_ghz"].circuits
+            assert len(transpiled) == len(untranspiled) == 2 * len(layout) + 3
+            for native_qc, qc in zip(transpiled[1:], untranspiled[1:]):
+                assert set(native_qc.count_ops()) <= {"r", "cz", "barrier", "measure"}
+                native_qc = reduce_to_active_qubits(native_qc.remove_final_measurements(inplace=False))
+                # The probability of returning to the all-zero state does not depend on the qubit ordering
+                assert np.isclose(
+                    Statevector(native_qc).probabilities()[0],
+                    Statevector(qc.remove_final_measurements(inplace=False)).probabilities()[0],
+                )
+
     def test_rem(self):
-        for fidelity_routine in [f"coherences", f"randomized_measurements"]:
+        for fidelity_routine, async_rem_calibration in [
+            (f"coherences", False),
+            (f"randomized_measurements", False),
+            (f"coherences", True),
+        ]:
             MINIMAL_GHZ = GHZConfiguration(
                 state_generation_routine=f"tree",
                 custom_qubits_array=[[0, 1, 2, 3]],
@@ -62,7 +175,78 @@ class TestGHZ:
                 num_RMs=10,
                 rem=True,
                 mit_shots=10,
+                async_rem_calibration=async_rem_calibration,
             )
             benchmark = GHZBenchmark(backend, MINIMAL_GHZ)
             benchmark.run()
             benchmark.analyze()
+
+    def test_rm_cross_correlations(self):
+        # Z-basis GHZ distribution against itself: 8 * (1/2 + 1/2 * (-2)^-3)
+        states, probabilities = [["000", "111"]], [np.array([0.5, 0.5])]
+        for method in ["pairs", "walsh_hadamard"]:
+            value = rm_cross_correlations(states, probabilities, states, probabilities, 3, method=method)
+            assert np.allclose(value, [3.5])
+
+    def test_stabilizer_rm_cross_correlations(self):
+        num_qubits = 5
+        rng = np.random.default_rng(0)
+        for seed in range(5):
+            qc = QuantumCircuit(num_qubits)
+            qc.h(0)
+            for qubit in range(num_qubits - 1):
+                qc.cx(qubit, qubit + 1)
+            for qubit in range(num_qubits):
+                qc.compose(random_clifford(1, seed=10 * seed + qubit).to_circuit(), [qubit], inplace=True)
+            qc = transpile(qc, basis_gates=["r", "cz"], optimization_level=1)
+            ideal = {k: v for k, v in Statevector(qc).probabilities_dict().items() if v > 1e-12}
+            measured_states = sorted({"".join(rng.choice(["0", "1"], num_qubits)) for _ in range(10)})
+            measured_probabilities = rng.random(len(measured_states))
+            expected = rm_cross_correlations(
+                [measured_states],
+                [measured_probabilities],
+                [list(ideal.keys())],
+                [np.array(list(ideal.values()))],
+                num_qubits,
+            )
+            subspace = stabilizer_measurement_subspace(qc)
+            assert len(ideal) == 2 ** (num_qubits - len(subspace[0]))
+            value = rm_cross_correlations_stabilizer(
+                [measured_states], [measured_probabilities], [subspace], num_qubits
+            )
+            assert np.allclose(value, expected)
+
+    def test_native_rms(self):
+        qc = QuantumCircuit(backend.num_qubits)
+        qc.h(0)
+        for control, target in [(0, 1), (1, 3), (3, 4)]:
+            qc.cx(control, target)
+        qc.measure_active()
+        (rm_circuits, clifford_indices), _ = append_rms(
+            transpile(qc, backend, optimization_level=1), 6, backend, rng=np.random.default_rng(2)
+        )
+        assert clifford_indices.shape == (6, 4)
+        deflated = [
+            reduce_to_active_qubits(rm_qc.remove_final_measurements(inplace=False), backend.name)
+            for rm_qc in rm_circuits
+        ]
+        for rm_qc, (parity_checks, signs) in zip(deflated, rm_measurement_subspaces(deflated[0], clifford_indices)):
+            assert set(rm_qc.count_ops()) <= {"r", "cz"}
+            support = [b for b, p in enumerate(Statevector(rm_qc).probabilities()) if p > 1e-9]
+            assert len(support) == 2 ** (4 - len(parity_checks))
+            for b in support:
+                assert np.array_equal(parity_checks @ [(b >> q) & 1 for q in range(4)] % 2, signs)
+
+    def test_tensored_rem(self):
+        MINIMAL_GHZ = GHZConfiguration(
+            custom_qubits_array=[[0, 1, 3, 4]],
+            shots=100,
+            fidelity_routine="randomized_measurements",
+            num_RMs=10,
+            mit_shots=10,
+            rem_method="tensored",
+        )
+        benchmark = GHZBenchmark(backend, MINIMAL_GHZ)
+        benchmark.run()
+        result = benchmark.analyze()
+        assert any(o.name == "fidelity_rem" for o in result.observations)
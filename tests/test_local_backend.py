@@ -0,0 +1,69 @@
+"""Tests for the local backend stand-in"""
+
+import pytest
+from qiskit import QuantumCircuit, transpile
+from qiskit.providers import JobStatus
+
+from iqm.benchmarks.local_backend import IQMLocalBackend, LocalBackendServer, LocalJobEngine
+from iqm.benchmarks.utils import get_iqm_backend
+from iqm.iqm_client import Circuit, Instruction
+from iqm.qiskit_iqm.fake_backends.fake_adonis import IQMFakeAdonis
+
+
+# A measurement whose key cannot be parsed, so that executing the circuit fails
+INVALID_CIRCUIT = Circuit(
+    name="invalid",
+    instructions=(Instruction(name="measure", implementation=None, qubits=("QB1",), args={"key": "invalid"}),),
+    metadata=None,
+)
+
+
+def ghz_circuit(backend: IQMLocalBackend) -> QuantumCircuit:
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    qc.cx(0, 1)
+    qc.measure_all()
+    return transpile(qc, backend, optimization_level=1)
+
+
+class TestLocalBackend:
+    def test_run(self):
+        with LocalBackendServer(seed=1) as server:
+            for backend in (
+                get_iqm_backend("localadonis"),
+                IQMLocalBackend(IQMFakeAdonis().architecture, server_url=server.url),
+            ):
+                counts = backend.run(ghz_circuit(backend), shots=10).result().get_counts()
+                assert sum(counts.values()) == 10
+                with pytest.raises(KeyError, match="Unknown job"):
+                    backend.job_status("unknown")
+
+    def test_close(self):
+        backend = get_iqm_backend("localadonis")
+        job = backend.run(ghz_circuit(backend), shots=10)
+        backend.close()
+        # Jobs submitted before closing are still executed, and no more jobs are accepted
+        assert sum(job.result().get_counts().values()) == 10
+        for worker in backend._engine._workers:  # pylint: disable=protected-access
+            worker.join(timeout=1)
+            assert not worker.is_alive()
+        with pytest.raises(RuntimeError, match="closed"):
+            backend.run(ghz_circuit(backend), shots=10)
+
+    def test_failed_job(self):
+        engine = LocalJobEngine()
+        failed_id = engine.submit([INVALID_CIRCUIT], 10)
+        with pytest.raises(RuntimeError, match="failed"):
+            engine.wait_for_results(failed_id, timeout=5)
+        assert engine.status(failed_id) == JobStatus.ERROR
+        # The workers keep serving the next jobs
+        backend = get_iqm_backend("localadonis")
+        job_id = engine.submit(backend.create_run_request(ghz_circuit(backend), shots=10).circuits, 10)
+        assert sum(engine.wait_for_results(job_id, timeout=5)["counts"][0].values()) == 10
+        engine.close()
+
+        with LocalBackendServer() as server:
+            http_backend = IQMLocalBackend(IQMFakeAdonis().architecture, server_url=server.url)
+            job_id = server._engine.submit([INVALID_CIRCUIT], 10)  # pylint: disable=protected-access
+            with pytest.raises(RuntimeError, match="failed"):
+                http_backend.wait_for_results(job_id, timeout=5)
@@ -2,8 +2,21 @@
 
 from unittest.mock import patch
 
+import networkx as nx
+import numpy as np
+
 from iqm.benchmarks.benchmark_experiment import BenchmarkExperiment
-from iqm.benchmarks.optimization.qscore import QScoreConfiguration
+from iqm.benchmarks.optimization.qscore import (
+    MaxCutEvaluator,
+    QScoreBenchmark,
+    QScoreConfiguration,
+    expected_zz_edge_density_p1,
+    maxcut_p1_edge_statistics,
+    minimize_spsa,
+    optimal_angles_for_QAOA_p1,
+)
+from iqm.benchmarks.utils import perform_backend_transpilation, submit_execute
+from iqm.qiskit_iqm.fake_backends.fake_adonis import IQMFakeAdonis
 
 
 backend = "IQMFakeAdonis"
@@ -28,3 +41,120 @@ class TestQScore:
         EXAMPLE_EXPERIMENT = BenchmarkExperiment(backend, [EXAMPLE_QSCORE])
         EXAMPLE_EXPERIMENT.run_experiment()
         mock_fig.assert_called()
+
+    def test_objective_function_transpiles_once(self):
+        adonis = IQMFakeAdonis()
+        benchmark = QScoreBenchmark(adonis, QScoreConfiguration(num_instances=1, shots=100))
+        graph = nx.Graph([(0, 1), (1, 2), (0, 2), (2, 3)])
+        benchmark.graph_physical = graph.copy()
+        benchmark.graph_physical.remove_node(2)
+        benchmark.virtual_nodes = [(2, 1)]
+        with patch(
+            "iqm.benchmarks.optimization.qscore.perform_backend_transpilation", wraps=perform_backend_transpilation
+        ) as transpilation:
+            objective_function = benchmark.create_objective_function(graph, [2, 0, 1])
+            for theta in [[0.3, -0.2], [1.0, 0.5], [-0.6, 0.1]]:
+                assert -4 <= objective_function(theta) <= 0
+        transpilation.assert_called_once()
+
+    def test_maxcut_evaluator(self):
+        graph = nx.Graph([(0, 1), (1, 2), (0, 2), (2, 3), (3, 4)])
+        # Qubits 0, 1 and 2 measure nodes 4, 0 and 3, while nodes 2 and 1 are virtual with values 1 and 0
+        qubit_to_node = {0: 4, 1: 0, 2: 3}
+        evaluator = MaxCutEvaluator(graph, qubit_to_node, [(2, 1), (1, 0)])
+        counts = {"000": 3, "101": 1, "110": 2, "011": 2}
+        expected = []
+        for bitstring in counts:
+            nodes = {node: bitstring[::-1][qubit] for qubit, node in qubit_to_node.items()} | {2: "1", 1: "0"}
+            expected.append(QScoreBenchmark.cost_function("".join(nodes[node] for node in range(5)), graph))
+        assert list(-evaluator.cut_sizes(list(counts))) == expected
+        assert evaluator.expectation_value(counts) == np.average(expected, weights=list(counts.values()))
+
+    def test_spsa_batches_evaluations(self):
+        evaluated_batches = []
+
+        def batch_objective_function(thetas):
+            evaluated_batches.append(len(thetas))
+            return np.sum((thetas - [0.5, -0.2]) ** 2, axis=1)
+
+        res = minimize_spsa(
+            batch_objective_function, [0.0, 0.0], [(-1, 1), (-1, 1)], maxiter=100, rng=np.random.default_rng(1)
+        )
+        assert np.allclose(res.x, [0.5, -0.2], atol=1e-2)
+        assert evaluated_batches == [8] * 100 + [1]
+
+        adonis = IQMFakeAdonis()
+        benchmark = QScoreBenchmark(
+            adonis,
+            QScoreConfiguration(
+                num_instances=1, shots=10, use_classically_optimized_angles=False, optimizer="SPSA", spsa_maxiter=3
+            ),
+        )
+        graph = nx.Graph([(0, 1), (1, 2), (0, 2)])
+        benchmark.graph_physical, benchmark.virtual_nodes = graph, []
+        with patch("iqm.benchmarks.optimization.qscore.submit_execute", wraps=submit_execute) as submission:
+            assert 0 <= benchmark.run_QAOA(graph, [2, 0, 1], seed=1) <= 3
+        assert submission.call_count == 4
+
+    def test_concurrent_instances(self):
+        adonis = IQMFakeAdonis()
+        configuration = QScoreConfiguration(
+            num_instances=3,
+            shots=10,
+            use_virtual_node=False,
+            use_classically_optimized_angles=False,
+            optimizer="SPSA",
+            spsa_maxiter=3,
+            concurrent_instances=True,
+            seed=12,  # graphs without isolated nodes
+        )
+        benchmark = QScoreBenchmark(adonis, configuration)
+        with patch("iqm.benchmarks.optimization.qscore.submit_execute", wraps=submit_execute) as submission:
+            cut_sizes = benchmark.execute_single_benchmark(4)[2]
+        # The circuits of all instances are coalesced into one submission per SPSA iteration and a final one
+        assert submission.call_count == 4
+        assert len(cut_sizes) == 3 and all(0 <= cut_size <= 6 for cut_size in cut_sizes)
+
+    def test_optimal_angles_p1(self):
+        graph = nx.Graph([(0, 1), (1, 2), (0, 2), (2, 3)])
+        relabeled = nx.relabel_nodes(graph, {0: 7, 1: 5, 2: 1, 3: 0})
+        assert maxcut_p1_edge_statistics(graph) == ((1, 3, 0), (2, 2, 1), (2, 3, 1), (2, 3, 1))
+        assert maxcut_p1_edge_statistics(relabeled) == maxcut_p1_edge_statistics(graph)
+
+        # The single layer QAOA state on a single edge has <ZZ> = sin(4 beta) sin(2 gamma)
+        gamma, beta = np.meshgrid(np.linspace(0, 1, 5), np.linspace(-1, 0, 3))
+        assert np.allclose(
+            expected_zz_edge_density_p1(np.array([[1, 1, 0]]), gamma, beta), np.sin(4 * beta) * np.sin(2 * gamma)
+        )
+        assert np.allclose(
+            QScoreBenchmark.calculate_optimal_angles_for_QAOA_p1(nx.Graph([(0, 1)])), [np.pi / 4, -np.pi / 8]
+        )
+
+        angles = QScoreBenchmark.calculate_optimal_angles_for_QAOA_p1(graph)
+        hits = optimal_angles_for_QAOA_p1.cache_info().hits
+        assert QScoreBenchmark.calculate_optimal_angles_for_QAOA_p1(relabeled) == angles
+        assert optimal_angles_for_QAOA_p1.cache_info().hits == hits + 1
+
+    @patch('matplotlib.pyplot.figure')
+    def test_bisection_search(self, mock_fig):
+        adonis = IQMFakeAdonis()
+        for num_confirmation_instances in [0, 2]:
+            configuration = QScoreConfiguration(
+                num_instances=2,
+                max_num_nodes=20,
+                search_mode="bisection",
+                num_confirmation_instances=num_confirmation_instances,
+            )
+            benchmark = QScoreBenchmark(adonis, configuration)
+            executed = []
+
+            def execute_single_benchmark(num_nodes, num_instances=None, seed=None, previous_cut_sizes=None):
+                executed.append(num_nodes)
+                return num_nodes <= 11, 0.3 if num_nodes <= 11 else 0.1, [1.0, 2.0], []
+
+            with patch.object(benchmark, "execute_single_benchmark", side_effect=execute_single_benchmark):
+                (qscore, approximation_ratios, _), _ = benchmark.execute_full_benchmark()
+            assert qscore == benchmark.results["qscore"] == 11
+            # Bracketing by 2, 3, 5, 9, 17, then bisection, then confirmation of the boundary
+            assert executed == [2, 3, 5, 9, 17, 13, 11, 12] + [11, 12] * (num_confirmation_instances > 0)
+            assert len(approximation_ratios) == 8
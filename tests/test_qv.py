@@ -1,7 +1,22 @@
 """Tests for volumetric benchmarks"""
 
+from mthree.utils import final_measurement_mapping
+import numpy as np
+from qiskit.quantum_info import Statevector
+
+from iqm.benchmarks.local_backend import IQMLocalBackend, LocalBackendServer, LocalLatencyProfile
 from iqm.benchmarks.quantum_volume.clops import CLOPSBenchmark, CLOPSConfiguration
-from iqm.benchmarks.quantum_volume.quantum_volume import QuantumVolumeBenchmark, QuantumVolumeConfiguration
+from iqm.benchmarks.quantum_volume.native_circuits import generate_native_qv_circuits
+from iqm.benchmarks.quantum_volume.parameter_binding import lower_native_templates
+from iqm.benchmarks.quantum_volume.quantum_volume import (
+    QuantumVolumeBenchmark,
+    QuantumVolumeConfiguration,
+    early_stopping_decision,
+    marginalize_layout_counts,
+)
+from iqm.benchmarks.utils import get_iqm_backend, perform_backend_transpilation, set_coupling_map
+from iqm.qiskit_iqm.fake_backends.fake_apollo import IQMFakeApollo
+from iqm.qiskit_iqm.iqm_transpilation import optimize_single_qubit_gates
 
 
 backend = "fakeapollo"
@@ -28,6 +43,111 @@ class TestQV:
         benchmark.run()
         benchmark.analyze()
 
+    def test_qv_batching_shared_rem(self):
+        EXAMPLE_QV = QuantumVolumeConfiguration(
+            num_circuits=6,
+            shots=2**4,
+            custom_qubits_array=[[0, 1, 3], [4, 5, 9]],
+            qiskit_optim_level=1,
+            physical_layout="batching",
+            rem=True,
+            mit_shots=10,
+        )
+        benchmark = QuantumVolumeBenchmark(backend, EXAMPLE_QV)
+        run = benchmark.run()
+        assert "time_rem_calibration" in run.dataset.attrs
+        for qubits in EXAMPLE_QV.custom_qubits_array:
+            assert len(run.dataset.attrs["REM_quasidistributions"][f"REM_quasidist_{str(qubits)}"]) == 6
+        benchmark.analyze()
+
+    def test_qv_async_rem_calibration(self):
+        EXAMPLE_QV = QuantumVolumeConfiguration(
+            num_circuits=5,
+            shots=2**4,
+            custom_qubits_array=[[0, 1, 3]],
+            qiskit_optim_level=1,
+            rem=True,
+            mit_shots=12,
+            async_rem_calibration=True,
+        )
+        run_result = QuantumVolumeBenchmark(backend, EXAMPLE_QV).run()
+        assert len(run_result.dataset.attrs["REM_quasidistributions"]["REM_quasidist_[0, 1, 3]"]) == 5
+
+    def test_qv_native(self):
+        EXAMPLE_QV = QuantumVolumeConfiguration(
+            num_circuits=5,
+            shots=2**4,
+            num_sigmas=2,
+            custom_qubits_array=[[0, 1, 3, 4], [0, 1, 4, 5, 9]],
+            circuit_generation="native",
+            rem=False,
+        )
+        benchmark = QuantumVolumeBenchmark(backend, EXAMPLE_QV)
+        benchmark.run()
+        benchmark.analyze()
+
+    def test_qv_simultaneous(self):
+        EXAMPLE_QV = QuantumVolumeConfiguration(
+            num_circuits=5,
+            shots=2**6,
+            custom_qubits_array=[[0, 1, 3], [5, 9, 10], [14, 15, 19]],
+            circuit_generation="native",
+            simultaneous_layouts=True,
+            crosstalk_check=True,
+            rem=True,
+            mit_shots=10,
+        )
+        benchmark = QuantumVolumeBenchmark(backend, EXAMPLE_QV)
+        run = benchmark.run()
+        for qubits in EXAMPLE_QV.custom_qubits_array:
+            assert sum(run.dataset[f"{str(qubits)}_counts_0"].data) == 2**6
+        result = benchmark.analyze()
+        assert any(observation.name == "crosstalk_detected" for observation in result.observations)
+
+    def test_marginalize_layout_counts(self):
+        marginals = marginalize_layout_counts([{"10 011": 3, "00 111": 1}], [3, 2])
+        assert marginals == [[{"011": 3, "111": 1}], [{"10": 3, "00": 1}]]
+
+    def test_qv_early_stopping(self):
+        EXAMPLE_QV = QuantumVolumeConfiguration(
+            num_circuits=40,
+            shots=2**6,
+            num_sigmas=2,
+            custom_qubits_array=[[0, 1], [3, 4]],
+            circuit_generation="native",
+            early_stopping=True,
+            early_stopping_chunk_size=5,
+            early_stopping_min_circuits=10,
+            rem=True,
+            mit_shots=10,
+        )
+        benchmark = QuantumVolumeBenchmark(backend, EXAMPLE_QV)
+        run = benchmark.run()
+        for qubits_idx, qubits in enumerate(EXAMPLE_QV.custom_qubits_array):
+            num_executed_circuits = run.dataset.attrs[qubits_idx]["num_executed_circuits"]
+            assert 10 <= num_executed_circuits <= 40
+            assert len(run.circuits["untranspiled_circuits"][str(qubits)].circuits) == num_executed_circuits
+        benchmark.analyze()
+
+    def test_early_stopping_decision(self):
+        assert early_stopping_decision([0.9] * 100) is True
+        assert early_stopping_decision([0.5] * 100) is False
+        assert early_stopping_decision([0.68] * 10) is None
+
+    def test_native_circuits_match_untranspiled(self):
+        qubits = [1, 4, 9, 10, 15]  # Includes non-adjacent pairs that need routing
+        untranspiled, native = generate_native_qv_circuits(
+            3, qubits, get_iqm_backend(backend), rng=np.random.default_rng(1)
+        )
+        for qc, native_qc in zip(untranspiled, native):
+            assert set(native_qc.count_ops()) <= {"r", "cz", "barrier", "measure"}
+            measurement_mapping = final_measurement_mapping(native_qc)
+            ideal = Statevector(qc.remove_final_measurements(inplace=False)).probabilities()
+            native_probabilities = Statevector(native_qc.remove_final_measurements(inplace=False)).probabilities(
+                [measurement_mapping[i] for i in range(len(qubits))]
+            )
+            assert np.allclose(ideal, native_probabilities)
+
     def test_clops(self):
         EXAMPLE_CLOPS = CLOPSConfiguration(
             qubits=[0, 1],
@@ -44,3 +164,100 @@ class TestQV:
         benchmark = CLOPSBenchmark(backend, EXAMPLE_CLOPS)
         benchmark.run()
         benchmark.analyze()
+
+    def test_clops_native_binding(self):
+        EXAMPLE_CLOPS = CLOPSConfiguration(
+            qubits=[0, 1],
+            num_circuits=2,
+            num_updates=2,
+            num_shots=2,
+            parameter_binding="native",
+        )
+        benchmark = CLOPSBenchmark(backend, EXAMPLE_CLOPS)
+        benchmark.run()
+        benchmark.analyze()
+        # Without single-qubit gate optimization, parameters are bound with Qiskit
+        no_sqg = CLOPSConfiguration(qubits=[0, 1], optimize_sqg=False, parameter_binding="native")
+        assert CLOPSBenchmark(backend, no_sqg).parameter_binding == "qiskit"
+
+    def test_clops_pipelined(self):
+        EXAMPLE_CLOPS = CLOPSConfiguration(
+            qubits=[0, 1, 3],
+            num_circuits=5,
+            num_updates=4,
+            num_shots=2,
+            pipelined=True,
+            pipeline_depth=2,
+        )
+        benchmark = CLOPSBenchmark(backend, EXAMPLE_CLOPS)
+        run = benchmark.run()
+        assert len(run.dataset.attrs["counts_per_update"]) == 4
+        assert set(run.dataset.attrs["pipeline_overlap"]) == {
+            "assign_with_submit",
+            "assign_with_retrieve",
+            "queue_wait_total",
+        }
+        benchmark.analyze()
+
+    def test_clops_local_backend(self):
+        EXAMPLE_CLOPS = CLOPSConfiguration(qubits=[0, 1], num_circuits=3, num_updates=2, num_shots=4)
+        profile = LocalLatencyProfile(compile_time_per_circuit=0.001, shot_time=0.0001, max_circuits=10)
+        in_process_backend = IQMLocalBackend(IQMFakeApollo().architecture, latency_profile=profile, seed=1)
+        with LocalBackendServer(latency_profile=profile, seed=1) as server:
+            http_backend = IQMLocalBackend(IQMFakeApollo().architecture, server_url=server.url)
+            for local_backend in (in_process_backend, http_backend, "localapollo"):
+                benchmark = CLOPSBenchmark(local_backend, EXAMPLE_CLOPS)
+                run = benchmark.run()
+                update_meta = run.dataset.attrs["job_meta_per_update"]["update_1"]
+                assert all(meta["timestamps"]["execution_end"] for meta in update_meta.values())
+                result = benchmark.analyze()
+                assert result.dataset.attrs["job_total"] > 0
+                assert len(result.plots) == 1
+
+    def test_clops_instrumented(self):
+        profile = LocalLatencyProfile(compile_time_per_circuit=0.002, execution_overhead=0.01, shot_time=0.0001)
+        local_backend = IQMLocalBackend(IQMFakeApollo().architecture, latency_profile=profile)
+        for clops_backend, pipelined in ((local_backend, False), (local_backend, True), (backend, False)):
+            EXAMPLE_CLOPS = CLOPSConfiguration(
+                qubits=[0, 1],
+                num_circuits=3,
+                num_updates=2,
+                num_shots=4,
+                max_gates_per_batch=60,
+                pipelined=pipelined,
+                instrumented=True,
+            )
+            benchmark = CLOPSBenchmark(clops_backend, EXAMPLE_CLOPS)
+            benchmark.run()
+            result = benchmark.analyze()
+            timeline = result.dataset.attrs["clops_timeline"]
+            for jobs in timeline.values():
+                for job in jobs.values():
+                    assert job["submit"][0] <= job["submit"][1] <= job["wait"][0] <= job["wait"][1]
+            assert result.dataset.attrs["client_overhead"]["total"] > 0
+            assert "client_limited_clops_v" in result.observations[1]
+            assert ("server_limited_clops_v" in result.observations[1]) == (clops_backend is local_backend)
+            assert any(name.endswith("_timeline") for name in result.plots)
+
+    def test_native_templates_match_assigned(self):
+        qubits = [0, 1, 3, 4]
+        benchmark = CLOPSBenchmark(backend, CLOPSConfiguration(qubits=qubits, num_circuits=3))
+        templates, _ = perform_backend_transpilation(
+            [benchmark.generate_single_circuit() for _ in range(3)],
+            benchmark.backend,
+            qubits,
+            coupling_map=set_coupling_map(qubits, benchmark.backend, "fixed"),
+            qiskit_optim_level=1,
+            optimize_sqg=True,
+        )
+        parameters = np.random.default_rng(3).uniform(-np.pi, np.pi, (3, benchmark.num_parameters))
+        native = lower_native_templates(templates).bind(parameters)
+        for template, values, native_qc in zip(templates, parameters, native):
+            assigned = optimize_single_qubit_gates(template.assign_parameters(dict(zip(template.parameters, values))))
+            assert native_qc.count_ops() == assigned.count_ops()
+            measurement_mapping = final_measurement_mapping(assigned)
+            measured = [measurement_mapping[i] for i in range(len(qubits))]
+            assert np.allclose(
+                Statevector(native_qc.remove_final_measurements(inplace=False)).probabilities(measured),
+                Statevector(assigned.remove_final_measurements(inplace=False)).probabilities(measured),
+            )
@@ -0,0 +1,56 @@
+"""Tests for readout error mitigation calibrations"""
+
+import os
+
+import numpy as np
+
+from iqm.benchmarks.readout_mitigation import ReadoutCalibrationCache
+from iqm.benchmarks.utils import get_iqm_backend
+
+
+class TestReadoutMitigation:
+    def test_readout_calibration_cache(self, tmp_path):
+        fake_backend = get_iqm_backend("fakeadonis")
+        cache = ReadoutCalibrationCache(cache_dir=str(tmp_path))
+        mit = cache.get_mitigator(fake_backend, [0, 1], mit_shots=100)
+        # Only the missing qubit is calibrated, the cached calibrations are reused as they are
+        extended = cache.get_mitigator(fake_backend, [1, 2], mit_shots=100)
+        assert extended.single_qubit_cals[1] is mit.single_qubit_cals[1]
+        assert [cal is not None for cal in extended.single_qubit_cals] == [True, True, True, False, False]
+        # Calibrations of another calibration set, or with more shots, are taken again
+        assert cache.get_mitigator(fake_backend, [1], 100, "calset").single_qubit_cals[0] is None
+        assert cache.get_mitigator(fake_backend, [1], 200).single_qubit_cals[1] is not mit.single_qubit_cals[1]
+
+        # Calibrations are keyed by device and resolved calibration set ID, and can be reloaded from any cache
+        calset_id = str(fake_backend.architecture.calibration_set_id)
+        assert cache.calibration_key(fake_backend) == cache.calibration_key(fake_backend, calset_id)
+        assert cache.calibration_key(fake_backend) != cache.calibration_key(get_iqm_backend("fakeapollo"))
+        reloaded = ReadoutCalibrationCache().get_mitigator(fake_backend, [0, 2], 100, cache_dir=str(tmp_path))
+        assert np.array_equal(reloaded.single_qubit_cals[2], extended.single_qubit_cals[2])
+        expired = ReadoutCalibrationCache(ttl=0.0).get_mitigator(fake_backend, [0], 100)
+        assert expired.single_qubit_cals[1] is None
+
+    def test_async_readout_calibration(self):
+        fake_backend = get_iqm_backend("fakeadonis")
+        submitted = []
+        run = fake_backend.run
+        fake_backend.run = lambda circuits, **options: submitted.append(len(circuits)) or run(circuits, **options)
+        cache = ReadoutCalibrationCache()
+        cache.submit_calibration(fake_backend, [0, 2], 100)
+        # Qubits whose calibration is pending are not submitted again, and the pending calibration is waited for
+        cache.submit_calibration(fake_backend, [2], 100)
+        assert len(submitted) == 1
+        mit = cache.get_mitigator(fake_backend, [0, 2], 100)
+        assert len(submitted) == 1
+        assert [cal is not None for cal in mit.single_qubit_cals] == [True, False, True, False, False]
+
+    def test_disk_cache_keeps_other_qubits(self, tmp_path):
+        fake_backend = get_iqm_backend("fakeadonis")
+        first = ReadoutCalibrationCache(cache_dir=str(tmp_path)).get_mitigator(fake_backend, [0, 1, 2], 100)
+        # A second cache calibrating disjoint qubits adds them to the file instead of replacing it
+        ReadoutCalibrationCache(cache_dir=str(tmp_path)).get_mitigator(fake_backend, [3], 100)
+        assert len(os.listdir(tmp_path)) == 1
+        reloaded = ReadoutCalibrationCache(cache_dir=str(tmp_path)).get_mitigator(fake_backend, [0, 1, 2, 3], 100)
+        assert [cal is not None for cal in reloaded.single_qubit_cals] == [True, True, True, True, False]
+        for qubit in [0, 1, 2]:
+            assert np.array_equal(reloaded.single_qubit_cals[qubit], first.single_qubit_cals[qubit])
@@ -0,0 +1,63 @@
+"""Tests for the stabilizer-backed noisy simulator backend"""
+
+from qiskit import QuantumCircuit, transpile
+from qiskit.quantum_info import random_clifford
+
+from iqm.benchmarks.entanglement.ghz import GHZBenchmark, GHZConfiguration
+from iqm.benchmarks.randomized_benchmarking.mirror_rb.mirror_rb import (
+    MirrorRandomizedBenchmarking,
+    MirrorRBConfiguration,
+)
+from iqm.benchmarks.stabilizer_backend import IQMStabilizerBackend
+from iqm.benchmarks.utils import get_iqm_backend
+from iqm.qiskit_iqm.fake_backends.fake_apollo import IQMFakeApollo
+
+
+backend = IQMFakeApollo()
+
+
+class TestStabilizerBackend:
+    def test_counts_match_fake_backend(self):
+        qc = QuantumCircuit(backend.num_qubits, 3)
+        qc.h(1)
+        for control, target in [(1, 0), (1, 4)]:
+            qc.cx(control, target)
+        for qubit in [0, 1, 4]:
+            qc.compose(random_clifford(1, seed=qubit).to_circuit(), [qubit], inplace=True)
+        qc.measure([0, 1, 4], [0, 1, 2])
+        native_qc = transpile(qc, backend, optimization_level=1, seed_transpiler=1)
+        stabilizer_backend = IQMStabilizerBackend(backend, seed=1)
+        shots = 20000
+        expected = backend.run(native_qc, shots=shots).result().get_counts()
+        counts = stabilizer_backend.run(native_qc, shots=shots).result().get_counts()
+        outcomes = set(expected) | set(counts)
+        assert sum(abs(expected.get(k, 0) - counts.get(k, 0)) for k in outcomes) / (2 * shots) < 0.02
+
+    def test_ghz(self):
+        MINIMAL_GHZ = GHZConfiguration(
+            state_generation_routine="tree",
+            custom_qubits_array=[[0, 1, 3, 4]],
+            shots=100,
+            fidelity_routine="randomized_measurements",
+            num_RMs=10,
+            rem=False,
+        )
+        benchmark = GHZBenchmark(get_iqm_backend("stabilizerapollo"), MINIMAL_GHZ)
+        benchmark.run()
+        benchmark.analyze()
+
+    def test_mrb(self):
+        EXAMPLE_MRB = MirrorRBConfiguration(
+            qubits_array=[[0, 1], [0, 3]],
+            depths_array=[[2**m for m in range(4)]],
+            num_circuit_samples=2,
+            num_pauli_samples=2,
+            shots=2**4,
+            qiskit_optim_level=1,
+            routing_method="sabre",
+            two_qubit_gate_ensemble={"CZGate": 0.8, "iSwapGate": 0.2},
+            density_2q_gates=0.25,
+        )
+        benchmark = MirrorRandomizedBenchmarking(get_iqm_backend("stabilizerapollo"), EXAMPLE_MRB)
+        benchmark.run()
+        benchmark.analyze()
@@ -0,0 +1,49 @@
+"""Tests for tensored readout error mitigation"""
+
+import numpy as np
+
+from iqm.benchmarks.readout_mitigation import calibrate_readout_error_mitigation
+from iqm.benchmarks.tensored_mitigation import TensoredMitigator, counts_to_arrays, nearest_probability_distributions
+from iqm.qiskit_iqm.fake_backends.fake_apollo import IQMFakeApollo
+
+
+backend = IQMFakeApollo()
+
+
+class TestTensoredMitigation:
+    def test_correction_matches_assignment_matrix(self):
+        rng = np.random.default_rng(0)
+        num_bits = 4
+        pair = np.array(
+            [[0.9, 0.05, 0.04, 0.01], [0.04, 0.9, 0.01, 0.05], [0.05, 0.01, 0.9, 0.04], [0.01, 0.04, 0.05, 0.9]]
+        )
+        single = np.array([[0.97, 0.06], [0.03, 0.94]])
+        groups, matrices = [[0, 2], [1], [3]], [pair, single, single[::-1, ::-1]]
+        mitigator = TensoredMitigator(groups, matrices)
+        # Explicit assignment matrix of the register, with the bits of each group extracted from the outcomes
+        outcomes = np.arange(2**num_bits)
+        assignment = np.ones((2**num_bits, 2**num_bits))
+        for group, matrix in zip(groups, matrices):
+            group_outcomes = sum(((outcomes >> bit) & 1) << t for t, bit in enumerate(group))
+            assignment *= matrix[np.ix_(group_outcomes, group_outcomes)]
+        probabilities = rng.dirichlet(np.ones(2**num_bits), size=3)
+        noisy = probabilities @ assignment.T
+        assert np.allclose(mitigator.correct_dense(noisy), probabilities)
+        assert np.allclose(mitigator.correct_support(outcomes, 1000 * noisy[0], tol=1e-10), probabilities[0], atol=1e-6)
+
+    def test_nearest_probability_distributions(self):
+        quasi = np.array([[0.6, 0.5, -0.1, 0.0], [0.2, 0.3, 0.4, 0.1]])
+        assert np.allclose(nearest_probability_distributions(quasi), [[0.55, 0.45, 0.0, 0.0], quasi[1]])
+
+    def test_support_correction_matches_m3(self):
+        # On the observed outcomes of a wide register, the correction agrees with M3
+        rng = np.random.default_rng(0)
+        qubits = [0, 1, 3, 4, 8, 9, 13, 14]
+        mit, _ = calibrate_readout_error_mitigation(backend, qubits, 100)
+        # GHZ-like counts, with the all-zero and all-one outcomes and a few scattered others
+        occurrences = rng.multinomial(1000, [0.4] + [0.2 / 254] * 254 + [0.4])
+        counts = {format(outcome, "08b"): int(c) for outcome, c in enumerate(occurrences) if c}
+        expected = mit.apply_correction(counts, qubits)
+        outcomes, occurrences = counts_to_arrays(counts)
+        corrected = TensoredMitigator.from_m3(mit, qubits, dense_max_bits=0).correct_support(outcomes, occurrences)
+        assert np.allclose(corrected, [expected[k] for k in counts], atol=1e-4)